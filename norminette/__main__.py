@@ -1,25 +1,191 @@
 import argparse
-import glob
+import os
 import pathlib
-import platform
-import subprocess
 import sys
-from importlib.metadata import version
 
 from norminette.context import Context
-from norminette.errors import formatters
-from norminette.exceptions import CParsingError
+from norminette.costs import Costs
+from norminette.errors import Error, Highlight, formatters
+from norminette.exceptions import GitError
 from norminette.file import File
+from norminette.index import Index, sources_fingerprint
+from norminette.jobs import timed_check
 from norminette.lexer import Lexer
 from norminette.registry import Registry
+from norminette.shard import check_shards, fingerprint, parse_shard, select_shard
 from norminette.tools.colors import colors
 
-version_text = f"norminette {version('norminette')}"
-version_text += f", Python {platform.python_version()}"
-version_text += f", {platform.platform()}"
+# Modules only needed by some options are imported when they are used, the
+# pre-commit hook starts norminette for every commit.
+
+
+def version_text():
+    import platform
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        norminette_version = version("norminette")
+    except PackageNotFoundError:  # Running from a checkout
+        from norminette import __version__ as norminette_version
+    return f"norminette {norminette_version}, Python {platform.python_version()}, {platform.platform()}"
+
+
+class VersionAction(argparse.Action):
+    """Like the `version` action, but looks the versions up only when the
+    option is given.
+    """
+
+    def __init__(self, option_strings, dest=argparse.SUPPRESS, default=argparse.SUPPRESS, help=None):
+        super().__init__(option_strings, dest, nargs=0, default=default, help=help)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        print(version_text())
+        parser.exit()
+
+
+def merge(argv):
+    """Combines the JSON outputs of `--shard` runs into a single report.
+    """
+    parser = argparse.ArgumentParser(prog="norminette merge")
+    parser.add_argument(
+        "report",
+        help="File(s) with the output of `norminette -f json`",
+        nargs="+",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=list(formatter.name for formatter in formatters),
+        help="formatting style for errors",
+        default="json",
+    )
+    parser.add_argument(
+        "--no-colors", action="store_true", help="Disable colors in output"
+    )
+    args = parser.parse_args(argv)
+
+    import json
+
+    format = next(filter(lambda it: it.name == args.format, formatters))
+    files = []
+    shards = []
+    for report in args.report:
+        try:
+            with open(report) as stream:
+                data = json.load(stream)
+        except (OSError, ValueError) as e:
+            print(f"Error: can't read {report!r}: {e}")
+            sys.exit(1)
+        shards.append(data.get("shard"))
+        for item in data["files"]:
+            file = File(item["path"])
+            for error in item["errors"]:
+                highlights = [Highlight(**highlight) for highlight in error.pop("highlights")]
+                file.errors.add(Error(**error, highlights=highlights))
+            files.append(file)
+    if any(shards):
+        problem = check_shards(shards)
+        if problem is not None:
+            print(f"Error: {problem}")
+            sys.exit(1)
+    errors = format(files, use_colors=not args.no_colors)
+    print(errors, end="")
+    sys.exit(1 if any(len(it.errors) for it in files) else 0)
+
+
+def serve(argv):
+    """Checks the files posted to a HTTP service until interrupted.
+    """
+    parser = argparse.ArgumentParser(prog="norminette serve")
+    parser.add_argument(
+        "--http",
+        metavar="HOST:PORT",
+        help="Address to listen on",
+        default="127.0.0.1:8000",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        metavar="N",
+        help="Number of processes checking files",
+        default=os.cpu_count() or 1,
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        metavar="N",
+        help="Files that can wait for a worker before requests are rejected with 429 (default: 64 per worker)",
+    )
+    parser.add_argument(
+        "--max-files",
+        type=int,
+        metavar="N",
+        help="Replace a worker after it checked N files, to release the memory it allocated",
+        default=1000,
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        metavar="SECONDS",
+        help="Time to check the files of a request before replying with 504",
+        default=30,
+    )
+    parser.add_argument(
+        "--select",
+        type=lambda value: value.split(","),
+        metavar="RULES",
+        help="Comma-separated rule or error names to check, all others are not run",
+        default=[],
+    )
+    parser.add_argument(
+        "--ignore",
+        type=lambda value: value.split(","),
+        metavar="RULES",
+        help="Comma-separated rule or error names to not check",
+        default=[],
+    )
+    args = parser.parse_args(argv)
+
+    from norminette.service import Server, WorkerPool, parse_address
+
+    try:
+        address = parse_address(args.http)
+    except ValueError as e:
+        parser.error(f"argument --http: {e}")
+    if args.workers < 1:
+        parser.error("argument --workers: N must be a positive integer")
+    if args.queue_size is not None and args.queue_size < 1:
+        parser.error("argument --queue-size: N must be a positive integer")
+    if args.max_files < 1:
+        parser.error("argument --max-files: N must be a positive integer")
+    if args.timeout <= 0:
+        parser.error("argument --timeout: SECONDS must be positive")
+    try:
+        pool = WorkerPool(
+            args.workers,
+            args.queue_size or 64 * args.workers,
+            args.select,
+            args.ignore,
+            max_files=args.max_files,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    server = Server(address, pool, args.timeout)
+    print(f"Listening on http://{address[0]}:{server.server_address[1]} with {args.workers} workers", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.close()
 
 
 def main():
+    if sys.argv[1:2] == ["merge"]:
+        return merge(sys.argv[2:])
+    if sys.argv[1:2] == ["serve"]:
+        return serve(sys.argv[2:])
     parser = argparse.ArgumentParser()
     parser.add_argument(
         "file",
@@ -43,8 +209,8 @@ def main():
     parser.add_argument(
         "-v",
         "--version",
-        action="version",
-        version=version_text,
+        action=VersionAction,
+        help="show program's version number and exit",
     )
     parser.add_argument(
         "--cfile",
@@ -61,6 +227,12 @@ def main():
         action="store",
         help="Stores filename if --cfile or --hfile is passed",
     )
+    parser.add_argument(
+        "--encoding",
+        action="store",
+        metavar="NAME",
+        help="Encoding of the files, by default UTF-8 or Latin-1 for the files that aren't valid UTF-8",
+    )
     parser.add_argument(
         "--use-gitignore",
         action="store_true",
@@ -76,19 +248,130 @@ def main():
     parser.add_argument(
         "--no-colors", action="store_true", help="Disable colors in output"
     )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop checking at the first file with an error",
+    )
+    parser.add_argument(
+        "--max-errors",
+        type=int,
+        metavar="N",
+        help="Stop checking a file after N errors were found in it",
+    )
+    parser.add_argument(
+        "--select",
+        type=lambda value: value.split(","),
+        metavar="RULES",
+        help="Comma-separated rule or error names to check, all others are not run",
+        default=[],
+    )
+    parser.add_argument(
+        "--ignore",
+        type=lambda value: value.split(","),
+        metavar="RULES",
+        help="Comma-separated rule or error names to not check",
+        default=[],
+    )
+    parser.add_argument(
+        "--diff",
+        action="store",
+        metavar="REF",
+        help="Check only files changed since the git REF and report errors in changed lines",
+    )
+    parser.add_argument(
+        "--staged",
+        action="store_true",
+        help="Check the content staged in git of the added or modified files instead of the working tree",
+    )
+    parser.add_argument(
+        "--shard",
+        action="store",
+        metavar="i/N",
+        help="Check only the i-th of N parts of the files, balanced by their sizes, see `norminette merge`",
+    )
+    parser.add_argument(
+        "--shard-costs",
+        metavar="FILE",
+        help="Balance the parts of --shard by the check times in FILE, a costs.json of the cache directory"
+        " shared by all the shards",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        metavar="N",
+        help="Check files in N processes, starting with the slowest ones",
+        default=1,
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Don't read or write the check times and errors kept in the cache directory",
+    )
+    parser.add_argument(
+        "--split",
+        type=int,
+        metavar="N",
+        help="Check big files in up to N chunks in parallel, split between top-level declarations",
+        default=1,
+    )
+    parser.add_argument(
+        "--lsp",
+        action="store_true",
+        help="Run a language server on stdin and stdout, for editors to show the errors while typing",
+    )
     parser.add_argument("-R", nargs=1, help="compatibility for norminette 2")
     args = parser.parse_args()
-    registry = Registry()
+    try:
+        shard = args.shard and parse_shard(args.shard)
+    except ValueError as e:
+        parser.error(f"argument --shard: {e}")
+    if args.shard_costs is not None and not os.path.isfile(args.shard_costs):
+        parser.error(f"argument --shard-costs: no such file {args.shard_costs!r}")
+    if args.max_errors is not None and args.max_errors < 1:
+        parser.error("argument --max-errors: N must be a positive integer")
+    if args.split < 1:
+        parser.error("argument --split: N must be a positive integer")
+    if args.jobs < 1:
+        parser.error("argument --jobs: N must be a positive integer")
+    if args.encoding is not None:
+        import codecs
+
+        try:
+            codecs.lookup(args.encoding)
+        except LookupError:
+            parser.error(f"argument --encoding: unknown encoding {args.encoding!r}")
+    try:
+        registry = Registry(select=args.select, ignore=args.ignore, cache=args.lsp)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.lsp:
+        from norminette import lsp
+
+        output, sys.stdout = sys.stdout.buffer, sys.stderr  # Prints must not break the protocol
+        sys.exit(lsp.serve(registry, sys.stdin.buffer, output))
 
     format = next(filter(lambda it: it.name == args.format, formatters))
     files = []
     debug = args.debug
-    if args.cfile or args.hfile:
+    if args.staged:
+        from norminette.git import staged_files
+
+        try:
+            for path, source in staged_files():
+                files.append(File(path, source, args.encoding))
+        except GitError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+    elif args.cfile or args.hfile:
         file_name = args.filename or ("file.c" if args.cfile else "file.h")
         file_data = args.cfile if args.cfile else args.hfile
         file = File(file_name, file_data)
         files.append(file)
     else:
+        import glob
+
         stack = []
         stack += args.file if args.file else glob.glob("**/*.[ch]", recursive=True)
         for item in stack:
@@ -100,13 +383,15 @@ def main():
                 if path.suffix not in (".c", ".h"):
                     print(f"Error: {path.name!r} is not valid C or C header file")
                 else:
-                    file = File(item)
+                    file = File(item, encoding=args.encoding)
                     files.append(file)
             if path.is_dir():
                 stack += glob.glob(str(path) + "/**/*.[ch]", recursive=True)
         del stack
 
     if args.use_gitignore:
+        import subprocess
+
         tmp_targets = []
         for target in files:
             command = ["git", "check-ignore", "-q", target.path]
@@ -130,20 +415,110 @@ def main():
                 )
                 sys.exit(0)
         files = tmp_targets
-    for file in files:
+    changes = {}
+    if args.diff:
+        from norminette.git import changed_lines
+
         try:
-            lexer = Lexer(file)
-            tokens = list(lexer)
-            context = Context(file, tokens, debug, args.R)
-            registry.run(context)
-        except CParsingError as e:
-            print(file.path + f": Error!\n\t{colors(e.msg, 'red')}")
+            changes = changed_lines(args.diff)
+        except GitError as e:
+            print(f"Error: {e}")
             sys.exit(1)
+        # The files named in the arguments are checked whole if they didn't change
+        named = {os.path.realpath(path) for path in args.file or () if os.path.isfile(path)}
+        kept = changes.keys() | named
+        files = [file for file in files if os.path.realpath(file.path) in kept]
+    # Times are recorded for the files on disk, but not by shards: they split
+    # the files by a costs file they all get, or by the sizes of the files.
+    costs = Costs(load=not args.no_cache)
+    record = not (args.cfile or args.hfile or shard or args.no_cache)
+    shard_info = None
+    if shard:
+        weights = Costs(args.shard_costs).estimates(files) if args.shard_costs else None
+        paths = [os.path.normpath(file.path) for file in files]
+        files = select_shard(files, *shard, costs=weights)
+        shard_info = {
+            "index": shard[0],
+            "total": shard[1],
+            "files": fingerprint(paths),
+            "paths": [os.path.normpath(file.path) for file in files],
+        }
+    if args.split > 1:
+        from norminette.chunks import run_in_chunks
+    limit = 1 if args.fail_fast else args.max_errors
+
+    def check(file):
+        lines = changes.get(os.path.realpath(file.path)) if args.diff else None
+        file.errors.accept = registry.accepts(lines)
+        context = Context(file, Lexer(file), debug, args.R, changed_lines=lines)
+        if args.split > 1:
+            run_in_chunks(registry, context, args.split)
+        else:
+            registry.run(context)
+
+    def done(file, message, seconds):
+        if record:
+            costs.record(file, seconds)
+        if index is not None and message is None:
+            index.record(file)
+
+    # Files whose content didn't change get the errors found in a previous
+    # run with the same options, most without being opened.
+    index = None
+    restored = set()
+    if not (args.cfile or args.hfile or args.staged or args.diff or debug or args.no_cache):
+        from norminette import __version__
+
+        options = [sorted(args.select), sorted(args.ignore), limit, args.R, args.encoding]
+        index = Index([__version__, sources_fingerprint(), *options])
+        for file in files:
+            file.errors.limit = limit
+            if index.restore(file):
+                restored.add(file)
+    pending = [file for file in files if file not in restored]
+
+    parsing_errors = {}
+    # With --fail-fast, the files after the first one with an error must not be checked
+    parallel = args.jobs > 1 and len(pending) > 1 and not (debug or args.fail_fast) and hasattr(os, "fork")
+    if parallel:
+        from norminette.jobs import run_jobs, warm_up
+
+        warm_up(registry)
+        for file in pending:
+            file.errors.limit = limit
+        try:
+            for file, message, seconds in run_jobs(check, pending, costs.estimates(pending), args.jobs):
+                done(file, message, seconds)
+                if message is not None:
+                    parsing_errors[file] = message
         except KeyboardInterrupt:
             sys.exit(1)
-    errors = format(files, use_colors=not args.no_colors)
+    checked = []
+    for file in files:
+        checked.append(file)
+        if parallel or file in restored:
+            message = parsing_errors.get(file)
+        else:
+            file.errors.limit = limit
+            try:
+                message, seconds = timed_check(check, file)
+            except KeyboardInterrupt:
+                sys.exit(1)
+            done(file, message, seconds)
+        if message is not None:
+            costs.save()
+            if index is not None:
+                index.save()
+            print(file.path + f": Error!\n\t{colors(message, 'red')}")
+            sys.exit(1)
+        if args.fail_fast and file.errors.status == "Error":
+            break
+    costs.save()
+    if index is not None:
+        index.save()
+    errors = format(checked, use_colors=not args.no_colors, shard=shard_info)
     print(errors, end="")
-    sys.exit(1 if any(len(it.errors) for it in files) else 0)
+    sys.exit(1 if any(len(it.errors) for it in checked) else 0)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,132 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import AsyncIterable, AsyncIterator, Iterable, List, Optional, Sequence, Tuple, Union
+
+from norminette.context import Context
+from norminette.errors import Error
+from norminette.exceptions import NorminetteError
+from norminette.file import File
+from norminette.lexer import Lexer
+from norminette.lsp import CancellableErrors
+from norminette.registry import Registry
+
+Item = Union[str, "os.PathLike[str]", Tuple[str, Optional[str]]]
+
+# Registries of the thread (or worker process), by selected and ignored rules
+_local = threading.local()
+
+
+def _registry(select: Sequence[str], ignore: Sequence[str]) -> Registry:
+    registries = _local.__dict__.setdefault("registries", {})
+    key = (tuple(select), tuple(ignore))
+    if key not in registries:
+        registries[key] = Registry(select=select, ignore=ignore)
+    return registries[key]
+
+
+def _check(
+    path: str,
+    source: Optional[str],
+    select: Sequence[str],
+    ignore: Sequence[str],
+    cancelled: Optional[threading.Event] = None,
+) -> List[Error]:
+    file = File(path, source)
+    if cancelled is not None:
+        file.errors = CancellableErrors(cancelled)
+    try:
+        _registry(select, ignore).run(Context(file, Lexer(file)))
+    except NorminetteError as e:
+        file.errors.add("PARSING_ERROR", str(e) or type(e).__name__)
+    return list(file.errors)
+
+
+async def _items(items: Union[Iterable[Item], AsyncIterable[Item]]) -> AsyncIterator[Tuple[str, Optional[str]]]:
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item if isinstance(item, tuple) else (os.fspath(item), None)
+    else:
+        for item in items:
+            yield item if isinstance(item, tuple) else (os.fspath(item), None)
+
+
+async def check_many(
+    items: Union[Iterable[Item], AsyncIterable[Item]],
+    *,
+    concurrency: Optional[int] = None,
+    executor: Union[str, Executor] = "process",
+    select: Sequence[str] = (),
+    ignore: Sequence[str] = (),
+) -> AsyncIterator[File]:
+    """Checks files out of the event loop, yielding them with their errors in
+    the order they are checked.
+
+    `items` are paths, or `(path, source)` tuples to check a source that is
+    not on the file system. At most `concurrency` files (the number of CPUs by
+    default) are checked at once, in a pool of processes or threads started
+    for the call, or in the given `executor`.
+
+    If the iteration stops early (`break`, an exception or a cancellation),
+    files not started are not checked and the pool of the call is stopped: its
+    processes are terminated, and its threads stop at the next statement.
+
+    ```python
+    >>> async for file in check_many(["main.c", ("lib.h", source)], concurrency=4):
+    ...     print(file.path, file.errors.status)
+    ```
+    """
+    loop = asyncio.get_running_loop()
+    concurrency = concurrency or os.cpu_count() or 1
+    if concurrency < 1:
+        raise ValueError("concurrency must be a positive integer")
+    if executor == "process":
+        pool: Executor = ProcessPoolExecutor(concurrency)
+    elif executor == "thread":
+        pool = ThreadPoolExecutor(concurrency, thread_name_prefix="norminette")
+    elif isinstance(executor, Executor):
+        pool = executor
+    else:
+        raise ValueError(f"invalid executor {executor!r}, expected 'process', 'thread' or an Executor")
+    cancelled = threading.Event() if isinstance(pool, ThreadPoolExecutor) else None
+    select, ignore = tuple(select), tuple(ignore)
+    pending = {}
+    iterator = _items(items).__aiter__()
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < concurrency:
+                try:
+                    path, source = await iterator.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                future = loop.run_in_executor(pool, _check, path, source, select, ignore, cancelled)
+                pending[future] = path
+            if not pending:
+                break
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                file = File(pending.pop(future))
+                for error in future.result():
+                    file.errors.add(error)
+                yield file
+    finally:
+        if cancelled is not None:
+            cancelled.set()
+        for future in pending:
+            future.cancel()
+        if pool is not executor:
+            pool.shutdown(wait=False, cancel_futures=True)
+            if pending and isinstance(pool, ProcessPoolExecutor):
+                _terminate(pool)
+
+
+def _terminate(pool: ProcessPoolExecutor) -> None:
+    """Stops the processes of `pool`, which would finish their current file.
+    """
+    if hasattr(pool, "terminate_workers"):  # Python 3.14
+        return pool.terminate_workers()
+    for process in list((pool._processes or {}).values()):
+        process.terminate()
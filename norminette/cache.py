@@ -0,0 +1,242 @@
+import copy
+import collections
+import contextlib
+import dataclasses
+import itertools
+from typing import Dict, Optional
+
+from norminette.chunks import find_boundaries, snapshot, transient_attributes
+from norminette.errors import Error
+from norminette.scope import GlobalScope
+
+# Records `check_func_declaration` skips when looking for what precedes a function
+lookback_records = (
+    "IsPreprocessorStatement",
+    "IsComment",
+    "IsFuncDeclaration",
+)
+
+# Context attributes that are not part of the stored state: the history is
+# replayed from the records of the unit, and units are only stored when all
+# tokens were recognized
+replayed_attributes = (
+    "history",
+    "unrecognized_tokens",
+)
+
+# Tokens that start the statements `History` skips, at most one per statement
+skippable_tokens = ("NEWLINE", "COMMENT", "MULT_COMMENT", "HASH")
+
+# Counters of the global scope that only grow. The rules only compare them
+# to a threshold (or never read them), so they are part of the state up to
+# what the tokens of a unit can need, and are added to on a cache hit.
+counters = {
+    # `IsBlockStart` compares it to the number of skipped records
+    "lines": lambda context, tokens: 1 + context.history.skipped + sum(
+        token.type in skippable_tokens for token in tokens
+    ),
+    "instructions": lambda context, tokens: 0,
+    "functions": lambda context, tokens: 6,  # `CheckFunctionsCount`
+}
+
+
+@dataclasses.dataclass
+class Entry:
+    size: int
+    errors: list
+    records: list
+    fnames: list
+    counters: dict
+    state: dict
+
+
+class Unit:
+    """A top-level unit being checked, whose errors and effect on the state
+    are stored in the cache if the statements end at its last token.
+    """
+
+    def __init__(self, key, context, end: int) -> None:
+        self.key = key
+        self.end = end
+        self.size = len(context.tokens) - end
+        self.first = context.tokens[0].lineno
+        self.errors = context.errors
+        self.total = context.history.total
+        scope = global_scope(context)
+        self.fnames = len(scope.fnames)
+        self.counters = {name: getattr(scope, name) for name in counters}
+        context.errors = context.errors.empty_like()  # Still stops a cancelled check
+
+
+class UnitCache:
+    """Errors of the top-level units (functions, declarations, ...) of the
+    files checked, so unchanged units of a re-checked file are not checked
+    again.
+
+    A unit is found by its tokens, the lines it spans and what the rules can
+    read of the state at its start. Its errors are stored with lines relative
+    to its first line, so a unit moved by an edit above it is still found.
+
+    A cache must be used by a single `Registry`, since the errors depend on
+    the selected rules.
+    """
+
+    def __init__(self, maxsize: int = 10_000) -> None:
+        self.maxsize = maxsize
+        self.entries: Dict[tuple, Entry] = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def units(self, context) -> Dict[int, int]:
+        """Returns the number of tokens left at the end of each unit, by the
+        number of tokens left at its start.
+        """
+        points = [len(context.tokens)]
+        points.extend(len(context.tokens) - index for index in find_boundaries(context.tokens))
+        return dict(zip(points, points[1:]))
+
+    def key(self, context, end: int) -> Optional[tuple]:
+        if context.unrecognized_tokens:
+            return None
+        size = len(context.tokens) - end
+        tokens = context.tokens[:size]
+        for token in context.tokens[size:]:
+            tokens.append(token)
+            if token.type not in ("SPACE", "TAB", "NEWLINE"):
+                break
+        first, last = tokens[0].lineno, tokens[size - 1].lineno
+        lines = context.file.lines
+        with normalized(context, tokens) as state:
+            state = snapshot(state)
+        return (
+            context.file.basename,
+            tuple((token.type, token.value, token.lineno - first, token.column) for token in tokens),
+            tuple(lines.widths[first:last + 1]),
+            tuple(lines.flags[first:last + 1]),
+            state,
+            history_state(context.history),
+        )
+
+    def replay(self, context, key) -> bool:
+        """Applies the stored unit `key` to `context`, returns if it was found.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False
+        self.hits += 1
+        self.entries.move_to_end(key)
+        offset = context.tokens[0].lineno
+        for error in entry.errors:
+            context.errors.add(shift(error, offset))
+        scope = global_scope(context)
+        fnames = scope.fnames + entry.fnames
+        values = {name: getattr(scope, name) + delta for name, delta in entry.counters.items()}
+        for name, value in copy.deepcopy(entry.state).items():
+            setattr(context, name, value)
+        for record in entry.records:
+            context.history.append(record)
+        scope = global_scope(context)
+        scope.fnames = fnames
+        for name, value in values.items():
+            setattr(scope, name, value)
+        context.pop_tokens(entry.size)
+        return True
+
+    def start(self, context, end: int) -> Optional[Unit]:
+        """Starts checking the unit that ends when `end` tokens are left, or
+        returns `None` if it was replayed from the cache.
+        """
+        key = self.key(context, end)
+        if key is None:
+            return None
+        if self.replay(context, key):
+            return None
+        return Unit(key, context, end)
+
+    def finish(self, context, unit: Unit) -> None:
+        """Stops checking `unit`, storing it if the statements ended at its end.
+        """
+        errors, context.errors = context.errors, unit.errors
+        for error in errors:
+            context.errors.add(error)
+        count = context.history.total - unit.total
+        if len(context.tokens) != unit.end or count > len(context.history) or context.unrecognized_tokens:
+            return
+        scope = global_scope(context)
+        entry = Entry(
+            size=unit.size,
+            errors=[shift(error, -unit.first) for error in errors],
+            records=list(itertools.islice(reversed(context.history), count))[::-1],
+            fnames=scope.fnames[unit.fnames:],
+            counters={name: getattr(scope, name) - value for name, value in unit.counters.items()},
+            state={},
+        )
+        with normalized(context, ()) as state:
+            entry.state = copy.deepcopy(state)
+        self.entries[unit.key] = entry
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+
+def global_scope(context) -> GlobalScope:
+    scope = context.scope
+    while scope.parent is not None:
+        scope = scope.parent
+    return scope
+
+
+def shift(error: Error, offset: int) -> Error:
+    highlights = [dataclasses.replace(it, lineno=it.lineno + offset) for it in error.highlights]
+    return dataclasses.replace(error, highlights=highlights)
+
+
+@contextlib.contextmanager
+def normalized(context, tokens):
+    """Yields the state of `context` that is stored for a unit of `tokens`,
+    without the history and with the counters of the global scope capped to
+    what the unit can need.
+
+    Only the last function name is kept, since it is the only one read.
+    """
+    scope = global_scope(context)
+    saved = {name: getattr(scope, name) for name in counters}
+    fnames = scope.fnames
+    for name, cap in counters.items():
+        setattr(scope, name, min(saved[name], cap(context, tokens)))
+    scope.fnames = fnames[-1:]
+    try:
+        yield {
+            name: value
+            for name, value in vars(context).items()
+            if name not in transient_attributes and name not in replayed_attributes
+        }
+    finally:
+        for name, value in saved.items():
+            setattr(scope, name, value)
+        scope.fnames = fnames
+
+
+def history_state(history):
+    """Returns what the rules can read of `history` while checking a unit.
+
+    Records are read backwards past the ones in `lookback_records`, and the
+    history length and counts are only compared to small numbers.
+    """
+    tail = 0
+    while tail < len(history) and history[-tail - 1] in lookback_records:
+        tail += 1
+    tail = min(len(history), max(3, tail + 2))
+    headers = history.counts["IsComment"] + history.counts["IsEmptyLine"]
+    return snapshot((
+        list(itertools.islice(reversed(history), tail)),
+        min(len(history), tail + 1),
+        min(history.total - headers, 2),
+        history.significants,
+        history.skipped,
+        history.braces,
+        history.function_brace,
+    ))
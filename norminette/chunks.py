@@ -0,0 +1,265 @@
+import sys
+from collections import deque
+from typing import Any, Dict, List, Optional, Sequence
+
+from norminette.errors import Errors
+from norminette.lexer import Token
+from norminette.rules import Rule
+
+# Chunks smaller than this are not worth a process
+MIN_CHUNK_SIZE = 2000
+
+# Context attributes that are not state carried from a statement to the next
+transient_attributes = (
+    "file",
+    "tokens",
+    "errors",
+    "memo",
+    "debug",
+    "tkn_scope",
+    "changed_lines",
+    "unchanged_lines",
+)
+
+
+def find_boundaries(tokens: Sequence[Token]) -> List[int]:
+    """Returns the indexes of the tokens that follow a `}` or `;` outside of
+    braces and preprocessor conditionals, and the end of its line if there is
+    only whitespace left on it, like the statements.
+    """
+    boundaries = []
+    depth = conditionals = 0
+    line_start = True
+    for index, token in enumerate(tokens):
+        if line_start and token.type == "HASH":
+            directive = next((it for it in tokens[index + 1:index + 4] if it.type not in ("SPACE", "TAB")), None)
+            if directive is not None:
+                if directive.type == "IF" or directive.value in ("ifdef", "ifndef"):
+                    conditionals += 1
+                elif directive.value == "endif":
+                    conditionals -= 1
+        if token.type not in ("SPACE", "TAB"):
+            line_start = token.type == "NEWLINE"
+        if token.type == "LBRACE":
+            depth += 1
+        elif token.type == "RBRACE":
+            depth -= 1
+        if depth == 0 and conditionals == 0 and token.type in ("RBRACE", "SEMI_COLON"):
+            boundaries.append(index + 1)
+        elif token.type == "NEWLINE" and boundaries and all(
+            it.type in ("SPACE", "TAB") for it in tokens[boundaries[-1]:index]
+        ):
+            boundaries[-1] = index + 1
+    return boundaries
+
+
+def split_points(tokens: Sequence[Token], jobs: int) -> List[int]:
+    """Returns the number of tokens left at the start of each chunk, splitting
+    the tokens in up to `jobs` chunks of similar sizes at top-level boundaries.
+    """
+    size = max(len(tokens) // jobs, MIN_CHUNK_SIZE)
+    points = [len(tokens)]
+    for boundary in find_boundaries(tokens):
+        if len(points) == jobs:
+            break
+        if boundary >= size * len(points) and len(tokens) - boundary >= MIN_CHUNK_SIZE:
+            points.append(len(tokens) - boundary)
+    return points
+
+
+def snapshot(value: Any, seen: Optional[Dict[int, int]] = None) -> Any:
+    """Returns a comparable and picklable copy of the state in `value`.
+    """
+    if seen is None:
+        seen = {}
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, type):
+        return value.__name__
+    if isinstance(value, Rule):
+        return ("Rule", value.name)
+    if isinstance(value, Token):
+        return ("Token", value.type, value.pos, value.value)
+    if isinstance(value, (list, tuple, deque)):
+        return (type(value).__name__, tuple(snapshot(it, seen) for it in value))
+    if isinstance(value, (set, frozenset)):
+        return ("set", tuple(sorted(map(repr, (snapshot(it, seen) for it in value)))))
+    if isinstance(value, dict):
+        return ("dict", tuple(sorted((repr(key), snapshot(it, seen)) for key, it in value.items())))
+    if id(value) in seen:
+        return ("ref", seen[id(value)])
+    seen[id(value)] = len(seen)
+    attributes = vars(value) if hasattr(value, "__dict__") else {
+        name: getattr(value, name) for name in getattr(type(value), "__slots__", ()) if hasattr(value, name)
+    }
+    return (type(value).__name__, snapshot(attributes, seen))
+
+
+def context_state(context):
+    return snapshot({key: value for key, value in vars(context).items() if key not in transient_attributes})
+
+
+def run_in_chunks(registry, context, jobs: int) -> None:
+    """Runs `registry` on `context` like `Registry.run`, checking up to `jobs`
+    chunks of the file in parallel.
+
+    A process runs the statements in skeleton mode, where only the checks that
+    update the parser state run inside functions and types, and forks a worker
+    at the start of each chunk to check it from that state. A chunk is valid
+    if its starting state is the state at the end of the previous chunk, else
+    the worker of the previous chunk checks the rest of the file. Files that
+    can't be split, and any failure, are checked sequentially, so the errors
+    are the same as `Registry.run`.
+    """
+    import multiprocessing
+
+    points = split_points(context.tokens, jobs)
+    if (
+        len(points) < 2
+        or context.debug
+        or context.errors.limit is not None
+        or context.changed_lines is not None
+        or "fork" not in multiprocessing.get_all_start_methods()
+    ):
+        return registry.run(context)
+
+    fork = multiprocessing.get_context("fork")
+    connections = [fork.Pipe() for _ in points]
+    sys.stdout.flush()
+    skeleton = fork.Process(target=_run_skeleton, args=(registry, context, points, connections))
+    skeleton.start()
+    for _, connection in connections:
+        connection.close()
+    try:
+        result = _gather(connection for connection, _ in connections)
+    finally:
+        for connection, _ in connections:
+            connection.close()
+        skeleton.join()
+    if result is None:
+        return registry.run(context)
+    errors, context.unrecognized_tokens = result
+    for error in errors:
+        context.errors.add(error)
+    registry.finish(context)
+
+
+def _gather(connections):
+    """Returns the errors of the valid chunks and the unrecognized tokens at
+    the end of the file, or `None` if the file must be checked sequentially.
+    """
+    errors = []
+    previous = previous_state = None
+    for connection in connections:
+        message = _receive(connection)
+        if message is not None and (previous is None or message["start"] == previous_state):
+            if previous is not None:
+                previous.send("stop")
+            errors.extend(message["errors"])
+            if message["finished"]:
+                return errors, message["unrecognized"]
+            previous, previous_state = connection, message["end"]
+            continue
+        if previous is None:
+            return None
+        previous.send("continue")
+        message = _receive(previous)
+        if message is None:
+            return None
+        errors.extend(message["errors"])
+        return errors, message["unrecognized"]
+    return None
+
+
+def _receive(connection):
+    try:
+        message = connection.recv()
+    except (EOFError, OSError):
+        return None
+    return message if message.get("ok") else None
+
+
+def _run_skeleton(registry, context, points, connections):
+    for connection, _ in connections:
+        connection.close()
+    workers = []
+    for index, (_, connection) in enumerate(connections):
+        try:
+            if index == 0:
+                workers.append(_fork_worker(registry, context, points, index, connections))
+                context.errors = Errors()
+                context.changed_lines = set()
+                context.unchanged_lines = context.find_unchanged_lines()
+                registry.run_start(context)
+            else:
+                registry.run_statements(context, points[index])
+                workers.append(_fork_worker(registry, context, points, index, connections))
+        except Exception:
+            break
+        finally:
+            connection.close()
+    for _, connection in connections[index:]:
+        connection.close()
+    for worker in workers:
+        worker.join()
+
+
+def _fork_worker(registry, context, points, index, connections):
+    import multiprocessing
+
+    worker = multiprocessing.get_context("fork").Process(
+        target=_run_worker,
+        args=(registry, context, points, index, connections),
+    )
+    worker.start()
+    return worker
+
+
+def _run_worker(registry, context, points, index, connections):
+    connection = connections[index][1]
+    for other, (_, child) in enumerate(connections):
+        if other != index:
+            child.close()
+    try:
+        start = context_state(context) if index else None
+        context.errors = Errors()
+        context.changed_lines = None
+        context.unchanged_lines = set()
+        if index == 0:
+            registry.run_start(context)
+        stop = points[index + 1] if index + 1 < len(points) else 0
+        registry.run_statements(context, stop)
+        finished = not context.tokens
+        if finished:
+            registry.run_end(context)
+        _send(connection, {
+            "ok": True,
+            "start": start,
+            "end": None if finished else context_state(context),
+            "errors": list(context.errors),
+            "finished": finished,
+            "unrecognized": context.unrecognized_tokens,
+        })
+        if finished or connection.recv() != "continue":
+            return
+        context.errors = Errors()
+        registry.run_statements(context)
+        registry.run_end(context)
+        _send(connection, {
+            "ok": True,
+            "errors": list(context.errors),
+            "unrecognized": context.unrecognized_tokens,
+        })
+    except EOFError:
+        pass  # The chunk is not needed anymore
+    except Exception:
+        _send(connection, {"ok": False})
+    finally:
+        connection.close()
+
+
+def _send(connection, message):
+    try:
+        connection.send(message)
+    except OSError:
+        pass  # The parent stopped gathering chunks
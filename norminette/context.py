@@ -1,7 +1,9 @@
+import collections
+import functools
 from dataclasses import dataclass, field
 
 from norminette.errors import Error, Highlight
-from norminette.lexer import Token
+from norminette.lexer import Token, TokenBuffer
 from norminette.exceptions import CParsingError
 from norminette.scope import GlobalScope, ControlStructure
 from norminette.tools.colors import colors
@@ -141,6 +143,23 @@ whitespaces = ["SPACE", "TAB", "ESCAPED_NEWLINE", "NEWLINE"]
 arg_separator = ["COMMA", "CLOSING_PARENTHESIS"]
 
 
+def memoize(method):
+    """Caches the results of a `Context` parsing helper by its arguments until
+    the tokens are popped, so primaries that try to parse the same statement
+    don't parse the same declaration specifiers again.
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (name, args, tuple(kwargs.items()))
+        if key not in self.memo:
+            self.memo[key] = method(self, *args, **kwargs)
+        return self.memo[key]
+
+    return wrapper
+
+
 @dataclass
 class Macro:
     name: str
@@ -182,21 +201,108 @@ class PreProcessors:
         return False
 
 
+class History:
+    """Primary rules matched so far, the most recent last.
+
+    Only the last `size` records are kept, what rules need to know about
+    older records is updated incrementally on each `.append(...)`.
+    """
+
+    size = 1024
+
+    # Records that can appear anywhere, so they don't tell in which
+    # statement we are
+    insignificants = (
+        "IsEmptyLine",
+        "IsComment",
+        "IsPreprocessorStatement",
+    )
+
+    def __init__(self, size=None) -> None:
+        self.records = collections.deque(maxlen=size or self.size)
+        self.counts = collections.Counter()
+        # Last two significant records and the insignificant records after them
+        self.significants = collections.deque(maxlen=2)
+        self.skipped = 0
+        # Records that precede each unclosed `IsBlockStart`
+        self.braces = []
+        self.function_brace = None
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, index):
+        return self.records[index]
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __reversed__(self):
+        return reversed(self.records)
+
+    def __repr__(self) -> str:
+        return repr(list(self.records))
+
+    def append(self, record) -> None:
+        if record == "IsBlockStart":
+            self.braces.append(self.records[-1] if self.records else None)
+            if self.braces[-1] == "IsFuncDeclaration":
+                self.function_brace = len(self.braces)
+        elif record == "IsBlockEnd" and self.braces:
+            if self.function_brace == len(self.braces):
+                self.function_brace = None
+            self.braces.pop()
+        if record in self.insignificants:
+            self.skipped += 1
+        else:
+            self.significants.append(record)
+            self.skipped = 0
+        self.counts[record.name] += 1
+        self.records.append(record)
+
+    @property
+    def total(self) -> int:
+        """Number of records appended, including the ones no longer kept.
+        """
+        return sum(self.counts.values())
+
+    def last_significant(self, before_last=False):
+        """Returns the last record that is not in `insignificants`, skipping
+        the last record if `before_last` is set.
+        """
+        significants = list(self.significants)
+        if before_last and self.skipped == 0:
+            significants.pop()
+        return significants[-1] if significants else None
+
+    def is_inside_a_function(self) -> bool:
+        """Returns if the most recent function body is not closed yet.
+        """
+        return self.function_brace is not None
+
+
 class Context:
-    def __init__(self, file, tokens, debug=0, added_value=[]):
+    def __init__(self, file, tokens, debug=0, added_value=[], changed_lines=None):
+        """`tokens` can be a `Lexer`, whose tokens are then lexed while the
+        statements are checked, as far as the rules read them.
+        """
         # Header relative informations
         self.header_started = False
         self.header_parsed = False
         self.header = ""
         # File relative informations
         self.file = file
-        self.tokens = tokens
+        self.tokens = tokens if isinstance(tokens, TokenBuffer) else TokenBuffer(tokens)
         self.debug = int(debug)
 
         # Rule relative informations
-        self.history = []
+        self.history = History()
         self.errors = file.errors
-        self.tkn_scope = len(tokens)
+        # Tokens of the current statement, once a primary rule matched it
+        self.tkn_scope = 0
+        self.unrecognized_tokens = []
+        self.memo = {}
+        self.retired = set()
 
         # Scope informations
         self.scope = GlobalScope()
@@ -210,11 +316,76 @@ class Context:
         self.preproc = PreProcessors()
         self.preproc.skip_define = "CheckDefine" in (added_value or [])
 
+        # Lines changed since a git revision, see `--diff`
+        self.changed_lines = changed_lines
+        self.unchanged_lines = set()
+        if changed_lines is not None:
+            self.unchanged_lines = self.find_unchanged_lines()
+
+    def find_unchanged_lines(self):
+        """Returns the lines of the top-level units (functions, user defined
+        types, ...) that have no changed lines.
+
+        A unit goes from the end of the previous top-level statement to its
+        closing brace, if braces are not balanced no line is returned.
+        """
+        lines = set()
+        depth = 0
+        start = None
+        for token in self.tokens:
+            if start is None and token.type not in whitespaces + ["COMMENT", "MULT_COMMENT"]:
+                start = token.lineno
+            if token.type == "LBRACE":
+                depth += 1
+            elif token.type == "RBRACE":
+                depth -= 1
+                if depth < 0:
+                    return set()
+            if depth or token.type not in ("RBRACE", "SEMI_COLON"):
+                continue
+            unit = range(start, token.lineno + 1)
+            if not any(line in self.changed_lines for line in unit):
+                lines.update(unit)
+            start = None
+        if depth:
+            return set()
+        return lines
+
+    def is_unchanged(self):
+        """Returns if the current statement is inside the braces of a top-level
+        unit with no changed lines, so its errors would not be reported.
+        """
+        return (
+            bool(self.unchanged_lines)
+            and type(self.scope) is not GlobalScope
+            and self.tokens[0].lineno in self.unchanged_lines
+        )
+
     def peek_token(self, pos):
-        return self.tokens[pos] if pos < len(self.tokens) else None
+        return self.tokens.get(pos)
+
+    def statement_lines(self):
+        """Returns the first and the last line where the tokens of the current
+        statement start.
+        """
+        last = self.tkn_scope - 1 if self.tokens.has(self.tkn_scope) else len(self.tokens) - 1
+        return self.tokens[0].pos[0], self.tokens[last].pos[0]
+
+    def token_types(self):
+        """Returns the types of the tokens of the current statement and of the
+        tokens after it until the end of its last line.
+        """
+        key = ("token_types", self.tkn_scope)
+        if key not in self.memo:
+            end = self.tkn_scope
+            while self.tokens.has(end + 1) and (end == 0 or self.tokens[end - 1].type != "NEWLINE"):
+                end += 1
+            self.memo[key] = frozenset(token.type for token in self.tokens[:end])
+        return self.memo[key]
 
     def pop_tokens(self, stop):
-        self.tokens = self.tokens[stop:]
+        self.tokens.pop(stop)
+        self.memo.clear()
 
     def check_token(self, pos, value):
         """Compares the token at 'pos' against a value or list of values"""
@@ -390,6 +561,7 @@ In \"{self.scope.name}\" from \
 
         return -1
 
+    @memoize
     def skip_misc_specifier(self, pos, nl=False):
         i = self.skip_ws(pos, nl=nl)
         if self.check_token(i, "IDENTIFIER"):
@@ -421,6 +593,7 @@ In \"{self.scope.name}\" from \
             i += self.skip_misc_specifier(pos)
         return i
 
+    @memoize
     def check_type_specifier(self, pos, user_def_type=False, nl=False):
         """Returns (True, pos + n) if the tokens from 'pos' to 'n' could match
         a valid type specifier. Valid type specifiers consist of:
@@ -471,6 +644,7 @@ In \"{self.scope.name}\" from \
             else:
                 return True, tmp
 
+    @memoize
     def check_identifier(self, pos, nl=False):
         """
         Determines the function return value or the variable type and returns
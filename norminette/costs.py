@@ -0,0 +1,86 @@
+import os
+from typing import Dict, List, Optional
+
+from norminette.file import File
+
+# Files whose time is kept, the ones checked the longest ago are forgotten first
+MAX_ENTRIES = 10_000
+
+
+def cache_dir() -> str:
+    """Returns the directory where norminette keeps data between runs:
+    `$NORMINETTE_CACHE_DIR`, else `$XDG_CACHE_HOME/norminette`, else
+    `~/.cache/norminette`.
+    """
+    path = os.environ.get("NORMINETTE_CACHE_DIR")
+    if path:
+        return path
+    return os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "norminette")
+
+
+class Costs:
+    """Seconds spent to lex and check files in previous runs, stored in
+    `costs.json` in the cache directory.
+
+    The cost of a file never checked is estimated from its size, at the
+    average speed of the files that were, or is its size if none was.
+    """
+
+    def __init__(self, path: Optional[str] = None, load: bool = True) -> None:
+        self.path = path or os.path.join(cache_dir(), "costs.json")
+        self.entries: Dict[str, List[float]] = {}  # Path: [seconds, size]
+        self.changed = False
+        if not load:
+            return
+        try:
+            with open(self.path) as stream:
+                import json
+
+                entries = json.load(stream)
+        except (OSError, ValueError):
+            return
+        if isinstance(entries, dict):
+            self.entries = entries
+
+    def seconds_per_byte(self) -> float:
+        """Returns the average speed of the recorded files, or 1 if none was
+        recorded, making the costs byte sizes.
+        """
+        seconds = sum(entry[0] for entry in self.entries.values())
+        size = sum(entry[1] for entry in self.entries.values())
+        return seconds / size if seconds and size else 1.0
+
+    def estimates(self, files: List[File]) -> List[float]:
+        """Returns the cost of each file in `files`.
+        """
+        rate = self.seconds_per_byte()
+        costs = []
+        for file in files:
+            entry = self.entries.get(os.path.abspath(file.path))
+            costs.append(entry[0] if entry is not None else file.size * rate)
+        return costs
+
+    def record(self, file: File, seconds: float) -> None:
+        key = os.path.abspath(file.path)
+        self.entries.pop(key, None)
+        self.entries[key] = [round(seconds, 6), file.size]
+        self.changed = True
+
+    def save(self) -> None:
+        """Writes the costs if they changed. Failing to write them is ignored,
+        they only make later runs faster.
+        """
+        if not self.changed:
+            return
+        import json
+
+        entries = dict(list(self.entries.items())[-MAX_ENTRIES:])
+        temporary = f"{self.path}.{os.getpid()}"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(temporary, "w") as stream:
+                json.dump(entries, stream, separators=(",", ":"))
+            os.replace(temporary, self.path)
+        except OSError:
+            pass
+        self.changed = False
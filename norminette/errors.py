@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import os
-import json
 from dataclasses import dataclass, field, asdict
 from typing import (
     TYPE_CHECKING,
@@ -13,9 +12,11 @@ from typing import (
     overload,
     Any,
     Type,
+    Callable,
 )
 
 from norminette.colors import error_color
+from norminette.i18n import translate
 from norminette.norm_error import errors as errors_dict
 
 if TYPE_CHECKING:
@@ -53,13 +54,23 @@ class Highlight:
 @dataclass
 class Error:
     name: str
-    text: str
+    text: Optional[str] = field(default=None)
     level: ErrorLevel = field(default="Error")
     highlights: List[Highlight] = field(default_factory=list)
 
     @classmethod
     def from_name(cls: Type[Error], /, name: str, **kwargs) -> Error:
-        return cls(name, errors_dict[name], **kwargs)
+        if name not in errors_dict:
+            raise KeyError(name)
+        return cls(name, **kwargs)
+
+    def message(self, locale: Optional[str] = None) -> str:
+        """Returns the text of the error, or its message in `errors_dict`
+        translated to `locale` (the default locale if not given).
+        """
+        if self.text is not None:
+            return self.text
+        return translate(errors_dict[self.name], locale)
 
     def __lt__(self, other: Any) -> bool:
         assert isinstance(other, Error)
@@ -92,14 +103,29 @@ class Error:
 
 
 class Errors:
-    __slots__ = "_inner"
-
-    def __init__(self) -> None:
+    __slots__ = (
+        "_inner",
+        "_count",
+        "limit",
+        "accept",
+    )
+
+    def __init__(self, limit: Optional[int] = None) -> None:
         self._inner: List[Error] = []
+        self._count = 0
+        self.limit = limit
+        # Errors it returns `False` for are discarded, before they count for `limit`
+        self.accept: Optional[Callable[[Error], bool]] = None
 
     def __repr__(self) -> str:
         return repr(self._inner)
 
+    def empty_like(self) -> "Errors":
+        """Returns empty errors of the same kind, to collect errors apart from
+        these ones.
+        """
+        return Errors()
+
     def __len__(self) -> int:
         return len(self._inner)
 
@@ -155,11 +181,30 @@ class Errors:
         if len(args) == 2:
             error = Error(*args, **kwargs)
         assert isinstance(error, Error), "bad function call"
+        if self.is_full or (self.accept is not None and not self.accept(error)):
+            return
+        if error.level == "Error":
+            self._count += 1
         return self._inner.append(error)
 
+    def retain(self, predicate: Callable[[Error], bool]) -> None:
+        """Keeps only the errors for which `predicate` returns `True`.
+        """
+        self._inner = [it for it in self._inner if predicate(it)]
+        self._count = sum(it.level == "Error" for it in self._inner)
+
+    @property
+    def is_full(self) -> bool:
+        """Returns if `limit` errors of level `Error` were already added.
+
+        Once full, `.add(...)` silently discards new errors and the lexer
+        and `Registry.run` stop early, since nothing else can be reported.
+        """
+        return self.limit is not None and self._count >= self.limit
+
     @property
     def status(self) -> Literal["OK", "Error"]:
-        return "OK" if all(it.level == "Notice" for it in self._inner) else "Error"
+        return "Error" if self._count else "OK"
 
     def append(self, *args, **kwargs):
         """Deprecated alias for `.add(...)`, kept for backward compatibility.
@@ -178,6 +223,10 @@ class _formatter:
         self.files = files
         self.options = options
 
+    @property
+    def locale(self) -> Optional[str]:
+        return self.options.get("locale")
+
     def __init_subclass__(cls) -> None:
         cls.name = cls.__name__.rstrip("ErrorsFormatter").lower()
 
@@ -188,10 +237,11 @@ class HumanizedErrorsFormatter(_formatter):
         return self.options.get("use_colors", True)
 
     def _colorize_error_text(self, error: Error) -> str:
+        text = error.message(self.locale)
         color = error_color(error.name)
         if not self.use_colors or not color:
-            return error.text
-        return f"\x1b[{color}m{error.text}\x1b[0m"
+            return text
+        return f"\x1b[{color}m{text}\x1b[0m"
 
     def __str__(self) -> str:
         output = ''
@@ -208,16 +258,20 @@ class HumanizedErrorsFormatter(_formatter):
 
 class JSONErrorsFormatter(_formatter):
     def __str__(self):
+        import json
+
         files = []
         for file in self.files:
             files.append({
                 "path": os.path.abspath(file.path),
                 "status": file.errors.status,
-                "errors": tuple(map(asdict, file.errors)),
+                "errors": tuple({**asdict(it), "text": it.message(self.locale)} for it in file.errors),
             })
         output = {
             "files": files,
         }
+        if self.options.get("shard") is not None:
+            output["shard"] = self.options["shard"]
         return json.dumps(output, separators=(',', ':')) + '\n'
 
 
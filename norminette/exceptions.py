@@ -13,6 +13,11 @@ class CParsingError(NorminetteError):
         return self.__str__
 
 
+class BinaryFileError(CParsingError):
+    def __init__(self) -> None:
+        super().__init__("Binary file, not a C source")
+
+
 class MaybeInfiniteLoop(NorminetteError):
     def __init__(self) -> None:
         super().__init__("The maximum number of iterations a loop can have has been reached")
@@ -20,3 +25,7 @@ class MaybeInfiniteLoop(NorminetteError):
 
 class UnexpectedEOF(NorminetteError):
     pass
+
+
+class GitError(NorminetteError):
+    pass
@@ -1,13 +1,116 @@
 import os
-from typing import Optional
+from typing import List, Optional, Union
 
 from norminette.errors import Errors
+from norminette.exceptions import BinaryFileError
+
+# Files from this size are mapped in memory instead of read in a buffer
+MMAP_THRESHOLD = 256 * 1024
+
+# Bytes searched for a NUL byte to tell a binary file, like git does
+BINARY_SNIFF_SIZE = 8000
+
+
+def decode(data, encoding: Optional[str] = None) -> str:
+    """Returns the text of the bytes-like `data`, decoded from `encoding` or
+    from UTF-8 (Latin-1 if it isn't valid UTF-8), with the line endings
+    translated to `\n` like when reading a file in text mode.
+
+    Raises `BinaryFileError` if there is a NUL byte at its start.
+    """
+    if data.find(b"\0", 0, BINARY_SNIFF_SIZE) != -1:
+        raise BinaryFileError()
+    if encoding is not None:
+        text = str(data, encoding, "replace")
+    else:
+        try:
+            text = str(data, "utf-8")
+        except UnicodeDecodeError:
+            text = str(data, "latin-1")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def read_source(path: str, encoding: Optional[str] = None) -> str:
+    """Returns the decoded text of the file at `path`, see `decode`.
+    """
+    with open(path, "rb") as stream:
+        if os.fstat(stream.fileno()).st_size < MMAP_THRESHOLD:
+            return decode(stream.read(), encoding)
+        import mmap
+
+        with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return decode(data, encoding)
+
+
+class Lines:
+    """Table of the physical lines of a source, computed in a single pass.
+
+    `widths[lineno]` is the width of the line with tabs going to the next
+    multiple of 4, like the columns of the lexer, and `flags[lineno]` tells
+    which whitespace patterns the line contains. Line numbers start at 1.
+    """
+    LEADING_SPACE = 1
+    TRAILING_SPACE = 2
+    CONSECUTIVE_SPACES = 4
+    MIXED_SPACE_TAB = 8
+    # Characters that the lexer skips or escapes, putting tokens that are not
+    # next to each other in the line next to each other, and lines continued
+    # by an escaped newline.
+    UNUSUAL = 16
+
+    unusual_characters = frozenset("$@\\`")
+
+    def __init__(self, source: str) -> None:
+        self.widths: List[int] = [0]
+        self.flags: List[int] = [0]
+        continued = False
+        for line in source.split("\n"):
+            self.widths.append(len(line.replace("\r", " ").expandtabs(4)))
+            flags = self.UNUSUAL if continued else 0
+            if line.startswith(" "):
+                flags |= self.LEADING_SPACE
+            if line.endswith((" ", "\t")):
+                flags |= self.TRAILING_SPACE
+            if "  " in line:
+                flags |= self.CONSECUTIVE_SPACES
+            if " \t" in line or "\t " in line:
+                flags |= self.MIXED_SPACE_TAB
+            if not (line.isascii() and line.replace("\t", " ").isprintable()) \
+                    or not self.unusual_characters.isdisjoint(line):
+                flags |= self.UNUSUAL
+            self.flags.append(flags)
+            continued = line.endswith(("\\", "??/"))
+
+    def __len__(self) -> int:
+        return len(self.widths) - 1
+
+    def width(self, first: int, last: int) -> int:
+        """Returns the width of the widest line from `first` to `last`.
+        """
+        return max(self.widths[first:last + 1], default=0)
+
+    def any_flags(self, first: int, last: int) -> bool:
+        """Returns whether a line from `first` to `last` has any flag.
+        """
+        return any(self.flags[first:last + 1])
 
 
 class File:
-    def __init__(self, path: str, source: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        path: str,
+        source: Optional[Union[str, bytes]] = None,
+        encoding: Optional[str] = None,
+    ) -> None:
+        """`source` is the content of the file, read from `path` if not given,
+        and decoded from `encoding` if it's `bytes`, see `decode`.
+        """
         self.path = path
         self._source = source
+        self._lines: Optional[Lines] = None
+        self.encoding = encoding
 
         self.errors = Errors()
         self.basename = os.path.basename(path)
@@ -15,10 +118,31 @@ class File:
 
     @property
     def source(self) -> str:
-        if self._source is None:
-            with open(self.path) as file:
-                self._source = file.read()
+        source = self._source
+        if type(source) is str:  # Read for each character by the lexer
+            return source
+        if source is None:
+            self._source = read_source(self.path, self.encoding)
+        else:
+            self._source = decode(source, self.encoding)
         return self._source
 
+    @property
+    def size(self) -> int:
+        """Size of the source, read from the file system if not loaded yet.
+        """
+        if self._source is None:
+            try:
+                return os.path.getsize(self.path)
+            except OSError:
+                return 0
+        return len(self._source)
+
+    @property
+    def lines(self) -> Lines:
+        if self._lines is None:
+            self._lines = Lines(self.source)
+        return self._lines
+
     def __repr__(self) -> str:
         return f"<File {self.path!r}>"
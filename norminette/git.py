@@ -0,0 +1,115 @@
+import os
+import re
+import subprocess
+from typing import Dict, Iterator, Set, Tuple
+
+from norminette.exceptions import GitError
+
+HUNK_PATTERN = re.compile(r"^@@ -\d+(?:,\d+)? \+(?P<start>\d+)(?:,(?P<count>\d+))? @@")
+
+ESCAPE_PATTERN = re.compile(rb"\\([0-7]{3}|.)")
+ESCAPES = {b"a": b"\a", b"b": b"\b", b"t": b"\t", b"n": b"\n", b"v": b"\v", b"f": b"\f", b"r": b"\r"}
+
+
+def git(*args: str) -> bytes:
+    """Runs a git command and returns its standard output.
+    """
+    try:
+        result = subprocess.run(["git", *args], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    except FileNotFoundError:
+        raise GitError("git is not installed")
+    if result.returncode != 0:
+        message, *_ = result.stderr.decode(errors="replace").splitlines() or ["git failed"]
+        raise GitError(message)
+    return result.stdout
+
+
+def unquote(path: str) -> str:
+    """Returns `path` without the quotes and escapes of a C string that git
+    adds to paths with special characters.
+    """
+    if len(path) < 2 or not path.startswith('"') or not path.endswith('"'):
+        return path
+    data = ESCAPE_PATTERN.sub(
+        lambda match: bytes([int(match[1], 8)]) if len(match[1]) == 3 else ESCAPES.get(match[1], match[1]),
+        path[1:-1].encode(errors="surrogateescape"),
+    )
+    return data.decode(errors="surrogateescape")
+
+
+def parse_diff(diff: str) -> Dict[str, Set[int]]:
+    """Returns the lines added or modified in each file of an unified diff
+    made with `-U0`.
+
+    Removed lines have no counterpart in the new file, so the lines around
+    them are considered changed.
+    """
+    files: Dict[str, Set[int]] = {}
+    lines: Set[int] = set()
+    for line in diff.splitlines():
+        if line.startswith("+++ "):
+            # Git ends the line with a tab when the path has a space
+            path = unquote(line[4:].removesuffix("\t"))
+            lines = set()
+            if path.startswith("b/"):
+                files[os.path.normpath(path[2:])] = lines
+        elif match := HUNK_PATTERN.match(line):
+            start = int(match["start"])
+            count = int(match["count"] or 1)
+            if count == 0:
+                lines.update((start, start + 1))
+            else:
+                lines.update(range(start, start + count))
+    return files
+
+
+def changed_lines(ref: str) -> Dict[str, Set[int]]:
+    """Returns the lines changed in the C and header files of the whole
+    repository since `ref`, by the real path of the files.
+    """
+    # Outside a repository, `git diff` compares paths
+    top = os.fsdecode(git("rev-parse", "--show-toplevel").rstrip(b"\n"))
+    diff = git(
+        "-c", "core.quotePath=false", "diff", "-U0", "--no-color", "--no-ext-diff",
+        "--src-prefix=a/", "--dst-prefix=b/", ref, "--", ":(top)*.c", ":(top)*.h",
+    )
+    return {
+        os.path.realpath(os.path.join(top, path)): lines
+        for path, lines in parse_diff(diff.decode(errors="surrogateescape")).items()
+        if path.endswith((".c", ".h"))
+    }
+
+
+def staged_files() -> Iterator[Tuple[str, bytes]]:
+    """Yields the path and the staged content, not decoded, of the C and header
+    files added or modified in the index, with paths relative to the current
+    directory.
+
+    All contents are read from a single `git cat-file --batch` process.
+    """
+    git("rev-parse", "--git-dir")
+    output = git("diff", "--cached", "--name-only", "-z", "--relative", "--diff-filter=d", "--", "*.c", "*.h")
+    paths = [path for path in output.decode().split("\0") if path]
+    if not paths:
+        return
+    process = subprocess.Popen(
+        ["git", "cat-file", "--batch"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    assert process.stdin and process.stdout
+    try:
+        for path in paths:
+            process.stdin.write(f":./{path}\n".encode())
+            process.stdin.flush()
+            header = process.stdout.readline().split()
+            if len(header) != 3:
+                raise GitError(f"can't read staged content of {path!r}")
+            _, _, size = header
+            content = process.stdout.read(int(size) + 1)[:-1]  # Ignores the trailing `\n`
+            yield path, content
+    finally:
+        process.stdin.close()
+        process.stdout.close()
+        process.wait()
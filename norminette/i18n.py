@@ -1,14 +1,18 @@
+import functools
+import gettext
+import io
 import os
-import subprocess
 import sys
 from pathlib import Path
-from importlib.metadata import version
-from typing import List
+from typing import List, Optional
 
 
 __all__ = (
     "set_locale",
     "get_env_locale",
+    "resolve_locale",
+    "get_translation",
+    "translate",
     "_",
 )
 
@@ -21,29 +25,64 @@ LOCALE_DIR = Path(__file__).parent / "locale"
 
 DOMAIN = "norminette"
 
-# Default fallback
-_ = lambda _: _  # noqa: E731
+# Locale of the messages translated without an explicit locale
+_locale = "en_US"
 
 
 def set_locale(locale: str) -> None:
     """
-    Set the locale for the application.
-    This function loads the translation files from the locale directory and sets the translation function.
+    Set the default locale for the application.
+    Messages are translated to it when no locale is given to `translate`.
     """
-    print(f"Setting locale to {locale}")
-    global _
+    global _locale
+    _locale = locale
+
+
+def resolve_locale(locale: str) -> Optional[str]:
+    """
+    Get the locale of `LOCALES` that a locale or language tag like `pt-br` names, if any.
+    """
+    language, _, region = locale.partition(".")[0].replace("-", "_").partition("_")
+    names = [language.lower()]
+    if region:
+        names.insert(0, f"{language.lower()}_{region.upper()}")
+    return next((name for name in names if name in LOCALES), None)
+
+
+def get_translation(locale: str) -> gettext.NullTranslations:
+    """
+    Get the translation catalog of a locale.
+    Catalogs are loaded from the locale directory once per process, and unknown locales
+    fall back to the untranslated messages. Language tags like `pt-br` are accepted.
+    """
+    return _load_translation(resolve_locale(locale))
+
+
+@functools.lru_cache(maxsize=None)
+def _load_translation(name: Optional[str]) -> gettext.NullTranslations:
+    """
+    Load the catalog of a locale of `LOCALES`, or the untranslated messages for `None`.
+    It is read through the loader of the package, so it is found in a zipapp too.
+    """
+    if name is None:
+        return gettext.NullTranslations()
+    path = os.path.join(LOCALE_DIR, name, "LC_MESSAGES", f"{DOMAIN}.mo")
     try:
-        import gettext
+        catalog = __loader__.get_data(path)  # type: ignore[name-defined]
+    except OSError:
+        return gettext.NullTranslations()
+    return gettext.GNUTranslations(io.BytesIO(catalog))
 
-        translation = gettext.translation(
-            DOMAIN,
-            localedir=str(LOCALE_DIR),
-            languages=[locale],
-            fallback=True,
-        )
-        _ = translation.gettext
-    except ImportError:
-        raise
+
+def translate(message: str, locale: Optional[str] = None) -> str:
+    """
+    Translate a message to a locale, or to the default locale if not given.
+    """
+    return get_translation(locale or _locale).gettext(message)
+
+
+def _(message: str) -> str:
+    return translate(message)
 
 
 def get_env_locale(default: str = "en_US") -> str:
@@ -81,6 +120,8 @@ def _create_pot_file() -> None:
     """
     Create the .pot file by extracting translatable strings from Python source files.
     """
+    import subprocess
+
     root_dir = Path(__file__).parent.parent
     source_files = _collect_python_files(root_dir)
 
@@ -116,6 +157,8 @@ def _create_or_update_po_files() -> None:
     This function creates or updates .po files for each locale defined in the LOCALES list
     using the .pot file as a template and placing them in the correct locale directory.
     """
+    import subprocess
+
     pot_file = _get_pot_file_path()
     if not pot_file.exists():
         print("Error: .pot file not found. Run _create_pot_file() first.")
@@ -178,6 +221,8 @@ def _update_pot_header(pot_file: Path) -> None:
     """
     Update the header of the .pot file to set the charset to UTF-8 and update other metadata.
     """
+    from importlib.metadata import version
+
     project_version = version("norminette")
     try:
         with pot_file.open("r", encoding="utf-8") as f:
@@ -202,6 +247,8 @@ def _update_po_header(po_file: Path) -> None:
     """
     Update the header of the .po file to set the project version and other metadata.
     """
+    from importlib.metadata import version
+
     project_version = version("norminette")
     try:
         with po_file.open("r", encoding="utf-8") as f:
@@ -225,6 +272,8 @@ def _compile_mo_files() -> None:
     Compile .po files into .mo files for each locale.
     This function compiles the .po files into .mo files, which are used by gettext for translations.
     """
+    import subprocess
+
     for locale in LOCALES:
         po_file = LOCALE_DIR / locale / "LC_MESSAGES" / f"{DOMAIN}.po"
         mo_file = LOCALE_DIR / locale / "LC_MESSAGES" / f"{DOMAIN}.mo"
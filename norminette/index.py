@@ -0,0 +1,146 @@
+import os
+from dataclasses import asdict
+from typing import Dict, List, Optional
+
+from norminette.costs import cache_dir
+from norminette.errors import Error, Highlight
+from norminette.file import File
+
+
+def index_path(project: str) -> str:
+    """Returns the path of the index of the files of `project`, a directory,
+    in the cache directory.
+    """
+    name = os.path.abspath(project).strip(os.sep).replace(os.sep, "%") or "%"
+    return os.path.join(cache_dir(), "index", name + ".json")
+
+
+def stat_data(path: str) -> Optional[List[int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+
+
+def sources_fingerprint() -> str:
+    """Returns a hash of the size and mtime of the sources of norminette, so an
+    edited rule doesn't get the errors found by the old one. When norminette
+    runs from an archive, like a zipapp, the archive is used instead.
+    """
+    import hashlib
+
+    root = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha1()
+    for directory, names, files in os.walk(root):
+        names.sort()
+        for name in sorted(files):
+            if name.endswith(".py"):
+                path = os.path.join(directory, name)
+                digest.update(f"{os.path.relpath(path, root)}:{stat_data(path)}\n".encode())
+    if digest.digest() == hashlib.sha1().digest():
+        archive = root
+        while archive and not os.path.isfile(archive) and os.path.dirname(archive) != archive:
+            archive = os.path.dirname(archive)
+        digest.update(f"{archive}:{stat_data(archive)}".encode())
+    return digest.hexdigest()
+
+
+def content_hash(path: str) -> Optional[str]:
+    import hashlib
+
+    try:
+        with open(path, "rb") as stream:
+            return hashlib.sha1(stream.read()).hexdigest()
+    except OSError:
+        return None
+
+
+class Index:
+    """Errors of the files of a project found in previous runs, like the index
+    of git: each file has its stat data (size, mtime and inode), the hash of
+    its content and the errors found in it with the options in `key`.
+
+    A file whose stat data didn't change gets its errors without being opened.
+    A file modified in the same timestamp tick as the index was written can
+    have the stat data it had when it was recorded, so like git, a file whose
+    mtime isn't older than the index is "racily clean" and its content is
+    compared, and such entries are smudged when the index is written so they
+    are not trusted later.
+    """
+
+    def __init__(self, key: list, path: Optional[str] = None) -> None:
+        self.key = key
+        self.path = path or index_path(os.getcwd())
+        self.entries: Dict[str, dict] = {}
+        # Stat data and hash of the files to check, taken before they are read
+        self.pending: Dict[str, tuple] = {}
+        self.changed = False
+        self.timestamp = 0  # mtime of the index file
+        try:
+            with open(self.path) as stream:
+                import json
+
+                self.timestamp = os.fstat(stream.fileno()).st_mtime_ns
+                data = json.load(stream)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("key") == key:
+            self.entries = data["files"]
+
+    def restore(self, file: File) -> bool:
+        """Adds the recorded errors of `file` to it if its content didn't change
+        and returns whether it did.
+        """
+        path = os.path.abspath(file.path)
+        entry = self.entries.get(path)
+        stat = stat_data(path)
+        if stat is None:
+            return False
+        if entry is None or entry["stat"] != stat or stat[1] >= self.timestamp:
+            digest = content_hash(path)
+            if entry is None or entry["hash"] != digest:
+                self.pending[path] = stat, digest
+                return False
+            entry["stat"] = stat
+            self.changed = True
+        for error in entry["errors"]:
+            highlights = [Highlight(**highlight) for highlight in error["highlights"]]
+            file.errors.add(Error(**{**error, "highlights": highlights}))
+        return True
+
+    def record(self, file: File) -> None:
+        """Records the errors of `file`, which `restore` didn't find.
+
+        The stat data and hash were taken before the file was read, so if it
+        was modified since, it doesn't match them next time.
+        """
+        path = os.path.abspath(file.path)
+        stat, digest = self.pending.pop(path, (None, None))
+        if digest is None:
+            return
+        self.entries[path] = {"stat": stat, "hash": digest, "errors": [asdict(error) for error in file.errors]}
+        self.changed = True
+
+    def save(self) -> None:
+        """Writes the index if it changed. Failing to write it is ignored, it
+        only makes later runs faster.
+        """
+        if not self.changed:
+            return
+        import json
+
+        temporary = f"{self.path}.{os.getpid()}"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(temporary, "w") as stream:
+                # The clock of the file system, which can differ from ours on NFS
+                timestamp = os.fstat(stream.fileno()).st_mtime_ns
+                for entry in self.entries.values():
+                    if entry["stat"] is not None and entry["stat"][1] >= timestamp:
+                        entry["stat"] = None  # Smudged, racily clean
+                json.dump({"key": self.key, "files": self.entries}, stream, separators=(",", ":"))
+            os.replace(temporary, self.path)
+        except OSError:
+            pass
+        self.changed = False
@@ -0,0 +1,80 @@
+import time
+from typing import TYPE_CHECKING, Callable, Iterator, List, Optional, Sequence, Tuple
+
+from norminette.context import Context
+from norminette.exceptions import CParsingError
+from norminette.file import File
+from norminette.lexer import Lexer
+
+if TYPE_CHECKING:
+    from norminette.registry import Registry
+
+# Checked before forking, so the processes don't each do the first check slowly
+WARMUP_SOURCE = "#include <unistd.h>\n\nint\tmain(void)\n{\n\twrite(1, \"a\\n\", 2);\n\treturn (0);\n}\n"
+
+# Files checked by a process before it is replaced, so the memory it allocated is released
+MAX_FILES_PER_PROCESS = 1000
+
+# What the forked processes check, set before the pool is created
+_job: Optional[Tuple[Callable[[File], None], Sequence[File]]] = None
+
+
+def timed_check(check: Callable[[File], None], file: File) -> Tuple[Optional[str], float]:
+    """Calls `check` on `file` and returns the message of the parsing error
+    that stopped it, if any, and the seconds it took.
+    """
+    start = time.perf_counter()
+    try:
+        check(file)
+    except CParsingError as e:
+        return e.msg, time.perf_counter() - start
+    return None, time.perf_counter() - start
+
+
+def warm_up(registry: "Registry") -> None:
+    """Checks a small file with `registry`, so the lazy imports and caches of
+    the rules are done once, before processes are forked to share them.
+    """
+    file = File("warmup.c", WARMUP_SOURCE)
+    registry.run(Context(file, Lexer(file)))
+
+
+def _check(index: int):
+    check, files = _job
+    message, seconds = timed_check(check, files[index])
+    return index, list(files[index].errors), message, seconds
+
+
+def run_jobs(
+    check: Callable[[File], None],
+    files: Sequence[File],
+    costs: Sequence[float],
+    jobs: int,
+) -> Iterator[Tuple[File, Optional[str], float]]:
+    """Calls `check` on each file in `jobs` forked processes, starting with the
+    most costly, so a big file doesn't start last and finish long after the
+    others. The errors found are added to the files, which are yielded as they
+    are done with the message of their parsing error, if any, and the seconds
+    they took.
+
+    Objects created so far are frozen out of the garbage collector, so the
+    processes don't write to their pages and keep sharing them.
+    """
+    global _job
+    import gc
+    import multiprocessing
+
+    order: List[int] = sorted(range(len(files)), key=lambda index: -costs[index])
+    _job = check, files
+    gc.freeze()
+    try:
+        context = multiprocessing.get_context("fork")
+        with context.Pool(jobs, maxtasksperchild=MAX_FILES_PER_PROCESS) as pool:
+            for index, errors, message, seconds in pool.imap_unordered(_check, order):
+                file = files[index]
+                for error in errors:
+                    file.errors.add(error)
+                yield file, message, seconds
+    finally:
+        gc.unfreeze()
+        _job = None
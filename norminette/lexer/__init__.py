@@ -1,4 +1,4 @@
-from norminette.lexer.lexer import Lexer
-from norminette.lexer.tokens import Token
+from norminette.lexer.lexer import Lexer, Edit, relex
+from norminette.lexer.tokens import Token, TokenBuffer
 
-__all__ = ["Lexer", "Token"]
+__all__ = ["Lexer", "Token", "TokenBuffer", "Edit", "relex"]
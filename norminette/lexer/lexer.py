@@ -1,6 +1,8 @@
 import re
+import bisect
 import string
-from typing import Optional, Tuple, cast
+from dataclasses import dataclass, replace
+from typing import List, Optional, Sequence, Tuple, cast
 
 from norminette.exceptions import UnexpectedEOF, MaybeInfiniteLoop
 from norminette.lexer.dictionary import digraphs, trigraphs
@@ -9,7 +11,7 @@ from norminette.lexer.dictionary import keywords
 from norminette.lexer.dictionary import operators
 from norminette.lexer.tokens import Token
 from norminette.file import File
-from norminette.errors import Error, Highlight as H
+from norminette.errors import Error, Errors, Highlight as H
 
 
 def c(a: str, b: str):
@@ -94,11 +96,14 @@ FLOAT_HEXADECIMAL_LITERAL_PATTERN = _float_pattern(r"0[xX]+[\da-fA-F]+(?:\.[\da-
 
 
 class Lexer:
-    def __init__(self, file: File):
+    def __init__(self, file: File, *, offset: int = 0, pos: Tuple[int, int] = (1, 1)):
+        """Lexes `file` from the index `offset` of its source, which must be
+        at the start of a token found at `pos`.
+        """
         self.file = file
 
-        self.__pos = int(0)
-        self.__line_pos = self.__line = 1
+        self.__pos = offset
+        self.__line, self.__line_pos = pos
 
     def raw_peek(self, *, offset: int = 0, collect: int = 1):
         if (pos := self.__pos + offset) < len(self.file.source):
@@ -520,8 +525,10 @@ class Lexer:
                 self.__line_pos = 1
             else:
                 break
+        offset = self.__pos
         for parser in self.parsers:
             if result := parser(self):
+                result.offset = offset
                 return result
         if char := self.raw_peek():
             error = Error("BAD_LEXEME", f"No matchable token for '{char}' lexeme")
@@ -535,3 +542,70 @@ class Lexer:
     def __iter__(self):
         while token := self.get_next_token():
             yield token
+
+
+@dataclass
+class Edit:
+    """Replacement of the `removed` characters at the index `start` of a
+    source by `text`.
+    """
+    start: int
+    removed: int
+    text: str
+
+
+# Lexing a token can read a few characters past it, e.g. to find a trigraph
+LOOKAHEAD = 4
+
+
+def _error_pos(error: Error) -> Tuple[int, int]:
+    highlight = error.highlights[0] if error.highlights else H(0, 0)
+    return highlight.lineno, highlight.column
+
+
+def relex(file: File, tokens: Sequence[Token], errors: Sequence[Error], edit: Edit) -> List[Token]:
+    """Returns the tokens of `file`, given the `tokens` and the lexer `errors`
+    of its source before `edit`, and adds its lexer errors to `file.errors`.
+
+    Tokens are lexed again from the last token whose lexing can't read the
+    edit, until a token starts after the edit at the same place as an old
+    token. Since the lexer only depends on its position, the old tokens from
+    there are the same, moved by the lines and characters added or removed.
+    """
+    delta = len(edit.text) - edit.removed
+    start = bisect.bisect_right(tokens, edit.start - LOOKAHEAD, key=lambda token: token.offset) - 1
+    if start > 0:
+        offset, pos = tokens[start].offset, tokens[start].pos
+        errors_before = [error for error in errors if _error_pos(error) < pos]
+    else:
+        start, offset, pos = 0, 0, (1, 1)
+        errors_before = []
+    old = bisect.bisect_left(tokens, edit.start + edit.removed, key=lambda token: token.offset)
+
+    lexed = []
+    lexer_errors, file.errors = file.errors, Errors()
+    try:
+        for token in Lexer(file, offset=offset, pos=pos):
+            while old < len(tokens) and tokens[old].offset + delta < token.offset:
+                old += 1
+            if old < len(tokens) and tokens[old].offset + delta == token.offset and tokens[old].column == token.column:
+                break
+            lexed.append(token)
+        else:
+            old = len(tokens)
+    finally:
+        lexer_errors, file.errors = file.errors, lexer_errors
+
+    after = []
+    errors_after = []
+    if old < len(tokens):
+        lines = token.lineno - tokens[old].lineno
+        after = [Token(it.type, (it.lineno + lines, it.column), it.value, it.offset + delta) for it in tokens[old:]]
+        for error in errors:
+            if _error_pos(error) >= tokens[old].pos:
+                highlights = [replace(it, lineno=it.lineno + lines) for it in error.highlights]
+                errors_after.append(replace(error, highlights=highlights))
+        lexer_errors.retain(lambda error: _error_pos(error) < token.pos)
+    for error in (*errors_before, *lexer_errors, *errors_after):
+        file.errors.add(error)
+    return [*tokens[:start], *lexed, *after]
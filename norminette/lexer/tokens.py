@@ -1,4 +1,6 @@
-from typing import Optional, Tuple
+from collections.abc import Sequence
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple
 from dataclasses import dataclass, field
 
 
@@ -7,6 +9,8 @@ class Token:
     type: str
     pos: Tuple[int, int]
     value: Optional[str] = field(default=None)
+    # Index in the source where the lexer found the token
+    offset: Optional[int] = field(default=None, compare=False, repr=False)
 
     @property
     def length(self) -> int:
@@ -37,3 +41,100 @@ class Token:
         """
         r = f"<{self.type}={self.value}>" if self.value else f"<{self.type}>"
         return r
+
+
+class TokenBuffer(Sequence):
+    """Tokens left to check, taken from `tokens` (a `Lexer` or any iterable)
+    only when they are read, so lexing and checking overlap.
+
+    Indexes are relative to the first token left. Reading a token takes the
+    tokens up to it, while `len()` and negative indexes take all of them.
+    Popped tokens are dropped from the buffer.
+    """
+    __slots__ = ("_tokens", "_start", "_iterator")
+
+    # Tokens taken at least at once, taking them one by one is slower
+    LOOKAHEAD = 32
+    # Popped tokens kept before they are dropped, so dropping them is amortized
+    COMPACT_SIZE = 1024
+
+    def __init__(self, tokens: Iterable[Token]) -> None:
+        self._tokens: List[Token] = []
+        self._start = 0
+        self._iterator: Optional[Iterator[Token]] = iter(tokens)
+
+    def _fill(self, size: int) -> bool:
+        """Takes tokens until `size` tokens are left, returns whether there are.
+        """
+        tokens = self._tokens
+        missing = self._start + size - len(tokens)
+        if missing > 0 and self._iterator is not None:
+            count = len(tokens)
+            tokens.extend(islice(self._iterator, max(missing, self.LOOKAHEAD)))
+            if len(tokens) - count < max(missing, self.LOOKAHEAD):
+                self._iterator = None
+            missing = self._start + size - len(tokens)
+        return missing <= 0
+
+    def _fill_all(self) -> None:
+        if self._iterator is not None:
+            self._tokens.extend(self._iterator)
+            self._iterator = None
+
+    def __len__(self) -> int:
+        self._fill_all()
+        return len(self._tokens) - self._start
+
+    def __bool__(self) -> bool:
+        return self._fill(1)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop = index.start or 0, index.stop
+            if start < 0 or stop is None or stop < 0:
+                self._fill_all()
+                return self._tokens[self._start:][index]
+            self._fill(stop)
+            return self._tokens[self._start + start:self._start + stop:index.step]
+        if index < 0:
+            self._fill_all()
+            if -index > len(self._tokens) - self._start:
+                raise IndexError("token index out of range")
+            return self._tokens[index]
+        position = self._start + index
+        if position >= len(self._tokens) and not self._fill(index + 1):
+            raise IndexError("token index out of range")
+        return self._tokens[position]
+
+    def __iter__(self) -> Iterator[Token]:
+        index = 0
+        while self._fill(index + 1):
+            yield self._tokens[self._start + index]
+            index += 1
+
+    def __repr__(self) -> str:
+        return f"<TokenBuffer {self._tokens[self._start:]!r}{' ...' if self._iterator is not None else ''}>"
+
+    def get(self, index: int) -> Optional[Token]:
+        """Returns the token at `index`, or `None` if there are not as many.
+        """
+        if index >= 0:
+            position = self._start + index
+            if position < len(self._tokens) or self._fill(index + 1):
+                return self._tokens[position]
+            return None
+        return self[index]
+
+    def has(self, size: int) -> bool:
+        """Returns whether at least `size` tokens are left.
+        """
+        return self._start + size <= len(self._tokens) or self._fill(size)
+
+    def pop(self, count: int) -> None:
+        """Drops the first `count` tokens.
+        """
+        self._fill(count)
+        self._start = min(self._start + count, len(self._tokens))
+        if self._start >= self.COMPACT_SIZE and self._start * 2 >= len(self._tokens):
+            del self._tokens[:self._start]
+            self._start = 0
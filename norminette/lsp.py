@@ -0,0 +1,287 @@
+import json
+import queue
+import threading
+import time
+from typing import IO, Any, Dict, List, Optional
+from urllib.parse import unquote, urlparse
+
+from norminette.context import Context
+from norminette.errors import Error, Errors
+from norminette.exceptions import NorminetteError
+from norminette.file import File
+from norminette.lexer import Edit, Lexer, Token, relex
+from norminette.registry import Registry
+
+# Seconds without changes to a document before checking it
+DEBOUNCE_DELAY = 0.3
+
+SEVERITIES = {
+    "Error": 1,
+    "Notice": 3,
+}
+
+
+def utf16_length(text: str) -> int:
+    return len(text.encode("utf-16-le")) // 2
+
+
+def character(line: str, column: int) -> int:
+    """Returns the UTF-16 offset in `line` of a norminette `column`, which
+    counts from 1 with tabs going to the next multiple of 4.
+    """
+    current = 1
+    for index, char in enumerate(line):
+        if current >= column:
+            return utf16_length(line[:index])
+        current += 4 - (current - 1) % 4 if char == "\t" else 1
+    return utf16_length(line)
+
+
+def offset(text: str, position: Dict[str, int]) -> int:
+    """Returns the index in `text` of a LSP position, whose character is in
+    UTF-16 code units.
+    """
+    start = 0
+    for _ in range(position["line"]):
+        start = text.find("\n", start) + 1
+        if not start:
+            return len(text)
+    end = text.find("\n", start)
+    line = text[start:] if end == -1 else text[start:end]
+    units = 0
+    for index, char in enumerate(line):
+        if units >= position["character"]:
+            return start + index
+        units += utf16_length(char)
+    return start + len(line)
+
+
+def diagnostic(error: Error, lines: List[str], locale: Optional[str] = None) -> Dict[str, Any]:
+    highlight = error.highlights[0] if error.highlights else None
+    lineno = highlight.lineno - 1 if highlight else 0
+    line = lines[lineno] if 0 <= lineno < len(lines) else ""
+    column = highlight.column if highlight else 1
+    start = character(line, column)
+    end = character(line, column + (highlight and highlight.length or 1))
+    return {
+        "range": {
+            "start": {"line": lineno, "character": start},
+            "end": {"line": lineno, "character": max(end, start + 1)},
+        },
+        "severity": SEVERITIES.get(error.level, 1),
+        "code": error.name,
+        "source": "norminette",
+        "message": error.message(locale),
+    }
+
+
+class CancellableErrors(Errors):
+    """Errors that are full once `cancelled` is set, so `Registry.run` stops
+    at the next statement.
+    """
+    __slots__ = ("cancelled",)
+
+    def __init__(self, cancelled: threading.Event) -> None:
+        super().__init__()
+        self.cancelled = cancelled
+
+    @property
+    def is_full(self) -> bool:
+        return self.cancelled.is_set() or super().is_full
+
+    def empty_like(self) -> "CancellableErrors":
+        return CancellableErrors(self.cancelled)
+
+
+class Document:
+    def __init__(self, uri: str, text: str, version: int) -> None:
+        self.uri = uri
+        self.path = unquote(urlparse(uri).path) or uri
+        self.text = text
+        self.version = version
+        self.tokens: List[Token] = []
+        self.errors: List[Error] = []  # Lexer errors
+        self.lex()
+
+    def lex(self) -> None:
+        file = File(self.path, self.text)
+        try:
+            self.tokens = list(Lexer(file))
+        except NorminetteError as e:
+            self.tokens = []
+            file.errors.add("BAD_LEXEME", str(e) or type(e).__name__)
+        self.errors = list(file.errors)
+
+    def change(self, change: Dict[str, Any]) -> None:
+        """Applies a `TextDocumentContentChangeEvent`, lexing again only
+        around the edit if it has a range.
+        """
+        if "range" not in change:
+            self.text = change["text"]
+            return self.lex()
+        start = offset(self.text, change["range"]["start"])
+        end = offset(self.text, change["range"]["end"])
+        edit = Edit(start, end - start, change["text"])
+        self.text = self.text[:start] + edit.text + self.text[end:]
+        if not self.tokens:
+            return self.lex()
+        file = File(self.path, self.text)
+        try:
+            self.tokens = relex(file, self.tokens, self.errors, edit)
+        except NorminetteError:
+            return self.lex()
+        self.errors = list(file.errors)
+
+
+class Server:
+    """Language server over the streams `input` and `output`, publishing the
+    errors of the open documents as diagnostics.
+
+    Messages are read by a thread, which cancels the check of a document as
+    soon as a newer version of it arrives. Documents are checked once they
+    had no changes for `delay` seconds, with the same `registry`.
+    """
+
+    def __init__(self, registry: Registry, input: IO[bytes], output: IO[bytes], delay: float = DEBOUNCE_DELAY):
+        self.registry = registry
+        self.input = input
+        self.output = output
+        self.delay = delay
+        self.documents: Dict[str, Document] = {}
+        self.deadlines: Dict[str, float] = {}
+        self.messages: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self.lock = threading.Lock()
+        self.checking: Optional[str] = None
+        self.cancelled = threading.Event()
+        self.shutdown = False
+        self.locale: Optional[str] = None
+
+    def serve(self) -> int:
+        """Handles messages until `exit`, returns the exit code.
+        """
+        threading.Thread(target=self.read, daemon=True).start()
+        while True:
+            timeout = None
+            if self.deadlines:
+                timeout = max(0, min(self.deadlines.values()) - time.monotonic())
+            try:
+                message = self.messages.get(timeout=timeout)
+            except queue.Empty:
+                self.check_due()
+                continue
+            if message is None:
+                return 0 if self.shutdown else 1
+            if message.get("method") == "exit":
+                return 0 if self.shutdown else 1
+            self.handle(message)
+
+    def read(self) -> None:
+        while True:
+            headers = {}
+            while line := self.input.readline():
+                if not line.strip():
+                    break
+                name, _, value = line.decode("ascii", errors="replace").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            if not line or "content-length" not in headers:
+                break
+            body = self.input.read(int(headers["content-length"]))
+            try:
+                message = json.loads(body)
+            except ValueError:
+                continue
+            uri = message.get("params", {}).get("textDocument", {}).get("uri")
+            if message.get("method") in ("textDocument/didChange", "textDocument/didClose"):
+                with self.lock:
+                    if uri == self.checking:
+                        self.cancelled.set()
+            self.messages.put(message)
+        self.messages.put(None)
+
+    def send(self, message: Dict[str, Any]) -> None:
+        body = json.dumps({"jsonrpc": "2.0", **message}).encode()
+        self.output.write(f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+        self.output.flush()
+
+    def handle(self, message: Dict[str, Any]) -> None:
+        method, params = message.get("method"), message.get("params", {})
+        if method == "initialize":
+            self.locale = params.get("locale")
+            self.respond(message, {
+                "capabilities": {
+                    "textDocumentSync": {"openClose": True, "change": 2, "save": True},
+                },
+                "serverInfo": {"name": "norminette"},
+            })
+        elif method == "shutdown":
+            self.shutdown = True
+            self.respond(message, None)
+        elif method == "textDocument/didOpen":
+            item = params["textDocument"]
+            self.documents[item["uri"]] = Document(item["uri"], item["text"], item.get("version", 0))
+            self.deadlines[item["uri"]] = time.monotonic()
+        elif method == "textDocument/didChange":
+            document = self.documents.get(params["textDocument"]["uri"])
+            if document is None:
+                return
+            for change in params["contentChanges"]:
+                document.change(change)
+            document.version = params["textDocument"].get("version", document.version)
+            self.deadlines[document.uri] = time.monotonic() + self.delay
+        elif method == "textDocument/didSave":
+            if params["textDocument"]["uri"] in self.documents:
+                self.deadlines[params["textDocument"]["uri"]] = time.monotonic()
+        elif method == "textDocument/didClose":
+            uri = params["textDocument"]["uri"]
+            self.documents.pop(uri, None)
+            self.deadlines.pop(uri, None)
+            self.publish(uri, None, [])
+        elif "id" in message:
+            self.send({"id": message["id"], "error": {"code": -32601, "message": f"Unknown method {method!r}"}})
+
+    def respond(self, message: Dict[str, Any], result: Any) -> None:
+        if "id" in message:
+            self.send({"id": message["id"], "result": result})
+
+    def publish(self, uri: str, version: Optional[int], diagnostics: List[Dict[str, Any]]) -> None:
+        params: Dict[str, Any] = {"uri": uri, "diagnostics": diagnostics}
+        if version is not None:
+            params["version"] = version
+        self.send({"method": "textDocument/publishDiagnostics", "params": params})
+
+    def check_due(self) -> None:
+        now = time.monotonic()
+        for uri, deadline in list(self.deadlines.items()):
+            if deadline <= now and self.messages.empty():
+                del self.deadlines[uri]
+                self.check(self.documents[uri])
+
+    def check(self, document: Document) -> None:
+        """Publishes the errors of `document`, unless a newer version of it
+        arrived while checking it.
+        """
+        with self.lock:
+            self.checking = document.uri
+            self.cancelled.clear()
+        file = File(document.path, document.text)
+        file.errors = CancellableErrors(self.cancelled)
+        for error in document.errors:
+            file.errors.add(error)
+        tokens = [Token(it.type, it.pos, it.value, it.offset) for it in document.tokens]  # Rules can change them
+        try:
+            self.registry.run(Context(file, tokens))
+        except NorminetteError as e:
+            file.errors.add("PARSING_ERROR", str(e) or type(e).__name__)
+        finally:
+            with self.lock:
+                self.checking = None
+        if self.cancelled.is_set():
+            return
+        lines = document.text.split("\n")
+        self.publish(document.uri, document.version, [
+            diagnostic(error, lines, self.locale) for error in file.errors
+        ])
+
+
+def serve(registry: Registry, input: IO[bytes], output: IO[bytes]) -> int:
+    return Server(registry, input, output).serve()
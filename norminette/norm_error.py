@@ -1,4 +1,5 @@
-from norminette.i18n import _
+# Marks the messages for xgettext, they are translated when an error is formatted
+_ = lambda message: message  # noqa: E731
 
 errors = {
     "SPC_INSTEAD_TAB": _("Spaces at beginning of line"),
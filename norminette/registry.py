@@ -1,33 +1,114 @@
 import collections
-from operator import attrgetter
+import itertools
+from typing import Iterable, Optional
 
-from norminette.rules import Rules, Primary
+from norminette.rules import Rules, Primary, manifest
+from norminette.cache import UnitCache
+from norminette.errors import Errors
 from norminette.exceptions import CParsingError
+from norminette.norm_error import errors as errors_dict
 
 rules = Rules()
 
+# Checks that update the scope used by primaries, they always run when
+# a subset of the rules is selected or the statement is unchanged.
+parser_checks = (
+    "CheckBlockStart",
+    "CheckLineCount",  # Counts `scope.lines`, used by `IsBlockStart`
+)
+
+
+def emitted_errors(rule):
+    """Returns the error names that a `Check` can add, listed in the manifest.
+    """
+    return frozenset(manifest.checks[rule.__name__][1])
+
 
 class Registry:
-    def __init__(self):
+    def __init__(
+        self,
+        select: Optional[Iterable[str]] = None,
+        ignore: Optional[Iterable[str]] = None,
+        cache: bool = False,
+    ):
         self.dependencies = collections.defaultdict(list)
+        self.cache = UnitCache() if cache else None
+        self.muted = set()
+        self.allowed_errors = None
+        self.ignored_errors = frozenset()
+        checks = rules.checks
+        if select or ignore:
+            checks = self.select(set(select or ()), set(ignore or ()))
+        checks = {rule.__name__: rule for rule in checks}
+        for name, dependencies in manifest.dependencies.items():
+            self.dependencies[name] = [checks[it] for it in dependencies if it in checks]
+
+    def select(self, select, ignore):
+        """Returns the checks that must run to report only the rule names or
+        error names in `select` (all if empty) and none of those in `ignore`.
+
+        Checks pulled in only because a selected check `requires` them are
+        muted, so unselected checks neither run nor have errors to filter.
+        """
+        checks = {rule.__name__: rule for rule in rules.checks}
+        for name in select | ignore:
+            if name not in checks and name not in errors_dict:
+                raise ValueError(f"{name!r} is not a rule or an error name")
+
+        self.ignored_errors = frozenset(ignore & errors_dict.keys())
+        selected = []
         for rule in rules.checks:
-            rule.register(self)
-        for name, dependencies in self.dependencies.items():
-            self.dependencies[name] = sorted(dependencies, reverse=True, key=attrgetter("__name__"))
+            errors = emitted_errors(rule)
+            if rule.__name__ in ignore or (errors and errors <= self.ignored_errors):
+                continue
+            if not select or rule.__name__ in select or errors & select:
+                selected.append(rule)
+        if select:
+            self.allowed_errors = select & errors_dict.keys()
+            for rule in selected:
+                if rule.__name__ in select:
+                    self.allowed_errors |= emitted_errors(rule)
+
+        required = list(selected)
+        stack = list(parser_checks)
+        for rule in selected:
+            stack.extend(rule.requires)
+        while stack:
+            rule = checks[stack.pop()]
+            if rule not in required:
+                required.append(rule)
+                self.muted.add(rule)
+                stack.extend(rule.requires)
+        return required
+
+    def is_triggered(self, context, rule, unchanged=False):
+        """Returns if a check must run on the current statement, that is, it is
+        not retired, the statement has one of its `triggers` token types and,
+        if the statement is unchanged, the check updates the parser state.
+        """
+        if unchanged and rule.__name__ not in parser_checks:
+            return False
+        if rule in context.retired:
+            return False
+        return not rule.triggers or not context.token_types().isdisjoint(rule.triggers)
 
     def run_rules(self, context, rule):
+        errors = context.errors
+        if rule in self.muted:
+            context.errors = Errors()
         rule = rule(context)
         result = rule.run(context)
+        context.errors = errors
         ret, read = result if isinstance(rule, Primary) else (False, 0)
         if ret:
             context.scope.instructions += 1
             if isinstance(rule, Primary):
                 context.tkn_scope = read
                 context.history.append(rule)
-            for rule in self.dependencies[rule.name]:
-                self.run_rules(context, rule)
-            for rule in self.dependencies["_rule"]:
-                self.run_rules(context, rule)
+            unchanged = context.is_unchanged()
+            for rule in itertools.chain(self.dependencies[rule.name], self.dependencies["_rule"]):
+                if self.is_triggered(context, rule, unchanged):
+                    self.run_rules(context, rule)
             context.tkn_scope = 0
         return ret, read
 
@@ -39,13 +120,56 @@ class Registry:
         Each secondary rule is then run in arbitrary order based on their
         dependencies
         """
-        unrecognized_tkns = []
+        if context.errors.accept is None:
+            context.errors.accept = self.accepts(context.changed_lines)
+        self.run_start(context)
+        if self.run_statements(context):
+            self.run_end(context)
+        self.finish(context)
+
+    def finish(self, context):
+        self.filter_errors(context)
+        if context.unrecognized_tokens != []:
+            print(context.debug)
+            if context.debug > 0:
+                print("uncaught ->", context.unrecognized_tokens)
+
+    def run_start(self, context):
         context.state = "starting"
         for rule in self.dependencies["_start"]:
             self.run_rules(context, rule)
         context.state = "running"
-        while context.tokens != []:
-            context.tkn_scope = len(context.tokens)
+
+    def run_statements(self, context, stop=0):
+        """Runs the rules on each statement until only `stop` tokens are left,
+        returns `False` if it stopped because the errors are full.
+
+        With a `cache`, top-level units already checked with the same state
+        are not checked again.
+        """
+        units = {}
+        if (
+            self.cache is not None
+            and not context.debug
+            and context.errors.limit is None
+            and context.changed_lines is None
+            and stop == 0
+        ):
+            units = self.cache.units(context)
+        unit = None
+        unrecognized_tkns = context.unrecognized_tokens
+        while context.tokens.has(stop + 1):
+            if units:
+                if unit is not None and len(context.tokens) <= unit.end:
+                    self.cache.finish(context, unit)
+                    unit = None
+                if unit is None and len(context.tokens) in units:
+                    left = len(context.tokens)
+                    unit = self.cache.start(context, units[left])
+                    if len(context.tokens) != left:
+                        continue  # Replayed from the cache
+            if context.errors.is_full:
+                return False
             for rule in rules.primaries:
                 if rule.scope and context.scope not in rule.scope:
                     continue
@@ -58,7 +182,7 @@ class Registry:
                             )
                         print("uncaught -> ", context.file.name)
                         print("uncaught -> ", unrecognized_tkns)
-                        unrecognized_tkns = []
+                        unrecognized_tkns.clear()
                     context.dprint(rule.name, jump)
                     context.update()
                     context.pop_tokens(jump)
@@ -69,10 +193,40 @@ class Registry:
                 unrecognized_tkns.append(context.tokens[0])
                 context.pop_tokens(1)  # ##################################
             # #############################################################
+        if unit is not None:
+            self.cache.finish(context, unit)
+        return True
+
+    def run_end(self, context):
         context.state = "ending"
         for rule in self.dependencies["_end"]:
             self.run_rules(context, rule)
-        if unrecognized_tkns != []:
-            print(context.debug)
-            if context.debug > 0:
-                print("uncaught ->", unrecognized_tkns)
+
+    def accepts(self, changed_lines=None):
+        """Returns a predicate telling if an error is reported, that is, it is
+        selected and, with `--diff`, in the `changed_lines`, or `None` if all
+        errors are.
+
+        It is set as `Errors.accept` of the files, so the errors that are not
+        reported don't count for `Errors.limit`. It must be set before the
+        file is lexed, since the lexer adds errors too.
+        """
+        allowed, ignored = self.allowed_errors, self.ignored_errors
+        if allowed is None and not ignored and changed_lines is None:
+            return None
+
+        def accept(error):
+            if allowed is not None and error.name not in allowed or error.name in ignored:
+                return False
+            return changed_lines is None or not error.highlights or any(
+                highlight.lineno in changed_lines for highlight in error.highlights
+            )
+        return accept
+
+    def filter_errors(self, context):
+        """Removes the errors not selected and, with `--diff`, the errors out of
+        the changed lines, added before `Errors.accept` was set.
+        """
+        accept = self.accepts(context.changed_lines)
+        if accept is not None:
+            context.errors.retain(accept)
@@ -1,11 +1,18 @@
 import importlib
-import os
-from operator import attrgetter
 
+from norminette.rules import manifest
 from norminette.rules.rule import Rule, Primary, Check
 
+__all__ = ["Rule", "Primary", "Check", "Rules"]
+
+
+def load(name, module):
+    return getattr(importlib.import_module("norminette.rules." + module), name)
+
 
 class Rules:
+    """The rule classes listed in `manifest`, primaries by decreasing priority.
+    """
     __slots__ = (
         "all",
         "primaries",
@@ -20,11 +27,6 @@ class Rules:
         return cls.__instance
 
     def __init__(self) -> None:
-        path = os.path.dirname(os.path.realpath(__file__))
-        for f in os.listdir(path):
-            name, _ = os.path.splitext(f)
-            importlib.import_module("norminette.rules." + name)
-
-        self.all = Rule.__subclasses__()
-        self.checks = Check.__subclasses__()
-        self.primaries = sorted(Primary.__subclasses__(), reverse=True, key=attrgetter("priority"))
+        self.primaries = [load(name, module) for name, module in manifest.primaries]
+        self.checks = [load(name, module) for name, (module, _) in manifest.checks.items()]
+        self.all = self.primaries + self.checks
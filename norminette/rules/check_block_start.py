@@ -15,21 +15,14 @@ class CheckBlockStart(Rule, Check):
         contain multiple control structures
         """
         outer = context.scope.get_outer()
-        if len(context.history) > 2:
-            i = 0
-            for item in context.history[::]:
-                if item != "IsEmptyLine":
-                    if i == 2:
-                        hist_1 = item
-                    elif i == 3:
-                        hist_2 = item
-                    i += 1
-            if (
-                type(context.scope) is GlobalScope
-                and context.scope.tmp_scope is not None
-                and hist_1 == "IsFuncDeclaration"
-                and hist_2 == "IsPreprocessorStatement"
-            ):
+        if (
+            len(context.history) > 2
+            and type(context.scope) is GlobalScope
+            and context.scope.tmp_scope is not None
+        ):
+            records = [item for item in context.history if item != "IsEmptyLine"]
+            hist_1, hist_2 = (records[2:4] + [None, None])[:2]
+            if hist_1 == "IsFuncDeclaration" and hist_2 == "IsPreprocessorStatement":
                 context.scope.functions -= 1
                 context.scope = context.tmp_scope
                 context.scope.multiline = True
@@ -2,6 +2,8 @@ from norminette.rules import Rule, Check
 
 
 class CheckComment(Rule, Check):
+    triggers = ("COMMENT", "MULT_COMMENT")
+
     def run(self, context):
         """
         Comments are forbidden inside functions and in the middle of instructions.
@@ -23,31 +25,12 @@ class CheckComment(Rule, Check):
                 context.new_error("COMMENT_ON_INSTR", token)
 
     def is_inside_a_function(self, context):
-        if context.history[-2:] == ["IsFuncDeclaration", "IsBlockStart"]:
-            return True
         if context.scope.__class__.__name__.lower() == "function":
             return True
         # Sometimes the context scope is a `ControlStructure` scope instead of
-        # `Function` scope, so, to outsmart this bug, we need check manually
-        # the `context.history`.
-        last = None
-        for index, record in enumerate(reversed(context.history)):
-            if record == "IsFuncDeclaration" and last == "IsBlockStart":
-                # Since the limited history API, we can't say if we're in a
-                # nested function to reach the first enclosing function, so,
-                # we'll consider that the user just declared a normal function
-                # in global scope.
-                stack = 1
-                index -= 1  # Jumps to next record after `IsBlockStart`
-                while index > 0 and stack > 0:
-                    record = context.history[-index]
-                    index -= 1
-                    if record not in ("IsBlockStart", "IsBlockEnd"):
-                        continue
-                    stack = stack + (1, -1)[record == "IsBlockEnd"]
-                return bool(stack)
-            last = record
-        return False
+        # `Function` scope, so, to outsmart this bug, we need to check if the
+        # braces opened after the last function declaration are closed.
+        return context.history.is_inside_a_function()
 
     def is_last_token(self, token, foward):
         expected = ("SPACE", "TAB")
@@ -14,6 +14,12 @@ class CheckCommentLineLen(Rule, Check):
         token = context.peek_token(i)
         if not token:
             return
+        # Escaped newlines are not kept in the value, so the lines of the value
+        # are only the lines of the source if the comment has none of them.
+        end = context.peek_token(i + 1)
+        first, last = token.pos[0], end.pos[0] if end else len(context.file.lines)
+        if last - first == token.value.count("\n") and context.file.lines.width(first, last) <= 80:
+            return
         index = token.pos[1]
         if token.type == "MULT_COMMENT":
             lines = token.value.split("\n")
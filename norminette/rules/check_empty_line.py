@@ -2,6 +2,10 @@ from norminette.rules import Rule, Check
 
 
 class CheckEmptyLine(Rule, Check):
+    requires = (
+        "CheckVariableDeclaration",  # Sets `scope.vdeclarations_allowed`
+    )
+
     def run(self, context):
         """
         Empty line must not contains tabs or spaces
@@ -7,6 +7,7 @@ class CheckHeader(Rule, Check):
         if context.check_token(0, "MULT_COMMENT") is False:
             context.new_error("INVALID_HEADER", context.peek_token(0))
             context.header_parsed = True
+            self.retire()
             return
         context.header += context.peek_token(0).value + "\n"
 
@@ -35,6 +36,7 @@ class CheckHeader(Rule, Check):
         elif context.history[-1] != "IsComment" and context.header_started is True:
             self.check_header(context)
             context.header_parsed = True
+            self.retire()
         elif (
             context.header_started is False
             and context.header_parsed is False
@@ -42,3 +44,4 @@ class CheckHeader(Rule, Check):
         ):
             context.new_error("INVALID_HEADER", context.peek_token(0))
             context.header_parsed = True
+            self.retire()
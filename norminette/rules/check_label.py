@@ -2,6 +2,8 @@ from norminette.rules import Rule, Check
 
 
 class CheckLabel(Rule, Check):
+    triggers = ("GOTO", "COLON")
+
     def run(self, context):
         """
         Goto and labels are forbidden
@@ -3,6 +3,8 @@ from norminette.rules import Rule, Check
 
 
 class CheckLineCount(Rule, Check):
+    triggers = ("NEWLINE", "ESCAPED_NEWLINE")
+
     def run(self, context):
         """
         Each function can only have 25 lines between its opening and closing brackets
@@ -6,6 +6,8 @@ class CheckLineLen(Rule, Check):
         """
         Lines must not be over 80 characters long
         """
+        if context.file.lines.width(*context.statement_lines()) <= 80:
+            return False, 0
         i = 0
         line_too_long = {}
         for tkn in context.tokens[: context.tkn_scope]:
@@ -138,6 +138,44 @@ right_auth = []
 whitespaces = ["NEWLINE", "SPACE", "TAB"]
 
 
+# Kinds of the tokens around an operator, by what its checks accept there
+blanks = frozenset(("SPACE", "TAB"))
+nests = frozenset(lnests + rnests)
+lnest_after = nests | {"SEMI_COLON", "PTR", "DOT"}
+lnest_before = nests | {
+    "SEMI_COLON", "PTR", "DOT", "INC", "DEC", "MULT", "BWISE_AND", "BWISE_OR", "BWISE_XOR", "BWISE_NOT",
+    "IDENTIFIER", "SIZEOF", "NOT", "MINUS", "PLUS", "CONSTANT", "CHAR_CONSTANT", "STRING",
+}
+rnest_after_glued = nests | {"SEMI_COLON", "PTR", "DOT", "INC", "DEC"}
+rnest_after = rnest_after_glued | {"MINUS", "MULT", "BWISE_AND", "IDENTIFIER", "COMMA", "STRING", "CONSTANT", "PLUS"}
+rnest_before_glued = nests | {"SEMI_COLON", "PTR", "DOT", "INC", "DEC", "MULT", "BWISE_AND", "IDENTIFIER", "CONSTANT"}
+suffix_after = frozenset(["SPACE", "NEWLINE", "TAB"] + glued_operators + rnests)
+glued_before = frozenset(["SPACE", "LPARENTHESIS", "LBRACKET", "LBRACE", "NEWLINE"] + glued_operators)
+spaced_before = frozenset(["SPACE", "LPARENTHESIS", "LBRACKET"] + glued_operators)
+spaced_after = frozenset(
+    ["SPACE", "LPARENTHESIS", "RPARENTHESIS", "LBRACKET", "RBRACKET", "NEWLINE", "COMMA"] + spec_operators
+)
+line_starts = frozenset(("NEWLINE", "ESCAPED_NEWLINE"))
+glued = frozenset(lnests)
+glued_after = glued | blanks | frozenset(glued_operators)
+pointer_before = frozenset((
+    "SPACE", "TAB", "LPARENTHESIS", "LBRACKET", "MULT", "NOT", "RPARENTHESIS", "RBRACKET", "RBRACE",
+    "MINUS", "PLUS", "BWISE_NOT", "BWISE_OR", "BWISE_AND", "BWISE_XOR",
+))
+glued_operator_kinds = frozenset(glued_operators)
+pointers = frozenset(("MULT", "BWISE_AND"))
+signs = frozenset(("PLUS", "MINUS"))
+function_headers = ("IsFuncDeclaration", "IsFuncPrototype")
+
+
+def kind(tokens, pos):
+    """Returns the type of the token at `pos`, like `Context.peek_token`
+    (negative positions count from the end of the file).
+    """
+    token = tokens.get(pos)
+    return token.type if token is not None else None
+
+
 class CheckOperatorsSpacing(Rule, Check):
     depends_on = (
         "IsFuncDeclaration",
@@ -150,355 +188,173 @@ class CheckOperatorsSpacing(Rule, Check):
         "IsDeclaration",
     )
 
-    def check_prefix(self, context, pos):
-        if pos > 0 and context.check_token(pos, ["TAB", "SPACE"]):
-            context.new_error("", context.peek_token(pos))
-        if (
-            pos + 1 < len(context.tokens[: context.tkn_scope])
-            and context.peek_token(pos + 1).type == "SPACE"
-        ):
-            context.new_error("NO_SPC_AFR_OPR", context.peek_token(pos))
-
-    def check_lnest(self, context, pos):
-        if (
-            context.history[-1] == "IsFuncDeclaration"
-            or context.history[-1] == "IsFuncPrototype"
-        ):
-            return False
+    def check_prefix(self, context, pos, end):
+        if pos + 1 < end and context.tokens[pos + 1].type == "SPACE":
+            context.new_error("NO_SPC_AFR_OPR", context.tokens[pos])
+
+    def check_lnest(self, context, pos, end):
+        if context.history[-1] in function_headers:
+            return
+        tokens = context.tokens
         tmp = pos + 1
         # Here is `(_`
-        while (
-            context.peek_token(tmp)
-            and context.check_token(tmp, ["SPACE", "TAB"]) is True
-        ):
+        while kind(tokens, tmp) in blanks:
             tmp += 1
-        if context.check_token(tmp, "NEWLINE") is False:
-            if (
-                context.check_token(tmp, lnests + rnests + ["SEMI_COLON", "PTR", "DOT"])
-                is True
-                and tmp != pos + 1
-            ):
-                context.new_error("SPC_AFTER_PAR", context.peek_token(pos))
-            elif (
-                context.check_token(tmp, lnests + rnests + ["SEMI_COLON", "PTR", "DOT"])
-                is False
-                and tmp != pos + 1
-            ):
-                context.new_error("NO_SPC_AFR_PAR", context.peek_token(pos))
+        after = kind(tokens, tmp)
+        if after is not None and after != "NEWLINE" and tmp != pos + 1:
+            context.new_error("SPC_AFTER_PAR" if after in lnest_after else "NO_SPC_AFR_PAR", tokens[pos])
         tmp = pos - 1
         # Here is `_(`
-        while tmp >= 0 and context.check_token(tmp, ["SPACE", "TAB"]) is True:
+        while tmp >= 0 and tokens[tmp].type in blanks:
             tmp -= 1
-        if context.check_token(tmp, "NEWLINE") is False:
-            if (
-                context.check_token(
-                    tmp,
-                    lnests
-                    + rnests
-                    + [
-                        "SEMI_COLON",
-                        "PTR",
-                        "DOT",
-                        "INC",
-                        "DEC",
-                        "MULT",
-                        "BWISE_AND",
-                        "IDENTIFIER",
-                        "SIZEOF",
-                    ],
-                )
-                is True
-                and tmp != pos - 1
-            ):
-                if (
-                    context.check_token(tmp, ["MULT", "BWISE_AND"]) is True
-                    and context.is_operator is False
-                ):
-                    context.new_error("NO_SPC_BFR_PAR", context.peek_token(pos))
-            elif (
-                context.check_token(
-                    tmp,
-                    lnests
-                    + rnests
-                    + [
-                        "SEMI_COLON",
-                        "PTR",
-                        "DOT",
-                        "INC",
-                        "DEC",
-                        "MULT",
-                        "BWISE_AND",
-                        "BWISE_OR",
-                        "BWISE_XOR",
-                        "BWISE_NOT",
-                        "IDENTIFIER",
-                        "SIZEOF",
-                        "NOT",
-                        "MINUS",
-                        "PLUS",
-                        "CONSTANT",
-                        "CHAR_CONSTANT",
-                        "STRING",
-                    ],
-                )
-                is False
-                and tmp == pos - 1
-            ):
-                context.new_error("SPC_BFR_PAR", context.peek_token(pos))
-        return False
-
-    def check_rnest(self, context, pos):
-        if (
-            context.history[-1] == "IsFuncDeclaration"
-            or context.history[-1] == "IsFuncPrototype"
-        ):
-            return False
+        before = kind(tokens, tmp)
+        if before is not None and before != "NEWLINE" and tmp == pos - 1 and before not in lnest_before:
+            context.new_error("SPC_BFR_PAR", tokens[pos])
+
+    def check_rnest(self, context, pos, end):
+        if context.history[-1] in function_headers:
+            return
+        tokens = context.tokens
         tmp = pos + 1
         # Here is `)_`
-        while (
-            context.peek_token(tmp)
-            and context.check_token(tmp, ["SPACE", "TAB"]) is True
-        ):
+        while kind(tokens, tmp) in blanks:
             tmp += 1
-        if context.check_token(tmp, "NEWLINE") is False:
-            if (
-                context.check_token(
-                    tmp, lnests + rnests + ["SEMI_COLON", "PTR", "DOT", "INC", "DEC"]
-                )
-                is True
-                and tmp != pos + 1
-            ):
-                context.new_error("NO_SPC_AFR_PAR", context.peek_token(pos))
-            elif (
-                context.check_token(
-                    tmp,
-                    lnests
-                    + rnests
-                    + [
-                        "SEMI_COLON",
-                        "PTR",
-                        "DOT",
-                        "INC",
-                        "DEC",
-                        "MINUS",
-                        "MULT",
-                        "BWISE_AND",
-                        "IDENTIFIER",
-                        "COMMA",
-                        "STRING",
-                        "CONSTANT",
-                        "PLUS",
-                    ],
-                )
-                is False
-                and tmp == pos + 1
-            ):
-                context.new_error("SPC_AFTER_PAR", context.peek_token(pos))
+        after = kind(tokens, tmp)
+        if after is not None and after != "NEWLINE":
+            if after in rnest_after_glued and tmp != pos + 1:
+                context.new_error("NO_SPC_AFR_PAR", tokens[pos])
+            elif after not in rnest_after and tmp == pos + 1:
+                context.new_error("SPC_AFTER_PAR", tokens[pos])
         tmp = pos - 1
         # Here is `_)`
-        while tmp > 0 and context.check_token(tmp, ["SPACE", "TAB"]) is True:
+        while tmp > 0 and tokens[tmp].type in blanks:
             tmp -= 1
-        if context.check_token(tmp, "NEWLINE") is False:
-            if (
-                context.check_token(
-                    tmp,
-                    lnests
-                    + rnests
-                    + [
-                        "SEMI_COLON",
-                        "PTR",
-                        "DOT",
-                        "INC",
-                        "DEC",
-                        "MULT",
-                        "BWISE_AND",
-                        "IDENTIFIER",
-                        "CONSTANT",
-                    ],
-                )
-                is True
-                and tmp != pos - 1
-            ):
-                context.new_error("NO_SPC_BFR_PAR", context.peek_token(pos))
-        return False
-
-    def check_suffix(self, context, pos):
-        if pos + 1 < len(
-            context.tokens[: context.tkn_scope]
-        ) and not context.check_token(
-            pos + 1, ["SPACE", "NEWLINE", "TAB"] + glued_operators + rnests
-        ):
-            context.new_error("SPC_AFTER_OPERATOR", context.peek_token(pos))
-        if pos > 0 and context.peek_token(pos - 1).type == "SPACE":
-            context.new_error("NO_SPC_BFR_OPR", context.peek_token(pos))
-
-    def check_glued_prefix_and_suffix(self, context, pos):
-        if pos > 0 and context.peek_token(pos - 1).type != "SPACE":
-            if context.check_token(pos - 1, "TAB") is True:
-                tmp = -1
-                while context.check_token(pos + tmp, "TAB") is True:
-                    tmp -= 1
-                if (
-                    context.check_token(
-                        pos + tmp, ["NEWLINE", "ESCAPED_NEWLINE"] + glued_operators
-                    )
-                    is True
-                ):
-                    return False, 0
-            context.new_error("SPC_BFR_OPERATOR", context.peek_token(pos))
-        if (
-            pos + 1 < len(context.tokens[: context.tkn_scope])
-            and context.check_token(
-                pos + 1,
-                ["SPACE", "LPARENTHESIS", "LBRACKET", "LBRACE", "NEWLINE"]
-                + glued_operators,
-            )
-            is False
-        ):
-            context.new_error("SPC_AFTER_OPERATOR", context.peek_token(pos))
-
-    def check_prefix_and_suffix(self, context, pos):
-        if (
-            pos > 0
-            and context.check_token(
-                pos - 1, ["SPACE", "LPARENTHESIS", "LBRACKET"] + glued_operators
-            )
-            is False
-        ):
-            if context.check_token(pos - 1, "TAB") is True:
-                tmp = -1
-                while context.check_token(pos + tmp, "TAB") is True:
+        before = kind(tokens, tmp)
+        if before is not None and before != "NEWLINE" and before in rnest_before_glued and tmp != pos - 1:
+            context.new_error("NO_SPC_BFR_PAR", tokens[pos])
+
+    def check_suffix(self, context, pos, end):
+        tokens = context.tokens
+        if pos + 1 < end and tokens[pos + 1].type not in suffix_after:
+            context.new_error("SPC_AFTER_OPERATOR", tokens[pos])
+        if pos > 0 and tokens[pos - 1].type == "SPACE":
+            context.new_error("NO_SPC_BFR_OPR", tokens[pos])
+
+    def check_semi_colon(self, context, pos, end):
+        if kind(context.tokens, pos + 1) not in (None, "NEWLINE"):
+            self.check_suffix(context, pos, end)
+
+    def is_line_start(self, tokens, pos):
+        """Returns if only tabs are between the token at `pos` and the start
+        of its line.
+        """
+        pos -= 1
+        while kind(tokens, pos) == "TAB":
+            pos -= 1
+        return kind(tokens, pos) in line_starts
+
+    def is_cast(self, context, pos):
+        return context.parenthesis_contain(context.skip_nest_reverse(pos))[0] == "cast"
+
+    def check_glued_prefix_and_suffix(self, context, pos, end):
+        tokens = context.tokens
+        if pos > 0 and tokens[pos - 1].type != "SPACE":
+            if tokens[pos - 1].type == "TAB":
+                tmp = pos - 1
+                while kind(tokens, tmp) == "TAB":
                     tmp -= 1
-                if (
-                    context.check_token(pos + tmp, ["NEWLINE", "ESCAPED_NEWLINE"])
-                    is True
-                ):
-                    return False, 0
-            if (
-                context.check_token(pos - 1, "RPARENTHESIS")
-                and context.parenthesis_contain(context.skip_nest_reverse(pos - 1))[0]
-                == "cast"
-            ):
-                return False, 0
-            context.new_error("SPC_BFR_OPERATOR", context.peek_token(pos))
-        if (
-            pos + 1 < len(context.tokens[: context.tkn_scope])
-            and context.check_token(
-                pos + 1,
-                [
-                    "SPACE",
-                    "LPARENTHESIS",
-                    "RPARENTHESIS",
-                    "LBRACKET",
-                    "RBRACKET",
-                    "NEWLINE",
-                    "COMMA",
-                ]
-                + spec_operators,
-            )
-            is False
-        ):
+                if kind(tokens, tmp) in line_starts or kind(tokens, tmp) in glued_operator_kinds:
+                    return
+            context.new_error("SPC_BFR_OPERATOR", tokens[pos])
+        if pos + 1 < end and tokens[pos + 1].type not in glued_before:
+            context.new_error("SPC_AFTER_OPERATOR", tokens[pos])
+
+    def check_prefix_and_suffix(self, context, pos, end):
+        tokens = context.tokens
+        if pos > 0 and tokens[pos - 1].type not in spaced_before:
+            if tokens[pos - 1].type == "TAB" and self.is_line_start(tokens, pos):
+                return
+            if tokens[pos - 1].type == "RPARENTHESIS" and self.is_cast(context, pos - 1):
+                return
+            context.new_error("SPC_BFR_OPERATOR", tokens[pos])
+        if pos + 1 < end and tokens[pos + 1].type not in spaced_after:
             tmp = pos - 1
-            while context.check_token(tmp, ["SPACE", "TAB"]):
+            while kind(tokens, tmp) in blanks:
                 tmp -= 1
-            if context.check_token(tmp, "RPARENTHESIS"):
-                tmp = context.skip_nest_reverse(tmp)
-                if context.parenthesis_contain(tmp)[0] != "cast":
-                    context.new_error("SPC_AFTER_OPERATOR", context.peek_token(pos))
-            elif context.check_token(tmp, glued_operators) is False and not (
-                context.check_token(pos, ["PLUS", "MINUS"])
-                and context.check_token(pos + 1, "CONSTANT")
+            before = kind(tokens, tmp)
+            if before == "RPARENTHESIS":
+                if not self.is_cast(context, tmp):
+                    context.new_error("SPC_AFTER_OPERATOR", tokens[pos])
+            elif (
+                before is not None
+                and before not in glued_operator_kinds
+                and not (tokens[pos].type in signs and tokens[pos + 1].type == "CONSTANT")
             ):
-                context.new_error("SPC_AFTER_OPERATOR", context.peek_token(pos))
-
-    def check_glued_operator(self, context, pos):
-        glued = [
-            "LPARENTHESIS",
-            "LBRACKET",
-            "LBRACE",
-        ]
-        if context.check_token(pos + 1, ["SPACE", "TAB"]) is True:
-            context.new_error("SPC_AFTER_OPERATOR", context.peek_token(pos))
+                context.new_error("SPC_AFTER_OPERATOR", tokens[pos])
+
+    def check_glued_operator(self, context, pos, end):
+        tokens = context.tokens
+        if kind(tokens, pos + 1) in blanks:
+            context.new_error("SPC_AFTER_OPERATOR", tokens[pos])
         pos -= 1
-        if (
-            context.check_token(pos, glued + ["SPACE", "TAB"] + glued_operators)
-            is False
-        ):
-            context.new_error("SPC_BFR_OPERATOR", context.peek_token(pos))
-        while pos >= 0 and context.check_token(pos, ["SPACE", "TAB"]) is True:
+        before = kind(tokens, pos)
+        if before is not None and before not in glued_after:
+            context.new_error("SPC_BFR_OPERATOR", tokens[pos])
+        while pos >= 0 and tokens[pos].type in blanks:
             pos -= 1
-            if pos >= 0 and context.check_token(pos, glued) is True:
-                context.new_error("NO_SPC_BFR_OPR", context.peek_token(pos))
+            if pos >= 0 and tokens[pos].type in glued:
+                context.new_error("NO_SPC_BFR_OPR", tokens[pos])
+
+    def check_c_operator(self, context, pos, end):
+        if context.is_glued_operator(pos) is True:
+            self.check_glued_operator(context, pos, end)
+        else:
+            self.check_prefix_and_suffix(context, pos, end)
 
     def check_combined_op(self, context, pos):
-        lpointer = [
-            "SPACE",
-            "TAB",
-            "LPARENTHESIS",
-            "LBRACKET",
-            "MULT",
-            "NOT",
-            "RPARENTHESIS",
-            "RBRACKET",
-            "RBRACE",
-            "MINUS",
-            "PLUS",
-            "BWISE_NOT",
-            "BWISE_OR",
-            "BWISE_AND",
-            "BWISE_XOR",
-        ]
-        i = 0
-        if context.peek_token(pos).type == "MULT":
-            if context.check_token(pos - 1, lpointer) is False and (
-                context.is_glued_operator(pos - 1) is True
-            ):  # or context.check_token(pos - 1, c_operators) is False):
-                context.new_error("SPC_BFR_POINTER", context.peek_token(pos))
-            if context.check_token(pos + 1, ["SPACE", "TAB"]):
-                context.new_error("SPC_AFTER_POINTER", context.peek_token(pos))
-            i = 1
-            while context.peek_token(pos + i).type in ["MULT", "LPARENTHESIS"]:
-                i += 1
-                if context.peek_token(pos + i).type == "SPACE":
-                    context.new_error("SPC_AFTER_POINTER", context.peek_token(pos + i))
-                return i
+        tokens = context.tokens
+        if tokens[pos].type != "MULT":
+            return
+        before = kind(tokens, pos - 1)
+        if before is not None and before not in pointer_before and context.is_glued_operator(pos - 1) is True:
+            context.new_error("SPC_BFR_POINTER", tokens[pos])
+        if kind(tokens, pos + 1) in blanks:
+            context.new_error("SPC_AFTER_POINTER", tokens[pos])
+        if kind(tokens, pos + 1) in ("MULT", "LPARENTHESIS") and kind(tokens, pos + 2) == "SPACE":
+            context.new_error("SPC_AFTER_POINTER", tokens[pos + 2])
 
     def run(self, context):
         """
         Some operators must be followed by a space,
         some must be only followed by a space,
         and the rest must be preceded and followed by a space.
+
+        Each token is checked by the handler of its type in `handlers`, from
+        the kinds of the tokens around it.
         """
-        i = 0
-        while i < len(context.tokens[: context.tkn_scope]):
-            if context.check_token(i, ["MULT", "BWISE_AND"]) is True:
-                if context.is_operator(i) is False:
-                    self.check_combined_op(context, i)
-                    i += 1
-                    continue
-            if context.check_token(i, c_operators) is True:
-                if context.is_glued_operator(i) is True:
-                    self.check_glued_operator(context, i)
-                else:
-                    self.check_prefix_and_suffix(context, i)
-                i += 1
+        tokens = context.tokens
+        end = context.tkn_scope if tokens.has(context.tkn_scope) else len(tokens)
+        for i in range(end):
+            type = tokens[i].type
+            if type in pointers and context.is_operator(i) is False:
+                self.check_combined_op(context, i)
                 continue
-            elif context.check_token(i, lnests) is True:
-                self.check_lnest(context, i)
-            elif context.check_token(i, rnests) is True:
-                self.check_rnest(context, i)
-            elif context.check_token(i, ps_operators) is True:
-                self.check_prefix_and_suffix(context, i)
-            elif context.check_token(i, gps_operators) is True:
-                self.check_glued_prefix_and_suffix(context, i)
-            elif context.check_token(i, s_operators) is True:
-                self.check_suffix(context, i)
-            elif (
-                context.check_token(i, son_operators) is True
-                and context.check_token(i + 1, "NEWLINE") is False
-            ):
-                self.check_suffix(context, i)
-            elif context.check_token(i, p_operators) is True:
-                self.check_prefix(context, i)
-            i += 1
+            handler = handlers.get(type)
+            if handler is not None:
+                handler(self, context, i, end)
         return False, 0
+
+
+# Handler of each token type, in the order of precedence of the operator kinds
+handlers = {}
+for types, handler in reversed((
+    (c_operators, CheckOperatorsSpacing.check_c_operator),
+    (lnests, CheckOperatorsSpacing.check_lnest),
+    (rnests, CheckOperatorsSpacing.check_rnest),
+    (ps_operators, CheckOperatorsSpacing.check_prefix_and_suffix),
+    (gps_operators, CheckOperatorsSpacing.check_glued_prefix_and_suffix),
+    (s_operators, CheckOperatorsSpacing.check_suffix),
+    (son_operators, CheckOperatorsSpacing.check_semi_colon),
+    (p_operators, CheckOperatorsSpacing.check_prefix),
+)):
+    handlers.update(dict.fromkeys(types, handler))
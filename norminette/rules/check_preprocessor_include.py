@@ -1,5 +1,4 @@
 import os.path
-import itertools
 
 from norminette.rules import Rule, Check
 
@@ -8,6 +7,9 @@ class CheckPreprocessorInclude(Rule, Check):
     depends_on = (
         "IsPreprocessorStatement",
     )
+    requires = (
+        "CheckLineIndent",  # Resets `scope.include_allowed`
+    )
 
     def run(self, context):
         """
@@ -47,13 +49,7 @@ class CheckPreprocessorInclude(Rule, Check):
     def is_in_start_of_file(self, context):
         """Check if the include is at the start of the file
         """
-        headers = (
-            "IsComment",
-            "IsEmptyLine",
-            "IsPreprocessorStatement",
-        )
-        history = itertools.filterfalse(lambda item: item in headers, context.history)
         return (
             context.scope.include_allowed
-            and next(history, None) is None
+            and context.history.last_significant() is None
         )
@@ -1,5 +1,3 @@
-import itertools
-
 from norminette.rules import Rule, Check
 
 
@@ -55,13 +53,9 @@ class CheckPreprocessorProtection(Rule, Check):
             context.new_error("HEADER_PROT_MULT", hash)
             return False, 0
 
-        headers = (
-            "IsComment",
-            "IsEmptyLine",
-        )
-        history = context.history[:-1]  # Remove the current `IsPreprocessorStatement`
-        history = itertools.filterfalse(lambda item: item in headers, history)
-        if next(history, None):
+        history = context.history
+        headers = history.counts["IsComment"] + history.counts["IsEmptyLine"]
+        if history.total - headers > 1:  # Ignores the current `IsPreprocessorStatement`
             # We can't say what line contains the instruction outside
             # header protection due to limited history information.
             context.new_error("HEADER_PROT_ALL", hash)
@@ -2,6 +2,8 @@ from norminette.rules import Rule, Check
 
 
 class CheckSpacing(Rule, Check):
+    triggers = ("SPACE", "TAB")
+
     def run(self, context):
         """
         Indentation (except for preprocessors) must be done with tabs
@@ -10,6 +12,8 @@ class CheckSpacing(Rule, Check):
         i = 0
         if context.history[-1] in ("IsEmptyLine", "IsPreprocessorStatement"):
             return False, 0
+        if not context.file.lines.any_flags(*context.statement_lines()):
+            return False, 0
         space_tab_error = False
         space_error = False
         while i in range(len(context.tokens[: context.tkn_scope])):
@@ -2,6 +2,8 @@ from norminette.rules import Rule, Check
 
 
 class CheckTernary(Rule, Check):
+    triggers = ("TERN_CONDITION",)
+
     def run(self, context):
         """
         Ternaries are forbidden
@@ -26,6 +26,9 @@ class CheckUtypeDeclaration(Rule, Check):
     depends_on = (
         "IsUserDefinedType",
     )
+    requires = (
+        "CheckVariableIndent",  # Shares `scope.vars_alignment`
+    )
 
     def run(self, context):
         """
@@ -51,9 +54,7 @@ class CheckUtypeDeclaration(Rule, Check):
         utype = None
         contain_full_def = False
         ids = []
-        while context.check_token(i, ["SEMI_COLON"]) is False and i < len(
-            context.tokens
-        ):
+        while context.check_token(i, ["SEMI_COLON"]) is False:
             if context.check_token(i, ["SPACE", "TAB"]):
                 pass
             if context.check_token(i, ["LPARENTHESIS"]) is True:
@@ -19,6 +19,9 @@ class CheckVariableDeclaration(Rule, Check):
     depends_on = (
         "IsVarDeclaration",
     )
+    requires = (
+        "CheckEmptyLine",  # Resets `scope.vdeclarations_allowed`
+    )
 
     def run(self, context):
         """
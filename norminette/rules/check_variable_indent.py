@@ -62,6 +62,9 @@ class CheckVariableIndent(Rule, Check):
     depends_on = (
         "IsVarDeclaration",
     )
+    requires = (
+        "CheckUtypeDeclaration",  # Shares `scope.vars_alignment`
+    )
 
     def check_tabs(self, context):
         i = 0
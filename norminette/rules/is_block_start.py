@@ -23,11 +23,9 @@ class IsBlockStart(Rule, Primary, priority=55):
         if context.check_token(i, "LBRACE") is False:
             return False, 0
         i += 1
-        lines = context.scope.lines
-        for item in reversed(context.history):
-            if item == "IsEmptyLine" or item == "IsComment" or item == "IsPreprocessorStatement":
-                lines -= 1
-                continue
+        lines = context.scope.lines - context.history.skipped
+        item = context.history.last_significant()
+        if item is not None:
             if (
                 item
                 not in [
@@ -43,10 +41,8 @@ class IsBlockStart(Rule, Primary, priority=55):
                 }.get(item, ControlStructure)
                 context.sub = context.scope.inner(scope)
                 context.sub.multiline = True
-                break
             else:
                 context.scope.multiline = True
-            break
 
         tmp = i
         # while context.peek_token(tmp) and (context.check_token(tmp, ["NEWLINE"])) is False:
@@ -175,7 +175,7 @@ class IsPreprocessorStatement(Rule, Primary, priority=100):
         """Checks if the corresponding `#endif` is present.
         """
         depth = 0
-        while index < len(context.tokens):
+        while context.peek_token(index) is not None:
             if not context.check_token(index, "HASH"):
                 index += 1
                 continue
@@ -0,0 +1,278 @@
+"""Rules of norminette and how they are wired, generated from the rule
+classes by `python -m norminette.tools.manifest`. Do not edit.
+"""
+
+# Primary rules by decreasing priority: (name, module)
+primaries = (
+    ("IsPreprocessorStatement", "is_preprocessor_statement"),
+    ("IsComment", "is_comment"),
+    ("IsFuncPrototype", "is_func_prototype"),
+    ("IsFuncDeclaration", "is_func_declaration"),
+    ("IsFunctionCall", "is_function_call"),
+    ("IsVarDeclaration", "is_var_declaration"),
+    ("IsEmptyLine", "is_empty_line"),
+    ("IsControlStatement", "is_control_statement"),
+    ("IsBlockStart", "is_block_start"),
+    ("IsBlockEnd", "is_block_end"),
+    ("IsTernary", "is_ternary"),
+    ("IsUserDefinedType", "is_user_defined_type"),
+    ("IsEnumVarDecl", "is_enum_var_decl"),
+    ("IsExpressionStatement", "is_expression_statement"),
+    ("IsAssignation", "is_assignation"),
+    ("IsCast", "is_cast"),
+    ("IsLabel", "is_label"),
+    ("IsDeclaration", "is_declaration"),
+    ("IsAmbiguousDeclaration", "is_ambiguous_declaration"),
+)
+
+# Checks: name -> (module, errors it can add)
+checks = {
+    "CheckAssignation": ("check_assignation", ("MULT_ASSIGN_LINE", "TOO_MANY_INSTR")),
+    "CheckAssignationIndent": ("check_assignation_indent", (
+        "COMMA_START_LINE",
+        "EOL_OPERATOR",
+        "TOO_FEW_TAB",
+        "TOO_MANY_TAB",
+    )),
+    "CheckBlockStart": ("check_block_start", ("MULT_IN_SINGLE_INSTR",)),
+    "CheckBrace": ("check_brace", ("BRACE_SHOULD_EOL", "SPC_BEFORE_NL", "TOO_MANY_LINES")),
+    "CheckComment": ("check_comment", ("COMMENT_ON_INSTR", "WRONG_SCOPE_COMMENT")),
+    "CheckCommentLineLen": ("check_comment_line_len", ("LINE_TOO_LONG",)),
+    "CheckControlStatement": ("check_control_statement", (
+        "ASSIGN_IN_CONTROL",
+        "EXP_NEWLINE",
+        "FORBIDDEN_CS",
+        "TOO_FEW_TAB",
+        "TOO_MANY_TAB",
+        "WRONG_SCOPE",
+    )),
+    "CheckDeclaration": ("check_declaration", ("NEWLINE_IN_DECL",)),
+    "CheckEmptyLine": ("check_empty_line", (
+        "CONSECUTIVE_NEWLINES",
+        "EMPTY_LINE_EOF",
+        "EMPTY_LINE_FILE_START",
+        "EMPTY_LINE_FUNCTION",
+        "NL_AFTER_PREPROC",
+        "NL_AFTER_VAR_DECL",
+        "SPACE_EMPTY_LINE",
+    )),
+    "CheckEnumVarDecl": ("check_enum_var_decl", ("NEWLINE_IN_DECL",)),
+    "CheckExpressionStatement": ("check_expression_statement", ("RETURN_PARENTHESIS", "SPACE_AFTER_KW")),
+    "CheckFuncArgumentsName": ("check_func_arguments_name", (
+        "ARG_TYPE_UKN",
+        "MISSING_IDENTIFIER",
+        "NEWLINE_IN_DECL",
+        "NO_ARGS_VOID",
+        "TAB_INSTEAD_SPC",
+        "WRONG_SCOPE_COMMENT",
+    )),
+    "CheckFuncDeclaration": ("check_func_declaration", (
+        "BRACE_NEWLINE",
+        "EXP_PARENTHESIS",
+        "NEWLINE_IN_DECL",
+        "NEWLINE_PRECEDES_FUNC",
+        "NO_SPC_BFR_PAR",
+        "SPC_BEFORE_NL",
+        "TOO_MANY_ARGS",
+    )),
+    "CheckFuncSpacing": ("check_func_spacing", (
+        "ATTR_EOL",
+        "MISSING_TAB_FUNC",
+        "SPACE_BEFORE_FUNC",
+        "TOO_MANY_TABS_FUNC",
+    )),
+    "CheckFunctionsCount": ("check_functions_count", ("TOO_MANY_FUNCS",)),
+    "CheckGeneralSpacing": ("check_general_spacing", ("TAB_INSTEAD_SPC",)),
+    "CheckGlobalNaming": ("check_global_naming", ("GLOBAL_VAR_DETECTED", "GLOBAL_VAR_NAMING")),
+    "CheckHeader": ("check_header", ("INVALID_HEADER",)),
+    "CheckIdentifierName": ("check_identifier_name", ("FORBIDDEN_CHAR_NAME", "WRONG_SCOPE_FCT")),
+    "CheckInHeader": ("check_in_header", ()),
+    "CheckLabel": ("check_label", ("GOTO_FBIDDEN", "LABEL_FBIDDEN")),
+    "CheckLineCount": ("check_line_count", ("TOO_MANY_LINES",)),
+    "CheckLineIndent": ("check_line_indent", ("TOO_FEW_TAB", "TOO_MANY_TAB")),
+    "CheckLineLen": ("check_line_len", ("LINE_TOO_LONG",)),
+    "CheckManyInstructions": ("check_many_instructions", ("TOO_MANY_INSTR",)),
+    "CheckNestLineIndent": ("check_nest_line_indent", ("EOL_OPERATOR", "TOO_FEW_TAB", "TOO_MANY_TAB")),
+    "CheckNewlineIndent": ("check_newline_indent", ("TOO_FEW_TAB", "TOO_MANY_TAB")),
+    "CheckOperatorsSpacing": ("check_operators_spacing", (
+        "NO_SPC_AFR_OPR",
+        "NO_SPC_AFR_PAR",
+        "NO_SPC_BFR_OPR",
+        "NO_SPC_BFR_PAR",
+        "SPC_AFTER_OPERATOR",
+        "SPC_AFTER_PAR",
+        "SPC_AFTER_POINTER",
+        "SPC_BFR_OPERATOR",
+        "SPC_BFR_PAR",
+        "SPC_BFR_POINTER",
+    )),
+    "CheckPreprocessorDefine": ("check_preprocessor_define", (
+        "MACRO_FUNC_FORBIDDEN",
+        "MACRO_NAME_CAPITAL",
+        "PREPROC_CONSTANT",
+    )),
+    "CheckPreprocessorInclude": ("check_preprocessor_include", ("INCLUDE_HEADER_ONLY", "INCLUDE_START_FILE")),
+    "CheckPreprocessorIndent": ("check_preprocessor_indent", (
+        "CONSECUTIVE_WS",
+        "PREPOC_ONLY_GLOBAL",
+        "PREPROC_BAD_INDENT",
+        "PREPROC_NO_SPACE",
+        "PREPROC_START_LINE",
+        "TAB_REPLACE_SPACE",
+        "TOO_MANY_WS",
+    )),
+    "CheckPreprocessorProtection": ("check_preprocessor_protection", (
+        "HEADER_PROT_ALL",
+        "HEADER_PROT_ALL_AF",
+        "HEADER_PROT_MULT",
+        "HEADER_PROT_NAME",
+        "HEADER_PROT_NODEF",
+        "HEADER_PROT_UPPER",
+    )),
+    "CheckPrototypeIndent": ("check_prototype_indent", ("ATTR_EOL", "MISALIGNED_FUNC_DECL", "SPACE_REPLACE_TAB")),
+    "CheckSpacing": ("check_spacing", (
+        "CONSECUTIVE_SPC",
+        "MIXED_SPACE_TAB",
+        "SPACE_EMPTY_LINE",
+        "SPACE_REPLACE_TAB",
+        "SPC_BEFORE_NL",
+    )),
+    "CheckStructNaming": ("check_struct_naming", ("ENUM_TYPE_NAMING", "STRUCT_TYPE_NAMING", "UNION_TYPE_NAMING")),
+    "CheckTernary": ("check_ternary", ("TERNARY_FBIDDEN",)),
+    "CheckUtypeDeclaration": ("check_utype_declaration", (
+        "ENUM_TYPE_NAMING",
+        "FORBIDDEN_CHAR_NAME",
+        "FORBIDDEN_CS",
+        "FORBIDDEN_ENUM",
+        "FORBIDDEN_STRUCT",
+        "FORBIDDEN_TYPEDEF",
+        "FORBIDDEN_UNION",
+        "MISALIGNED_VAR_DECL",
+        "MISSING_TYPEDEF_ID",
+        "NEWLINE_IN_DECL",
+        "NO_TAB_BF_TYPEDEF",
+        "SPACE_REPLACE_TAB",
+        "STRUCT_TYPE_NAMING",
+        "TAB_REPLACE_SPACE",
+        "TOO_MANY_TABS_TD",
+        "TYPE_NOT_GLOBAL",
+        "UNION_TYPE_NAMING",
+        "USER_DEFINED_TYPEDEF",
+    )),
+    "CheckVariableDeclaration": ("check_variable_declaration", (
+        "DECL_ASSIGN_LINE",
+        "IMPLICIT_VAR_TYPE",
+        "MULT_DECL_LINE",
+        "TOO_MANY_VARS_FUNC",
+        "VAR_DECL_START_FUNC",
+        "WRONG_SCOPE_VAR",
+    )),
+    "CheckVariableIndent": ("check_variable_indent", (
+        "MISALIGNED_VAR_DECL",
+        "SPACE_REPLACE_TAB",
+        "TAB_REPLACE_SPACE",
+        "VLA_FORBIDDEN",
+    )),
+}
+
+# Checks run after a primary rule or at `_start`, `_rule` and `_end`
+dependencies = {
+    "IsAssignation": (
+        "CheckOperatorsSpacing",
+        "CheckNewlineIndent",
+        "CheckManyInstructions",
+        "CheckGeneralSpacing",
+        "CheckExpressionStatement",
+        "CheckAssignationIndent",
+        "CheckAssignation",
+    ),
+    "IsBlockEnd": ("CheckManyInstructions", "CheckInHeader", "CheckBrace"),
+    "IsBlockStart": ("CheckInHeader", "CheckBrace", "CheckBlockStart"),
+    "IsCast": ("CheckNewlineIndent", "CheckExpressionStatement"),
+    "IsComment": ("CheckInHeader", "CheckCommentLineLen"),
+    "IsControlStatement": (
+        "CheckOperatorsSpacing",
+        "CheckNestLineIndent",
+        "CheckManyInstructions",
+        "CheckGeneralSpacing",
+        "CheckExpressionStatement",
+        "CheckControlStatement",
+    ),
+    "IsDeclaration": (
+        "CheckOperatorsSpacing",
+        "CheckNewlineIndent",
+        "CheckNestLineIndent",
+        "CheckGeneralSpacing",
+        "CheckDeclaration",
+    ),
+    "IsEmptyLine": ("CheckInHeader",),
+    "IsEndOfLine": ("CheckInHeader",),
+    "IsEnumVarDecl": ("CheckEnumVarDecl",),
+    "IsExpressionStatement": (
+        "CheckOperatorsSpacing",
+        "CheckNewlineIndent",
+        "CheckNestLineIndent",
+        "CheckManyInstructions",
+        "CheckGeneralSpacing",
+        "CheckExpressionStatement",
+    ),
+    "IsFuncDeclaration": (
+        "CheckOperatorsSpacing",
+        "CheckManyInstructions",
+        "CheckFunctionsCount",
+        "CheckFuncSpacing",
+        "CheckFuncDeclaration",
+        "CheckFuncArgumentsName",
+    ),
+    "IsFuncPrototype": (
+        "CheckPrototypeIndent",
+        "CheckOperatorsSpacing",
+        "CheckManyInstructions",
+        "CheckInHeader",
+        "CheckFuncDeclaration",
+        "CheckFuncArgumentsName",
+        "CheckAssignationIndent",
+    ),
+    "IsFunctionCall": (
+        "CheckOperatorsSpacing",
+        "CheckManyInstructions",
+        "CheckGeneralSpacing",
+        "CheckExpressionStatement",
+        "CheckAssignationIndent",
+    ),
+    "IsPreprocessorStatement": (
+        "CheckPreprocessorProtection",
+        "CheckPreprocessorIndent",
+        "CheckPreprocessorInclude",
+        "CheckPreprocessorDefine",
+        "CheckInHeader",
+    ),
+    "IsUserDefinedType": (
+        "CheckUtypeDeclaration",
+        "CheckStructNaming",
+        "CheckManyInstructions",
+        "CheckInHeader",
+        "CheckFuncDeclaration",
+    ),
+    "IsVarDeclaration": (
+        "CheckVariableIndent",
+        "CheckVariableDeclaration",
+        "CheckOperatorsSpacing",
+        "CheckManyInstructions",
+        "CheckInHeader",
+        "CheckGlobalNaming",
+        "CheckAssignationIndent",
+    ),
+    "_rule": (
+        "CheckTernary",
+        "CheckSpacing",
+        "CheckLineLen",
+        "CheckLineIndent",
+        "CheckLineCount",
+        "CheckLabel",
+        "CheckIdentifierName",
+        "CheckHeader",
+        "CheckEmptyLine",
+        "CheckComment",
+    ),
+}
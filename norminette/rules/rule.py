@@ -33,6 +33,8 @@ class Check:
     __slots__ = ()
 
     depends_on: Tuple[str, ...]
+    requires: Tuple[str, ...]
+    triggers: Tuple[str, ...]
 
     runs_on_start: bool
     runs_on_rule: bool
@@ -41,6 +43,10 @@ class Check:
     def __init_subclass__(cls, **kwargs):
         if not hasattr(cls, "depends_on"):
             cls.depends_on = ()
+        if not hasattr(cls, "requires"):
+            cls.requires = ()
+        if not hasattr(cls, "triggers"):
+            cls.triggers = ()
         cls.runs_on_start = kwargs.pop("runs_on_start", getattr(cls, "runs_on_start", False))
         cls.runs_on_rule = kwargs.pop("runs_on_rule", getattr(cls, "runs_on_rule", not cls.depends_on))
         cls.runs_on_end = kwargs.pop("runs_on_end", getattr(cls, "runs_on_end", False))
@@ -70,6 +76,11 @@ class Check:
         """
         return self.context.state == "ending"  # type: ignore
 
+    def retire(self):
+        """Stops running this `Check` for the rest of the file.
+        """
+        self.context.retired.add(type(self))  # type: ignore
+
     def run(self, context: Context) -> None:
         return
 
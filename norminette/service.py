@@ -0,0 +1,448 @@
+import bisect
+import contextlib
+import gc
+import json
+import multiprocessing
+import os
+import queue
+import signal
+import socket
+import threading
+import time
+from concurrent.futures import Future, wait
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing.connection import Connection
+from multiprocessing.reduction import recv_handle, send_handle
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from norminette.context import Context
+from norminette.errors import Error, JSONErrorsFormatter
+from norminette.exceptions import NorminetteError
+from norminette.file import File
+from norminette.i18n import LOCALES, get_translation
+from norminette.jobs import warm_up
+from norminette.lexer import Lexer
+from norminette.registry import Registry
+
+# Requests bigger than this are rejected
+MAX_BODY_SIZE = 16 * 1024 * 1024
+
+# Upper bounds in seconds of the request latency histogram
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+class QueueFull(Exception):
+    pass
+
+
+class WorkerError(Exception):
+    pass
+
+
+def check(registry: Registry, filename: str, source: str) -> List[Error]:
+    """Returns the errors of `source`, like the command line does for a file
+    given with `--cfile` or `--hfile`.
+    """
+    file = File(filename, source)
+    try:
+        registry.run(Context(file, Lexer(file)))
+    except NorminetteError as e:
+        file.errors.add("PARSING_ERROR", str(e) or type(e).__name__)
+    return list(file.errors)
+
+
+def warm_registry(select: Sequence[str], ignore: Sequence[str]) -> Registry:
+    """Returns a `Registry` that already checked a file, with the locale
+    catalogs loaded.
+    """
+    registry = Registry(select=select, ignore=ignore)
+    warm_up(registry)
+    for locale in LOCALES:
+        get_translation(locale)
+    return registry
+
+
+def _work(connection, select, ignore, registry: Optional[Registry] = None) -> None:
+    if registry is None:
+        registry = warm_registry(select, ignore)
+    connection.send("ready")
+    while True:
+        try:
+            filename, source = connection.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        try:
+            connection.send((True, check(registry, filename, source)))
+        except Exception as e:
+            connection.send((False, f"{type(e).__name__}: {e}"))
+
+
+def _serve_forks(connection, server, select, ignore) -> None:
+    server.close()  # Inherited from the pool, which must be the only one to have it to stop us
+    registry = warm_registry(select, ignore)
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)  # Workers are reaped by the kernel
+    gc.freeze()  # Keeps the objects above out of collections, so their pages stay shared
+    connection.send("ready")
+    while True:
+        try:
+            connection.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        parent, child = socket.socketpair()
+        pid = os.fork()
+        if pid == 0:
+            status = 0
+            try:
+                connection.close()
+                parent.close()
+                signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                _work(Connection(child.detach()), select, ignore, registry)
+            except BaseException:
+                status = 1
+            finally:
+                os._exit(status)
+        child.close()
+        connection.send(pid)
+        send_handle(connection, parent.fileno(), pid)
+        parent.close()
+
+
+class ForkServer:
+    """A process that imports the rules, builds a warm `Registry` and loads
+    the locale catalogs once, then forks the workers.
+
+    Workers share its memory copy-on-write instead of each importing and
+    building everything again, and are forked from a process without threads.
+    """
+
+    def __init__(self, select: Sequence[str], ignore: Sequence[str]) -> None:
+        self.connection, child = multiprocessing.Pipe()
+        context = multiprocessing.get_context("fork")
+        self.process = context.Process(target=_serve_forks, args=(child, self.connection, select, ignore), daemon=True)
+        self.process.start()
+        child.close()
+        self.lock = threading.Lock()
+        self.connection.recv()
+
+    def fork(self) -> Tuple[int, Connection]:
+        """Returns the pid of a new worker and a connection to it.
+        """
+        with self.lock:
+            self.connection.send("fork")
+            pid = self.connection.recv()
+            return pid, Connection(recv_handle(self.connection))
+
+    def close(self) -> None:
+        self.connection.close()
+        self.process.join()
+
+
+class Worker:
+    """A process with a warm `Registry`, checking the sources it receives.
+
+    It is forked by `forks` if given, else it starts a new interpreter.
+    """
+
+    def __init__(self, select: Sequence[str], ignore: Sequence[str], forks: Optional[ForkServer] = None) -> None:
+        self.files = 0
+        self.process = None
+        if forks is not None:
+            self.pid, self.connection = forks.fork()
+        else:
+            self.connection, child = multiprocessing.Pipe()
+            self.process = multiprocessing.Process(target=_work, args=(child, select, ignore), daemon=True)
+            self.process.start()
+            child.close()
+            self.pid = self.process.pid
+        self.connection.recv()
+
+    def stop(self) -> None:
+        self.connection.close()
+        if self.process is None:
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(self.pid, signal.SIGKILL)
+        else:
+            self.process.kill()
+            self.process.join()
+
+
+class Task:
+    __slots__ = ("filename", "source", "deadline", "future")
+
+    def __init__(self, filename: str, source: str, deadline: float) -> None:
+        self.filename = filename
+        self.source = source
+        self.deadline = deadline
+        self.future: "Future[List[Error]]" = Future()
+
+
+class WorkerPool:
+    """Checks files in `workers` processes started in advance.
+
+    At most `queue_size` files wait for a worker, `submit` raises `QueueFull`
+    past that so clients can retry later instead of piling up. A worker still
+    checking a file at its deadline is killed and replaced, and so is a worker
+    that checked `max_files` files, so the memory it allocated is released.
+
+    Where processes can fork, workers are forked by a `ForkServer`.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        queue_size: int,
+        select: Sequence[str] = (),
+        ignore: Sequence[str] = (),
+        max_files: Optional[int] = None,
+    ) -> None:
+        Registry(select=select, ignore=ignore)  # Raises `ValueError` before starting processes
+        self.select = select
+        self.ignore = ignore
+        self.queue_size = queue_size
+        self.max_files = max_files
+        self.tasks: "queue.Queue[Optional[Task]]" = queue.Queue()
+        self.pending = 0
+        self.lock = threading.Lock()
+        self.forks = None
+        if "fork" in multiprocessing.get_all_start_methods():
+            self.forks = ForkServer(select, ignore)
+        self.workers = [Worker(select, ignore, self.forks) for _ in range(workers)]
+        self.threads = [threading.Thread(target=self.dispatch, args=(index,), daemon=True) for index in range(workers)]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, items: Iterable[Tuple[str, str]], timeout: float) -> List["Future[List[Error]]"]:
+        items = list(items)
+        deadline = time.monotonic() + timeout
+        with self.lock:
+            if self.pending + len(items) > self.queue_size:
+                raise QueueFull(f"{self.pending} files are waiting")
+            self.pending += len(items)
+        tasks = [Task(filename, source, deadline) for filename, source in items]
+        for task in tasks:
+            self.tasks.put(task)
+        return [task.future for task in tasks]
+
+    def dispatch(self, index: int) -> None:
+        while (task := self.tasks.get()) is not None:
+            with self.lock:
+                self.pending -= 1
+            if not task.future.set_running_or_notify_cancel():
+                continue
+            worker = self.workers[index]
+            try:
+                remaining = task.deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError
+                worker.connection.send((task.filename, task.source))
+                if not worker.connection.poll(remaining):
+                    raise TimeoutError
+                ok, result = worker.connection.recv()
+            except TimeoutError:
+                if remaining > 0:
+                    self.replace(index)
+                task.future.set_exception(TimeoutError(f"{task.filename!r} was not checked in time"))
+            except (EOFError, OSError) as e:
+                self.replace(index)
+                task.future.set_exception(WorkerError(f"the worker checking {task.filename!r} died: {e}"))
+            else:
+                if ok:
+                    task.future.set_result(result)
+                else:
+                    task.future.set_exception(WorkerError(result))
+                worker.files += 1
+                if self.max_files is not None and worker.files >= self.max_files:
+                    self.replace(index)
+
+    def replace(self, index: int) -> None:
+        self.workers[index].stop()
+        self.workers[index] = Worker(self.select, self.ignore, self.forks)
+
+    def close(self) -> None:
+        for _ in self.threads:
+            self.tasks.put(None)
+        for thread in self.threads:
+            thread.join()
+        for worker in self.workers:
+            worker.stop()
+        if self.forks is not None:
+            self.forks.close()
+
+
+class Metrics:
+    """Counters of the service, in the Prometheus text format.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.requests: Dict[int, int] = {}
+        self.files = 0
+        self.timeouts = 0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency = 0.0
+        self.in_flight = 0
+        self.started = time.time()
+
+    def observe(self, status: int, latency: float, files: int = 0, timeouts: int = 0) -> None:
+        with self.lock:
+            self.requests[status] = self.requests.get(status, 0) + 1
+            self.files += files
+            self.timeouts += timeouts
+            self.buckets[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+            self.latency += latency
+
+    def render(self, pool: WorkerPool) -> str:
+        with self.lock:
+            lines = ["# TYPE norminette_requests_total counter"]
+            for code, count in sorted(self.requests.items()):
+                lines.append(f'norminette_requests_total{{code="{code}"}} {count}')
+            lines += [
+                "# TYPE norminette_files_total counter",
+                f"norminette_files_total {self.files}",
+                "# TYPE norminette_timeouts_total counter",
+                f"norminette_timeouts_total {self.timeouts}",
+                "# TYPE norminette_request_duration_seconds histogram",
+            ]
+            count = 0
+            for bound, bucket in zip((*LATENCY_BUCKETS, "+Inf"), self.buckets):
+                count += bucket
+                lines.append(f'norminette_request_duration_seconds_bucket{{le="{bound}"}} {count}')
+            lines += [
+                f"norminette_request_duration_seconds_sum {self.latency:.6f}",
+                f"norminette_request_duration_seconds_count {count}",
+                "# TYPE norminette_requests_in_flight gauge",
+                f"norminette_requests_in_flight {self.in_flight}",
+                "# TYPE norminette_queued_files gauge",
+                f"norminette_queued_files {pool.pending}",
+                "# TYPE norminette_workers gauge",
+                f"norminette_workers {len(pool.workers)}",
+                "# TYPE norminette_start_time_seconds gauge",
+                f"norminette_start_time_seconds {self.started:.3f}",
+            ]
+        return "\n".join(lines) + "\n"
+
+
+def parse_items(body: bytes) -> List[Tuple[str, str]]:
+    """Returns the files of a request body, a JSON list of `{filename, source}`
+    objects or an object with such list in `files`.
+    """
+    try:
+        data = json.loads(body)
+    except ValueError as e:
+        raise ValueError(f"invalid JSON: {e}")
+    if isinstance(data, dict):
+        data = data.get("files")
+    if not isinstance(data, list):
+        raise ValueError("expected a list of files")
+    items = []
+    for item in data:
+        if not isinstance(item, dict) or not isinstance(item.get("filename"), str) \
+                or not isinstance(item.get("source"), str):
+            raise ValueError("expected files with a `filename` and a `source` string")
+        if not item["filename"].endswith((".c", ".h")):
+            raise ValueError(f"{item['filename']!r} is not valid C or C header file")
+        items.append((item["filename"], item["source"]))
+    return items
+
+
+class Handler(BaseHTTPRequestHandler):
+    server: "Server"
+
+    def do_GET(self) -> None:
+        if self.path != "/metrics":
+            return self.reply(404, {"error": "not found"})
+        self.reply(200, self.server.metrics.render(self.server.pool), "text/plain; version=0.0.4")
+
+    def do_POST(self) -> None:
+        if self.path != "/check":
+            return self.reply(404, {"error": "not found"})
+        metrics = self.server.metrics
+        start = time.perf_counter()
+        with metrics.lock:
+            metrics.in_flight += 1
+        try:
+            status, body, files = self.check()
+        finally:
+            with metrics.lock:
+                metrics.in_flight -= 1
+        metrics.observe(status, time.perf_counter() - start, files, int(status == 504))
+        self.reply(status, body, headers={"Retry-After": "1"} if status == 429 else None)
+
+    def check(self) -> Tuple[int, Any, int]:
+        """Checks the files of a `/check` request, returns the status code and
+        body of the reply, and the number of files checked.
+        """
+        value = self.headers.get("Content-Length")
+        if value is None:
+            return 411, {"error": "the Content-Length header is required"}, 0
+        try:
+            length = int(value)
+        except ValueError:
+            length = -1
+        if length < 0:
+            return 400, {"error": f"invalid Content-Length {value!r}"}, 0
+        if length > MAX_BODY_SIZE:
+            return 413, {"error": f"requests are limited to {MAX_BODY_SIZE} bytes"}, 0
+        try:
+            items = parse_items(self.rfile.read(length))
+        except ValueError as e:
+            return 400, {"error": str(e)}, 0
+        if len(items) > self.server.pool.queue_size:
+            # Never accepted, unlike a request rejected while the queue is busy
+            return 413, {"error": f"requests are limited to {self.server.pool.queue_size} files"}, 0
+        try:
+            futures = self.server.pool.submit(items, self.server.check_timeout)
+        except QueueFull as e:
+            return 429, {"error": f"too many files to check, {e}"}, 0
+        wait(futures, timeout=self.server.check_timeout + 1)
+        files = []
+        for (filename, source), future in zip(items, futures):
+            if not future.done() or isinstance(future.exception(), TimeoutError):
+                for future in futures:
+                    future.cancel()
+                return 504, {"error": f"files were not checked in {self.server.check_timeout}s"}, 0
+            if future.exception() is not None:
+                return 500, {"error": str(future.exception())}, 0
+            file = File(filename, source)
+            for error in future.result():
+                file.errors.add(error)
+            files.append(file)
+        locale = self.headers.get("Accept-Language", "").split(",")[0].split(";")[0].strip()
+        return 200, str(JSONErrorsFormatter(files, locale=locale or None)), len(files)
+
+    def reply(self, status: int, body: Any, content_type: str = "application/json", headers=None) -> None:
+        if not isinstance(body, str):
+            body = json.dumps(body) + "\n"
+        data = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass  # Use `/metrics`, a line per request is too much for a busy service
+
+
+class Server(ThreadingHTTPServer):
+    """HTTP service checking batches of files on `POST /check`, with metrics
+    on `GET /metrics`.
+    """
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], pool: WorkerPool, timeout: float) -> None:
+        super().__init__(address, Handler)
+        self.pool = pool
+        self.check_timeout = timeout
+        self.metrics = Metrics()
+
+
+def parse_address(value: str) -> Tuple[str, int]:
+    """Parses a `HOST:PORT` address.
+    """
+    host, _, port = value.rpartition(":")
+    if not port.isdigit() or not 0 <= int(port) <= 65535:
+        raise ValueError(f"invalid address {value!r}, expected HOST:PORT")
+    return host or "127.0.0.1", int(port)
@@ -0,0 +1,75 @@
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from norminette.file import File
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """Parses a `i/N` shard specification, where `i` goes from 1 to `N`.
+    """
+    index, _, total = value.partition("/")
+    try:
+        shard = int(index), int(total)
+    except ValueError:
+        raise ValueError(f"invalid shard {value!r}, expected i/N")
+    if not 1 <= shard[0] <= shard[1]:
+        raise ValueError(f"invalid shard {value!r}, i must be between 1 and N")
+    return shard
+
+
+def select_shard(
+    files: Sequence[File],
+    index: int,
+    total: int,
+    costs: Optional[Sequence[float]] = None,
+) -> List[File]:
+    """Returns the files of the shard `index` (starting at 1) out of `total`.
+
+    Files are assigned from the most to the least costly to the shard with the
+    lowest total cost, so shards are balanced. The cost of a file is given by
+    `costs`, in the order of `files`, or is its size. Since ties are broken by
+    path and shard number, every shard given the same costs computes the same
+    partition.
+    """
+    if costs is None:
+        costs = [file.size for file in files]
+    loads = [0.0] * total
+    shards: List[List[File]] = [[] for _ in range(total)]
+    weights = sorted(zip(costs, (file.path for file in files), files), key=lambda it: (-it[0], it[1]))
+    for cost, _, file in weights:
+        shard = loads.index(min(loads))
+        loads[shard] += cost
+        shards[shard].append(file)
+    selected = set(map(id, shards[index - 1]))
+    return [file for file in files if id(file) in selected]
+
+
+def fingerprint(paths: Iterable[str]) -> str:
+    """Returns a digest of the set of `paths`, telling whether shards split
+    the same files.
+    """
+    import hashlib
+
+    return hashlib.sha1("\0".join(sorted(set(paths))).encode()).hexdigest()
+
+
+def check_shards(shards: Sequence[Optional[dict]]) -> Optional[str]:
+    """Returns what is wrong with the `shard` objects of the reports of a
+    `--shard` run, if they don't cover every file exactly once.
+    """
+    if any(shard is None for shard in shards):
+        return "a report is not from a --shard run"
+    total, files = shards[0]["total"], shards[0]["files"]
+    if any(shard["total"] != total or shard["files"] != files for shard in shards):
+        return "the reports are from runs on different files or numbers of shards"
+    indexes = sorted(shard["index"] for shard in shards)
+    if indexes != list(range(1, total + 1)):
+        return f"expected the reports of shards 1 to {total}, got {', '.join(map(str, indexes))}"
+    seen = {}
+    for shard in shards:
+        for path in shard["paths"]:
+            if path in seen:
+                return f"{path!r} was checked by shards {seen[path]} and {shard['index']}"
+            seen[path] = shard["index"]
+    if fingerprint(seen) != files:
+        return "some files were not checked by any shard"
+    return None
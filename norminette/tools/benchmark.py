@@ -0,0 +1,92 @@
+"""Times each rule on C files.
+
+    python -m norminette.tools.benchmark [--rule NAME ...] [--repeat N] [PATH ...]
+
+Checks the files (the rule samples by default) `repeat` times and prints the
+time spent in the `run` of each rule, the slowest first. Times don't include
+lexing nor the dependencies of a rule, so a change to a rule can be compared
+before and after on its own.
+"""
+import argparse
+import contextlib
+import glob
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from norminette.context import Context
+from norminette.exceptions import CParsingError
+from norminette.file import File
+from norminette.lexer import Lexer, Token
+from norminette.registry import Registry, rules
+
+DEFAULT_PATHS = ("tests/rules/samples/*.[ch]",)
+
+
+@contextlib.contextmanager
+def timed(classes: Iterable[type], times: Dict[str, List[float]]):
+    """Records in `times` the calls and seconds of the `run` of `classes`
+    while in the block.
+    """
+    saved = {}
+    for cls in classes:
+        saved[cls] = run = cls.__dict__.get("run")
+
+        def wrapper(self, context, run=cls.run, record=times[cls.__name__]):
+            start = time.perf_counter()
+            try:
+                return run(self, context)
+            finally:
+                record[0] += 1
+                record[1] += time.perf_counter() - start
+
+        cls.run = wrapper
+    try:
+        yield times
+    finally:
+        for cls, run in saved.items():
+            if run is None:
+                del cls.run
+            else:
+                cls.run = run
+
+
+def benchmark(files: Sequence[Tuple[File, List[Token]]], names: Sequence[str] = (), repeat: int = 1):
+    """Returns the calls and seconds of each rule in `names` (all if empty)
+    when checking `files` `repeat` times.
+    """
+    registry = Registry()
+    classes = [rule for rule in rules.all if not names or rule.__name__ in names]
+    times: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0])
+    with timed(classes, times):
+        for _ in range(repeat):
+            for file, tokens in files:
+                file.errors = type(file.errors)()
+                tokens = [Token(it.type, it.pos, it.value, it.offset) for it in tokens]
+                try:
+                    registry.run(Context(file, tokens))
+                except CParsingError:
+                    pass
+    return dict(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m norminette.tools.benchmark")
+    parser.add_argument("paths", nargs="*", help="C files or glob patterns (default: the rule samples)")
+    parser.add_argument("--rule", action="append", default=[], help="Rule to time (default: all)")
+    parser.add_argument("--repeat", type=int, default=5, help="Times to check each file")
+    args = parser.parse_args(argv)
+
+    files = []
+    for pattern in args.paths or DEFAULT_PATHS:
+        for path in sorted(glob.glob(pattern)) or [pattern]:
+            file = File(path)
+            files.append((file, list(Lexer(file))))
+    times = benchmark(files, args.rule, args.repeat)
+    print(f"{'rule':<32} {'calls':>9} {'total (ms)':>11} {'per call (us)':>14}")
+    for name, (calls, seconds) in sorted(times.items(), key=lambda it: -it[1][1]):
+        print(f"{name:<32} {calls:>9} {seconds * 1000:>11.1f} {seconds / max(calls, 1) * 1e6:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Generates `norminette/rules/manifest.py` from the rule classes.
+
+    python -m norminette.tools.manifest [--check]
+
+The manifest lists the primary rules by priority, the checks with the errors
+they can add, and the checks run after each primary rule, so `Registry` can
+be built without listing and importing the rules package and wiring every
+check. It must be generated again when a rule is added or its `priority`,
+`depends_on`, `runs_on_*` or errors change; `--check` exits with 1 if it is
+stale.
+"""
+import argparse
+import collections
+import importlib
+import inspect
+import os
+import re
+import sys
+from operator import attrgetter
+
+from norminette.norm_error import errors as errors_dict
+from norminette.rules.rule import Rule, Primary, Check
+
+RULES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "rules")
+MANIFEST_PATH = os.path.join(RULES_DIR, "manifest.py")
+
+HEADER = '''\
+"""Rules of norminette and how they are wired, generated from the rule
+classes by `python -m norminette.tools.manifest`. Do not edit.
+"""
+'''
+
+
+def find_rules():
+    """Imports every module in the rules package and returns the rule classes.
+    """
+    for f in sorted(os.listdir(RULES_DIR)):
+        name, extension = os.path.splitext(f)
+        if extension == ".py" and name not in ("__init__", "manifest"):
+            importlib.import_module("norminette.rules." + name)
+    return [rule for rule in Rule.__subclasses__() if rule.__module__.startswith("norminette.rules.")]
+
+
+def emitted_errors(rule):
+    """Returns the error names that a `Check` can add, found in its module source.
+    """
+    source = inspect.getsource(sys.modules[rule.__module__])
+    names = set(re.findall(r"\"([A-Z][A-Z0-9_]+)\"", source))
+    for prefix in re.findall(r"f\"([A-Z][A-Z0-9_]+)\{", source):
+        names.update(name for name in errors_dict if name.startswith(prefix))
+    return sorted(names & errors_dict.keys())
+
+
+class Wiring:
+    """Collects what `Check.register` registers, like a `Registry`.
+    """
+
+    def __init__(self, checks):
+        self.dependencies = collections.defaultdict(list)
+        for rule in checks:
+            rule.register(self)
+
+
+def module_name(rule):
+    return rule.__module__.rpartition(".")[2]
+
+
+def quote(value):
+    return f'"{value}"'  # Names are identifiers, nothing to escape
+
+
+def entry(start, values, end):
+    """Returns the source lines of `start`, the tuple `values` and `end`, with a
+    value per line if they don't fit in one.
+    """
+    values = [quote(value) for value in values]
+    line = f"    {start}({', '.join(values)}{',' if len(values) == 1 else ''}){end}"
+    if len(line) <= 120:
+        return [line]
+    return [f"    {start}("] + [f"        {value}," for value in values] + [f"    ){end}"]
+
+
+def build():
+    """Returns the source of the manifest for the rule classes.
+    """
+    rules = find_rules()
+    primaries = sorted(
+        (rule for rule in rules if issubclass(rule, Primary)),
+        reverse=True,
+        key=attrgetter("priority"),
+    )
+    checks = sorted((rule for rule in rules if issubclass(rule, Check)), key=attrgetter("__name__"))
+    wiring = Wiring(checks)
+
+    lines = [HEADER, "# Primary rules by decreasing priority: (name, module)", "primaries = ("]
+    for rule in primaries:
+        lines.append(f"    ({quote(rule.__name__)}, {quote(module_name(rule))}),")
+    lines += [")", "", "# Checks: name -> (module, errors it can add)", "checks = {"]
+    for rule in checks:
+        lines += entry(f"{quote(rule.__name__)}: ({quote(module_name(rule))}, ", emitted_errors(rule), "),")
+    lines += ["}", "", "# Checks run after a primary rule or at `_start`, `_rule` and `_end`", "dependencies = {"]
+    for name in sorted(wiring.dependencies):
+        names = sorted((rule.__name__ for rule in wiring.dependencies[name]), reverse=True)
+        lines += entry(f"{quote(name)}: ", names, ",")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m norminette.tools.manifest")
+    parser.add_argument("--check", action="store_true", help="Exit with 1 if the manifest is stale")
+    args = parser.parse_args(argv)
+
+    source = build()
+    current = None
+    if os.path.exists(MANIFEST_PATH):
+        with open(MANIFEST_PATH) as stream:
+            current = stream.read()
+    if args.check:
+        if source != current:
+            print(f"{MANIFEST_PATH} is stale, run `python -m norminette.tools.manifest`")
+            sys.exit(1)
+        return
+    if source != current:
+        with open(MANIFEST_PATH, "w") as stream:
+            stream.write(source)
+        print(f"Updated {MANIFEST_PATH}")
+
+
+if __name__ == "__main__":
+    main()
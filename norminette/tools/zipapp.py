@@ -0,0 +1,124 @@
+"""Builds norminette as a single-file zipapp.
+
+    python -m norminette.tools.zipapp [-o norminette.pyz]
+
+The archive runs with `python -I norminette.pyz [options] [files]` and holds:
+
+- the sources of the package, each with its bytecode compiled by the running
+  Python, so it starts without compiling nor looking for `__pycache__`. Other
+  Python versions ignore the bytecode and compile the sources;
+- the rule manifest, generated from the rule classes;
+- the `.mo` catalogs, compiled from the `.po` files.
+
+Files are stored uncompressed, reading them is faster than inflating them.
+"""
+import argparse
+import ast
+import importlib.util
+import marshal
+import os
+import struct
+import time
+import zipfile
+
+from norminette.tools import manifest
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+MAIN = """\
+from norminette.__main__ import main
+
+main()
+"""
+
+
+def compile_catalog(path):
+    """Returns the `.mo` catalog of the `.po` file at `path`, like `msgfmt`:
+    fuzzy and untranslated messages are left out.
+    """
+    messages = {}
+    entry, key, fuzzy = {}, None, False
+
+    def flush():
+        if "msgid" in entry and entry.get("msgstr") and not (fuzzy and entry["msgid"]):
+            messages[entry["msgid"]] = entry["msgstr"]
+
+    with open(path, encoding="utf-8") as stream:
+        for line in stream:
+            line = line.strip()
+            if line.startswith("#,") and "fuzzy" in line:
+                flush()
+                entry, key, fuzzy = {}, None, True
+            elif line.startswith("msgid "):
+                if key == "msgstr":
+                    flush()
+                    entry, fuzzy = {}, False
+                key, line = "msgid", line[6:]
+            elif line.startswith("msgstr "):
+                key, line = "msgstr", line[7:]
+            if line.startswith('"') and key is not None:
+                entry[key] = entry.get(key, "") + ast.literal_eval(line)
+    flush()
+
+    ids = sorted(messages)
+    originals = [it.encode() for it in ids]
+    translations = [messages[it].encode() for it in ids]
+    start = 7 * 4 + 16 * len(ids)
+    offsets, strings = [], b""
+    for string in originals + translations:
+        offsets.append((len(string), start + len(strings)))
+        strings += string + b"\0"
+    header = struct.pack("<Iiiiiii", 0x950412DE, 0, len(ids), 7 * 4, 7 * 4 + 8 * len(ids), 0, 0)
+    return header + b"".join(struct.pack("<ii", *it) for it in offsets) + strings
+
+
+def bytecode(source, path):
+    """Returns the `.pyc` of `source`, with a hash that isn't checked against
+    the source, since the archive can't change.
+    """
+    code = compile(source, path, "exec", dont_inherit=True)
+    flags = struct.pack("<I", 0b01)  # Hash-based, not checked
+    return importlib.util.MAGIC_NUMBER + flags + importlib.util.source_hash(source) + marshal.dumps(code)
+
+
+def build(output):
+    """Writes the zipapp of the package to `output`.
+    """
+    date_time = time.localtime()[:6]
+
+    def write(archive, name, data):
+        archive.writestr(zipfile.ZipInfo(name, date_time), data)
+
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_STORED) as archive:
+        write(archive, "__main__.py", MAIN)
+        for root, dirs, files in os.walk(PACKAGE_DIR):
+            dirs[:] = sorted(it for it in dirs if it != "__pycache__")
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                arcname = os.path.relpath(path, os.path.dirname(PACKAGE_DIR)).replace(os.sep, "/")
+                if name == "manifest.py" and root == manifest.RULES_DIR:
+                    source = manifest.build().encode()
+                elif name.endswith(".py"):
+                    with open(path, "rb") as stream:
+                        source = stream.read()
+                elif name.endswith(".po"):
+                    write(archive, arcname[:-3] + ".mo", compile_catalog(path))
+                    continue
+                else:
+                    continue
+                write(archive, arcname, source)
+                write(archive, arcname + "c", bytecode(source, arcname))
+    os.chmod(output, 0o755)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m norminette.tools.zipapp")
+    parser.add_argument("-o", "--output", default="norminette.pyz", help="Path of the archive")
+    args = parser.parse_args(argv)
+
+    build(args.output)
+    print(f"Built {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from norminette.aio import check_many
+from norminette.context import Context
+from norminette.file import File
+from norminette.lexer import Lexer
+from norminette.registry import Registry
+
+sources = [
+    ("a.c", "int\tmain(void)\n{\n\treturn (0) ;\n}\n"),
+    ("b.h", ""),
+    ("c.c", "int  a;\n"),
+    ("d.c", "int\tf(void)\n{\n\treturn 0;\n}\n"),
+]
+
+
+def expected(path, source):
+    file = File(path, source)
+    Registry().run(Context(file, list(Lexer(file))))
+    return list(file.errors)
+
+
+async def collect(*args, **kwargs):
+    return [file async for file in check_many(*args, **kwargs)]
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_check_many(executor):
+    files = asyncio.run(collect(sources, concurrency=2, executor=executor))
+    assert sorted(file.path for file in files) == [path for path, _ in sources]
+    for file in files:
+        assert list(file.errors) == expected(file.path, dict(sources)[file.path])
+
+
+def test_check_many_paths(tmp_path):
+    path = tmp_path / "main.c"
+    path.write_text(sources[0][1])
+
+    async def items():
+        yield path
+
+    files = asyncio.run(collect(items(), executor="thread"))
+    assert [file.path for file in files] == [str(path)]
+    assert list(files[0].errors) == expected(str(path), sources[0][1])
+
+
+def test_check_many_stops_early():
+    big = "int\tf(void)\n{\n\treturn (0) ;\n}\n" * 5000
+
+    async def first():
+        async for file in check_many([("big.c", big), ("a.c", sources[0][1])], concurrency=2, executor="thread"):
+            return file
+
+    assert asyncio.run(first()).path == "a.c"
+    workers = [it for it in threading.enumerate() if it.name.startswith("norminette")]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join(timeout=5)
+    assert not any(worker.is_alive() for worker in workers)
+    assert time.perf_counter() - start < 1
+
+
+def test_check_many_invalid():
+    with pytest.raises(ValueError):
+        asyncio.run(collect(sources, executor="fiber"))
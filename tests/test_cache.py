@@ -0,0 +1,60 @@
+import threading
+
+import pytest
+
+from norminette.file import File
+from norminette.lexer import Lexer
+from norminette.lsp import CancellableErrors
+from norminette.context import Context
+from norminette.registry import Registry
+
+functions = [
+    f"int\tf{index}(int a)\n{{\n\tint b;\n\n\tb = a  + {index};\n\treturn (b);\n}}\n"
+    for index in range(7)
+]
+
+
+def run(registry: Registry, source: str):
+    file = File("/nium/test.c", source)
+    context = Context(file, list(Lexer(file)))
+    registry.run(context)
+    return list(file.errors)
+
+
+@pytest.mark.parametrize("edit", [
+    lambda units: units,
+    lambda units: units[:3] + ["int\tg(void)\n{\n\treturn (0) ;\n}\n"] + units[3:],
+    lambda units: units[:2] + [units[2].replace("\treturn", "\n\n\treturn")] + units[3:],
+    lambda units: units[:4] + units[5:],
+    lambda units: ["\n\n"] + units,
+])
+def test_cache_reuses_unchanged_units(edit):
+    registry = Registry(cache=True)
+    run(registry, "\n".join(functions))
+    source = "\n".join(edit(functions))
+
+    assert run(registry, source) == run(Registry(), source)
+    assert registry.cache.hits >= len(functions) - 3
+
+
+def test_cache_is_not_used_with_an_errors_limit():
+    registry = Registry(cache=True)
+    source = "\n".join(functions)
+    run(registry, source)
+    file = File("/nium/test.c", source)
+    file.errors.limit = 1
+    registry.run(Context(file, list(Lexer(file))))
+
+    assert registry.cache.hits == 0
+    assert len(file.errors) == 1
+
+
+def test_cancelled_check_stops_in_units():
+    registry = Registry(cache=True)
+    cancelled = threading.Event()
+    cancelled.set()
+    file = File("/nium/test.c", "\n".join(functions))
+    file.errors = CancellableErrors(cancelled)
+    registry.run(Context(file, list(Lexer(file))))
+
+    assert len(registry.cache) == 0
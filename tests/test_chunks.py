@@ -0,0 +1,56 @@
+import pytest
+
+from norminette import chunks
+from norminette.file import File
+from norminette.lexer import Lexer
+from norminette.context import Context
+from norminette.registry import Registry
+
+source = "".join(
+    f"int\tf{index}(int a)\n{{\n\tif (a)\n\t\treturn (a);\n\treturn ({index});\n}}\n\n"
+    for index in range(8)
+) + "#ifdef A\nint\tg;\n#endif\nint x ;\n"
+
+
+def run(source: str, jobs: int):
+    file = File("/nium/test.c", source)
+    context = Context(file, list(Lexer(file)))
+    if jobs > 1:
+        chunks.run_in_chunks(Registry(), context, jobs)
+    else:
+        Registry().run(context)
+    return list(file.errors)
+
+
+def test_find_boundaries():
+    file = File("/nium/test.c", "int\ta;\n#if A\nint\tb;\n#endif\nvoid\tf(void)\n{\n\ta;\n}\n")
+    tokens = list(Lexer(file))
+    boundaries = chunks.find_boundaries(tokens)
+
+    assert [tokens[index - 1].pos[0] for index in boundaries] == [1, 8]
+
+
+@pytest.mark.parametrize("jobs", [2, 3, 4])
+def test_split_points(monkeypatch, jobs):
+    monkeypatch.setattr(chunks, "MIN_CHUNK_SIZE", 10)
+    file = File("/nium/test.c", source)
+    tokens = list(Lexer(file))
+    points = chunks.split_points(tokens, jobs)
+
+    assert len(points) == jobs
+    assert points == sorted(points, reverse=True)
+    assert set(points[1:]) <= {len(tokens) - index for index in chunks.find_boundaries(tokens)}
+
+
+@pytest.mark.parametrize("jobs", [2, 4, 16])
+def test_run_in_chunks_is_sequential_run(monkeypatch, jobs):
+    monkeypatch.setattr(chunks, "MIN_CHUNK_SIZE", 10)
+
+    assert run(source, jobs) == run(source, 1)
+
+
+def test_run_in_chunks_does_not_fall_back(monkeypatch):
+    monkeypatch.setattr(chunks, "MIN_CHUNK_SIZE", 10)
+    monkeypatch.setattr(Registry, "run", lambda *_: pytest.fail("checked sequentially"))
+
+    assert run(source, 4)
@@ -0,0 +1,53 @@
+from norminette.context import Context, History
+from norminette.file import File
+from norminette.lexer import Lexer
+from norminette.rules import Rules
+
+rules = {rule.__name__: rule for rule in Rules().primaries}
+
+
+def make_history(*names: str, size=None) -> History:
+    history = History(size)
+    for name in names:
+        history.append(rules[name](None))
+    return history
+
+
+def test_history_is_inside_a_function():
+    history = make_history("IsFuncDeclaration", "IsBlockStart", "IsControlStatement", "IsBlockStart")
+    assert history.is_inside_a_function()
+    history.append(rules["IsBlockEnd"](None))
+    assert history.is_inside_a_function()
+    history.append(rules["IsBlockEnd"](None))
+    assert not history.is_inside_a_function()
+
+
+def test_history_last_significant():
+    history = make_history("IsComment", "IsEmptyLine")
+    assert history.last_significant() is None
+
+    history = make_history("IsControlStatement", "IsComment", "IsBlockStart")
+    assert history.last_significant() == "IsBlockStart"
+    assert history.last_significant(before_last=True) == "IsControlStatement"
+    history.append(rules["IsEmptyLine"](None))
+    assert history.last_significant(before_last=True) == "IsBlockStart"
+    assert history.skipped == 1
+
+
+def test_bounded_history():
+    history = make_history(*["IsComment"] * 10, "IsFuncDeclaration", "IsBlockStart", size=4)
+
+    assert len(history) == 4
+    assert history.total == 12
+    assert history[-1] == "IsBlockStart"
+    assert history.is_inside_a_function()
+
+
+def test_context_memoizes_until_tokens_are_popped():
+    file = File("<file>", "int a;\nchar b;\n")
+    context = Context(file, list(Lexer(file)))
+    assert context.check_type_specifier(0) == (True, 1)
+    assert context.memo
+    context.pop_tokens(5)
+    assert not context.memo
+    assert context.check_type_specifier(0) == (True, 1)
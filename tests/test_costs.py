@@ -0,0 +1,90 @@
+import gc
+import json
+import os
+import subprocess
+import sys
+
+from norminette.costs import Costs, cache_dir
+from norminette.exceptions import CParsingError
+from norminette.file import File
+from norminette import jobs
+from norminette.jobs import run_jobs, timed_check
+
+
+def test_cache_dir(monkeypatch):
+    monkeypatch.setenv("NORMINETTE_CACHE_DIR", "/tmp/norminette")
+    assert cache_dir() == "/tmp/norminette"
+    monkeypatch.delenv("NORMINETTE_CACHE_DIR")
+    monkeypatch.setenv("XDG_CACHE_HOME", "/tmp/cache")
+    assert cache_dir() == os.path.join("/tmp/cache", "norminette")
+
+
+def test_costs_estimates(tmp_path):
+    path = str(tmp_path / "costs.json")
+    files = [File("a.c", "a" * 100), File("b.c", "b" * 10)]
+
+    costs = Costs(path)
+    assert costs.estimates(files) == [100, 10]
+
+    costs.record(files[0], 0.5)
+    costs.save()
+    costs = Costs(path)
+    assert costs.estimates(files) == [0.5, 0.05]
+
+
+def test_costs_ignores_invalid_file(tmp_path):
+    path = tmp_path / "costs.json"
+    path.write_text("{")
+
+    assert Costs(str(path)).entries == {}
+
+
+def test_run_jobs():
+    files = [File(f"{index}.c", "a" * index) for index in range(4)]
+
+    def check(file):
+        if file.path == "2.c":
+            raise CParsingError("Unexpected EOF")
+        file.errors.add("TOO_MANY_LINES", highlights=[])
+
+    results = {file.path: message for file, message, _ in run_jobs(check, files, [1, 3, 2, 0], 2)}
+
+    assert results == {"0.c": None, "1.c": None, "2.c": "Unexpected EOF", "3.c": None}
+    assert [len(file.errors) for file in files] == [1, 1, 0, 1]
+
+    # A single process checks the files in the order they are given to it
+    order = [file.path for file, _, _ in run_jobs(lambda file: None, files, [1, 3, 2, 0], 1)]
+    assert order == ["1.c", "2.c", "0.c", "3.c"]
+
+
+def test_run_jobs_recycles_processes(monkeypatch):
+    monkeypatch.setattr(jobs, "MAX_FILES_PER_PROCESS", 1)
+    files = [File(f"{index}.c", "") for index in range(4)]
+
+    def check(file):
+        file.errors.add("TOO_MANY_LINES", str(os.getpid()), highlights=[])
+
+    assert len(list(run_jobs(check, files, [0] * 4, 2))) == 4
+    assert len({next(iter(file.errors)).text for file in files}) == 4
+    assert gc.get_freeze_count() == 0
+
+
+def test_timed_check():
+    message, seconds = timed_check(lambda file: None, File("a.c", ""))
+
+    assert message is None
+    assert seconds >= 0
+
+
+def test_fail_fast_with_jobs(tmp_path):
+    paths = [str(tmp_path / f"{index}.c") for index in range(3)]
+    for path in paths:
+        with open(path, "w") as stream:
+            stream.write("int\tmain(void);\n")
+    cache = tmp_path / "cache"
+    env = {**os.environ, "NORMINETTE_CACHE_DIR": str(cache), "PYTHONPATH": os.getcwd()}
+    command = [sys.executable, "-m", "norminette", "--fail-fast", "--jobs", "2", *paths]
+    subprocess.run(command, env=env, capture_output=True)
+
+    with open(cache / "costs.json") as stream:
+        assert list(json.load(stream)) == paths[:1]
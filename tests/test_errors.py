@@ -1,4 +1,5 @@
 import json
+import gettext
 from typing import List
 from dataclasses import astuple
 
@@ -12,6 +13,7 @@ from norminette.registry import Registry
 from norminette.errors import JSONErrorsFormatter
 from norminette.errors import Error, Errors, Highlight as H
 from norminette.errors import HumanizedErrorsFormatter
+from norminette.i18n import _load_translation, get_translation, resolve_locale, set_locale
 
 
 @pytest.mark.parametrize("files, expected_result, ", [it.values() for it in [
@@ -151,3 +153,72 @@ def test_error_add_highlight():
     error.add_highlight(*astuple(highlights[1]))
 
     assert error.highlights == highlights
+
+
+def test_errors_limit():
+    errors = Errors(limit=2)
+
+    errors.add(Error("GLOBAL_VAR", "Global variables detected, take care", "Notice", [H(1, 1, 1)]))
+    errors.add(Error("A", "a", "Error", [H(2, 1, 1)]))
+    assert not errors.is_full
+    errors.add(Error("B", "b", "Error", [H(3, 1, 1)]))
+    assert errors.is_full
+    errors.add(Error("C", "c", "Error", [H(4, 1, 1)]))
+
+    assert [error.name for error in errors] == ["GLOBAL_VAR", "A", "B"]
+    assert errors.status == "Error"
+
+
+def test_registry_stops_when_errors_are_full():
+    file = File("/nium/limit.c", "int\ta()\n{\n}\nint\tb()\n{\n}\n")
+    file.errors.limit = 1
+    context = Context(file, list(Lexer(file)))
+    Registry().run(context)
+
+    assert len(file.errors) == 1
+    assert context.tokens != []
+
+
+class FakeTranslations(gettext.NullTranslations):
+    def gettext(self, message):
+        return {"Function has more than 25 lines": "Função tem mais de 25 linhas"}.get(message, message)
+
+
+def test_error_message_locale():
+    error = Error.from_name("TOO_MANY_LINES", highlights=[H(1, 1, 1)])
+    assert error.text is None
+    with patch("norminette.i18n.get_translation", lambda locale: FakeTranslations() if locale == "pt_BR" else
+               gettext.NullTranslations()):
+        assert error.message() == "Function has more than 25 lines"
+        assert error.message("pt_BR") == "Função tem mais de 25 linhas"
+        assert Error("TOO_MANY_LINES", "Custom").message("pt_BR") == "Custom"
+
+        file = File("/nium/a.c", "")
+        file.errors.add(error)
+        output = json.loads(str(JSONErrorsFormatter(file, locale="pt_BR")))
+        assert output["files"][0]["errors"][0]["text"] == "Função tem mais de 25 linhas"
+        output = str(HumanizedErrorsFormatter(file, use_colors=False))
+        assert output.endswith("Function has more than 25 lines\n")
+
+
+def test_set_locale(capsys):
+    set_locale("pt_BR")
+    try:
+        with patch("norminette.i18n.get_translation", lambda locale: FakeTranslations() if locale == "pt_BR" else
+                   gettext.NullTranslations()):
+            assert Error.from_name("TOO_MANY_LINES").message() == "Função tem mais de 25 linhas"
+    finally:
+        set_locale("en_US")
+    assert capsys.readouterr() == ("", "")
+    assert get_translation("pt-br") is get_translation("pt-br")
+
+
+def test_get_translation_by_resolved_locale():
+    assert [resolve_locale(tag) for tag in ("pt-br", "pt_BR", "PT-BR.UTF-8", "fr", "pt-PT")] == [
+        "pt_BR", "pt_BR", "pt_BR", None, None,
+    ]
+    _load_translation.cache_clear()
+    assert get_translation("pt-br") is get_translation("pt_BR") is get_translation("pt-BR")
+    for index in range(100):
+        get_translation(f"xx-{index}")
+    assert _load_translation.cache_info().currsize == 2
@@ -0,0 +1,85 @@
+import pytest
+
+from norminette.exceptions import BinaryFileError
+from norminette.file import MMAP_THRESHOLD, File, Lines, decode, read_source
+
+
+@pytest.mark.parametrize("source, widths", [
+    ["", [0]],
+    ["int\ta;\n", [6, 0]],
+    ["\tint\n\t\ta;\n", [7, 10, 0]],
+    ["ab\tc\n", [5, 0]],
+    ["a\r\n", [2, 0]],
+])
+def test_lines_widths(source, widths):
+    assert Lines(source).widths[1:] == widths
+
+
+@pytest.mark.parametrize("line, flags", [
+    ["\tint\ta;", 0],
+    [" int a;", Lines.LEADING_SPACE],
+    ["int a; ", Lines.TRAILING_SPACE],
+    ["\t", Lines.TRAILING_SPACE],
+    ["int  a;", Lines.CONSECUTIVE_SPACES],
+    ["int \ta;", Lines.MIXED_SPACE_TAB],
+    ["int\t a;", Lines.MIXED_SPACE_TAB],
+    ["a = \"\\n\";", Lines.UNUSUAL],
+    ["a = 1;\r", Lines.UNUSUAL],
+    ["// é", Lines.UNUSUAL],
+])
+def test_lines_flags(line, flags):
+    assert Lines(line).flags[1] == flags
+
+
+def test_lines_continued_by_escaped_newline():
+    lines = Lines("#define A \\\n\t1\n")
+    assert lines.flags[2] == Lines.UNUSUAL
+    assert lines.any_flags(2, 2)
+    assert not lines.any_flags(3, 3)
+
+
+def test_lines_width_of_range():
+    lines = Lines("a\n" + "b" * 90 + "\nc\n")
+    assert lines.width(1, 1) == 1
+    assert lines.width(1, 3) == 90
+    assert lines.width(5, 9) == 0
+
+
+def test_file_lines_are_computed_once():
+    file = File("<file>", "int a;\n")
+    assert file.lines is file.lines
+    assert len(file.lines) == 2
+
+
+@pytest.mark.parametrize("data, encoding, text", [
+    [b"int\ta;\n", None, "int\ta;\n"],
+    ["// é\n".encode(), None, "// é\n"],
+    ["// é\n".encode("latin-1"), None, "// é\n"],
+    ["// é\n".encode("cp1252"), "cp1252", "// é\n"],
+    [b"// \xff\n", "utf-8", "// �\n"],
+    [b"int\ta;\r\nint\tb;\r", None, "int\ta;\nint\tb;\n"],
+])
+def test_decode(data, encoding, text):
+    assert decode(data, encoding) == text
+
+
+def test_decode_binary_file():
+    with pytest.raises(BinaryFileError):
+        decode(b"\x7fELF\x02\x01\x01\x00")
+
+
+@pytest.mark.parametrize("threshold", [1, MMAP_THRESHOLD])
+def test_read_source(tmp_path, monkeypatch, threshold):
+    monkeypatch.setattr("norminette.file.MMAP_THRESHOLD", threshold)
+    path = tmp_path / "main.c"
+    path.write_bytes("// é\r\nint\tmain(void);\n".encode("latin-1"))
+
+    assert read_source(str(path)) == "// é\nint\tmain(void);\n"
+    assert File(str(path)).source == "// é\nint\tmain(void);\n"
+
+
+def test_file_bytes_source():
+    file = File("main.c", "// é\n".encode("latin-1"))
+
+    assert file.size == 5
+    assert file.source == "// é\n"
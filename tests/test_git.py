@@ -0,0 +1,109 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from norminette.git import parse_diff, staged_files, unquote
+
+
+diff = """\
+diff --git a/src/main.c b/src/main.c
+index 6c08cff..8617fff 100644
+--- a/src/main.c
++++ b/src/main.c
+@@ -3 +3 @@ int\tmain(void)
+-\t{
++\t{\x20\x20
+@@ -10,2 +11,3 @@ int\tmain(void)
+-\ta = 1;
+-\tb = 2;
++\ta = 1;
++\tb = 2;
++\tc = 3;
+@@ -20,4 +22,0 @@ int\tmain(void)
+-\treturn (0);
+diff --git a/old.h b/old.h
+deleted file mode 100644
+--- a/old.h
++++ /dev/null
+@@ -1 +0,0 @@
+-#define OLD
+diff --git a/my file.c b/my file.c
+--- a/my file.c\t
++++ b/my file.c\t
+@@ -1 +1 @@
+-int\ta;
++int\tb;
+diff --git "a/\\303\\247\\"a.c" "b/\\303\\247\\"a.c"
+--- "a/\\303\\247\\"a.c"
++++ "b/\\303\\247\\"a.c"
+@@ -2 +2 @@
+-int\ta;
++int\tb;
+"""
+
+
+def test_parse_diff():
+    assert parse_diff(diff) == {
+        "src/main.c": {3, 11, 12, 13, 22, 23},
+        "my file.c": {1},
+        'ç"a.c': {2},
+    }
+
+
+def test_unquote():
+    assert unquote("b/main.c") == "b/main.c"
+    assert unquote('"b/a\\tb\\\\c\\303\\247.c"') == "b/a\tb\\cç.c"
+
+
+def test_staged_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    subprocess.run(["git", "init", "-q"], check=True)
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "main.c").write_text("int\tmain(void);\n")
+    (tmp_path / "notes.txt").write_text("Hello")
+    subprocess.run(["git", "add", "."], check=True)
+    (tmp_path / "src" / "main.c").write_text("Not staged")
+
+    assert list(staged_files()) == [("src/main.c", b"int\tmain(void);\n")]
+
+
+@pytest.fixture
+def repository(tmp_path):
+    def run(*args):
+        subprocess.run(["git", "-c", "user.name=a", "-c", "user.email=a@b", *args], cwd=tmp_path, check=True)
+
+    (tmp_path / "sub").mkdir()
+    names = ["my file.c", "ção.c", "ok.c", "sub/sub.c", "unchanged.c"]
+    for name in names:
+        (tmp_path / name).write_text("int\ta;\n")
+    run("init", "-q")
+    run("add", ".")
+    run("commit", "-q", "-m", "Files")
+    for name in names[:-1]:
+        (tmp_path / name).write_text("int\ta;\nint\tb;\n")
+    return tmp_path
+
+
+def norminette(cwd, *args):
+    env = {**os.environ, "PYTHONPATH": os.getcwd()}
+    command = [sys.executable, "-m", "norminette", "--no-colors", "--no-cache", "--diff", "HEAD", *args]
+    return subprocess.run(command, cwd=cwd, env=env, capture_output=True, text=True).stdout
+
+
+def test_diff_special_paths(repository):
+    output = norminette(repository)
+    assert "my file.c: Error!" in output
+    assert "ção.c: Error!" in output
+    assert "unchanged.c" not in output
+
+
+def test_diff_named_paths(repository):
+    output = norminette(repository / "sub", str(repository / "ok.c"), "../my file.c", "../unchanged.c", "sub.c")
+    assert "ok.c: Error!" in output
+    assert "my file.c: Error!" in output
+    assert "sub.c: Error!" in output
+    assert output.count("INVALID_HEADER") == 1  # Only in the line 1 of unchanged.c
+    # Named files are checked whole even if they didn't change
+    assert "unchanged.c: Error!" in output
@@ -0,0 +1,109 @@
+import os
+import subprocess
+import sys
+
+from norminette.file import File
+from norminette import index
+from norminette.index import Index, sources_fingerprint, stat_data
+
+key = ["3.3.59", [], [], None, None]
+
+
+def check(path, errors=()):
+    file = File(str(path))
+    for name in errors:
+        file.errors.add(name, highlights=[])
+    return file
+
+
+def test_index_restores_unchanged_files(tmp_path, monkeypatch):
+    source = tmp_path / "main.c"
+    source.write_text("int\tmain();\n")
+    os.utime(source, ns=(0, 10**9))
+    path = str(tmp_path / "index.json")
+    index = Index(key, path)
+    assert not index.restore(File(str(source)))
+    index.record(check(source, ["NO_ARGS_VOID"]))
+    index.save()
+
+    opened = []
+    real_open = open
+    monkeypatch.setattr("builtins.open", lambda *args, **kwargs: opened.append(args) or real_open(*args, **kwargs))
+    index = Index(key, path)
+    file = File(str(source))
+    restored = index.restore(file)
+    monkeypatch.undo()
+
+    assert restored
+    assert [error.name for error in file.errors] == ["NO_ARGS_VOID"]
+    assert opened == [(path,)]
+
+
+def test_index_checks_changed_files(tmp_path):
+    source = tmp_path / "main.c"
+    source.write_text("int\tmain();\n")
+    path = str(tmp_path / "index.json")
+    index = Index(key, path)
+    index.restore(File(str(source)))
+    index.record(check(source, ["NO_ARGS_VOID"]))
+    index.save()
+
+    source.write_text("int\tmain(void);\n")
+    assert not Index(key, path).restore(File(str(source)))
+    assert not Index(["3.3.60", [], [], None, None], path).restore(File(str(source)))
+
+
+def test_index_smudges_racily_clean_files(tmp_path):
+    source = tmp_path / "main.c"
+    source.write_text("int\tmain();\n")
+    future = (os.stat(source).st_mtime_ns + 10**12,) * 2
+    os.utime(source, ns=future)
+    path = str(tmp_path / "index.json")
+    index = Index(key, path)
+    index.restore(File(str(source)))
+    index.record(check(source, ["NO_ARGS_VOID"]))
+    index.save()
+
+    assert index.entries[str(source)]["stat"] is None
+    # Same size and mtime, only the content tells the file changed
+    source.write_text("int\tmain(1);\n")
+    os.utime(source, ns=future)
+    assert not Index(key, path).restore(File(str(source)))
+
+
+def test_stat_data(tmp_path):
+    assert stat_data(str(tmp_path / "missing.c")) is None
+
+
+def test_sources_fingerprint(tmp_path, monkeypatch):
+    package = tmp_path / "norminette"
+    (package / "rules").mkdir(parents=True)
+    rule = package / "rules" / "check_spacing.py"
+    rule.write_text("pass\n")
+    monkeypatch.setattr(index, "__file__", str(package / "index.py"))
+    fingerprint = sources_fingerprint()
+    assert sources_fingerprint() == fingerprint
+    rule.write_text("pass  # Edited\n")
+    assert sources_fingerprint() != fingerprint
+
+
+def test_sources_fingerprint_in_archive(tmp_path, monkeypatch):
+    archive = tmp_path / "norminette.pyz"
+    archive.write_bytes(b"PK")
+    monkeypatch.setattr(index, "__file__", str(archive / "norminette" / "index.py"))
+    fingerprint = sources_fingerprint()
+    archive.write_bytes(b"PK\0")
+    assert sources_fingerprint() != fingerprint
+
+
+def test_no_cache(tmp_path):
+    source = tmp_path / "main.c"
+    source.write_text("int\tmain(void);\n")
+    cache = tmp_path / "cache"
+    env = {**os.environ, "NORMINETTE_CACHE_DIR": str(cache)}
+    command = [sys.executable, "-m", "norminette", "--no-colors", str(source)]
+    subprocess.run(command + ["--no-cache"], env=env, capture_output=True)
+    assert not cache.exists()
+    subprocess.run(command, env=env, capture_output=True)
+    assert (cache / "costs.json").exists()
+    assert list((cache / "index").iterdir())
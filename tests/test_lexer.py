@@ -3,7 +3,8 @@ from typing import Dict, Any, List, Optional, Tuple
 
 import pytest
 
-from norminette.lexer import Token as T
+from norminette.file import File
+from norminette.lexer import Lexer, Edit, relex, Token as T, TokenBuffer
 from norminette.lexer.dictionary import keywords, operators, brackets
 from norminette.errors import Error as E, Highlight as H
 from norminette.exceptions import UnexpectedEOF
@@ -585,3 +586,54 @@ def test_lexer_tokens(source: str, expected_tokens: List[T]):
     tokens = list(lexer)
 
     assert tokens == expected_tokens
+
+
+relex_source = "int\tmain(void)\n{\n\t/* a\n\t * b */\n\treturn (0x1);\n}\n\nchar\t*s = \"a\\\nb\";\n"
+
+
+@pytest.mark.parametrize("edit", dict_to_pytest_param({
+    "Insert at start": [Edit(0, 0, "\n")],
+    "Insert in identifier": [Edit(5, 0, "_")],
+    "Replace a token": [Edit(relex_source.index("return"), 6, "while")],
+    "Open a comment": [Edit(relex_source.index("return"), 0, "/*")],
+    "Close a comment": [Edit(relex_source.index(" a"), 0, "*/\n")],
+    "Break an escaped newline": [Edit(relex_source.index("\\"), 1, "")],
+    "Remove lines": [Edit(10, 22, "")],
+    "Insert a bad lexeme": [Edit(relex_source.index("0x1"), 0, "$")],
+    "Append": [Edit(len(relex_source), 0, "int\tx;")],
+    "Remove all": [Edit(0, len(relex_source), "")],
+}))
+def test_relex(edit: Edit):
+    file = File("<file>", relex_source)
+    tokens = list(Lexer(file))
+    source = relex_source[:edit.start] + edit.text + relex_source[edit.start + edit.removed:]
+    expected = File("<file>", source)
+    result = File("<file>", source)
+
+    assert relex(result, tokens, list(file.errors), edit) == list(Lexer(expected))
+    assert [token.offset for token in relex(File("<file>", source), tokens, [], edit)] == [
+        token.offset for token in Lexer(File("<file>", source))
+    ]
+    assert list(result.errors) == list(expected.errors)
+
+
+def test_token_buffer_takes_tokens_when_read():
+    taken = []
+
+    def tokens():
+        for index in range(3000):
+            taken.append(index)
+            yield T("IDENTIFIER", (1, index + 1), str(index))
+
+    buffer = TokenBuffer(tokens())
+    assert buffer[1].value == "1" and len(taken) == TokenBuffer.LOOKAHEAD
+    assert [token.value for token in buffer[:4]] == ["0", "1", "2", "3"]
+    assert buffer.get(40).value == "40" and buffer.has(41) and len(taken) == 2 * TokenBuffer.LOOKAHEAD
+
+    buffer.pop(2000)
+    assert buffer[0].value == "2000" and len(taken) == 2000 + TokenBuffer.LOOKAHEAD
+    assert len(buffer._tokens) < 2000  # Popped tokens were dropped
+    assert buffer[-1].value == "2999" and len(buffer) == 1000
+    assert buffer.get(1000) is None and not buffer.has(1001)
+    buffer.pop(1000)
+    assert not buffer and list(buffer) == []
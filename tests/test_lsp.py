@@ -0,0 +1,140 @@
+import json
+import os
+import threading
+
+import pytest
+
+from norminette.file import File
+from norminette.lexer import Lexer
+from norminette.lsp import CancellableErrors, Document, Server, character, offset
+from norminette.registry import Registry
+
+uri = "file:///nium/test.c"
+source = "int\tmain(void)\n{\n\treturn (0);\n}\n"
+
+
+class Client:
+    """Runs a server in a thread, talking to it through pipes.
+    """
+
+    def __init__(self, delay=0):
+        server_input, self.input = os.pipe()
+        self.output, server_output = os.pipe()
+        self.input = os.fdopen(self.input, "wb")
+        self.output = os.fdopen(self.output, "rb")
+        self.server = Server(Registry(cache=True), os.fdopen(server_input, "rb"), os.fdopen(server_output, "wb"), delay)
+        self.thread = threading.Thread(target=lambda: setattr(self, "code", self.server.serve()), daemon=True)
+        self.thread.start()
+
+    def send(self, message):
+        body = json.dumps({"jsonrpc": "2.0", **message}).encode()
+        self.input.write(f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+        self.input.flush()
+
+    def receive(self):
+        length = int(self.output.readline().split(b":")[1])
+        self.output.readline()
+        return json.loads(self.output.read(length))
+
+    def exit(self):
+        self.send({"method": "exit"})
+        self.thread.join()
+        return self.code
+
+
+def change(version, start, end, text):
+    return {
+        "method": "textDocument/didChange",
+        "params": {
+            "textDocument": {"uri": uri, "version": version},
+            "contentChanges": [{
+                "range": {"start": {"line": start[0], "character": start[1]},
+                          "end": {"line": end[0], "character": end[1]}},
+                "text": text,
+            }],
+        },
+    }
+
+
+def open_document(version=1, text=source):
+    return {"method": "textDocument/didOpen", "params": {
+        "textDocument": {"uri": uri, "languageId": "c", "version": version, "text": text},
+    }}
+
+
+def test_lsp_publishes_diagnostics():
+    client = Client()
+    client.send({"id": 1, "method": "initialize", "params": {}})
+    assert client.receive()["result"]["capabilities"]["textDocumentSync"]["change"] == 2
+    client.send({"method": "initialized", "params": {}})
+    client.send(open_document())
+    published = client.receive()
+    assert published["method"] == "textDocument/publishDiagnostics"
+    assert published["params"]["version"] == 1
+    assert [it["code"] for it in published["params"]["diagnostics"]] == ["INVALID_HEADER"]
+    client.send({"id": 2, "method": "unknown"})
+    assert client.receive()["error"]["code"] == -32601
+    client.send({"id": 3, "method": "shutdown"})
+    assert client.receive() == {"jsonrpc": "2.0", "id": 3, "result": None}
+    assert client.exit() == 0
+
+
+def test_lsp_checks_the_last_version():
+    client = Client(delay=0.2)
+    client.send(open_document())
+    client.receive()
+    client.send(change(2, (2, 9), (2, 9), " "))
+    client.send(change(3, (2, 1), (2, 7), "return  "))
+    published = client.receive()["params"]
+    assert published["version"] == 3
+    codes = {it["code"]: it["range"] for it in published["diagnostics"]}
+    assert codes["CONSECUTIVE_SPC"] == {"start": {"line": 2, "character": 7}, "end": {"line": 2, "character": 8}}
+    assert codes["NO_SPC_AFR_PAR"]["start"] == {"line": 2, "character": 10}
+    client.send({"method": "textDocument/didClose", "params": {"textDocument": {"uri": uri}}})
+    assert client.receive()["params"] == {"uri": uri, "diagnostics": []}
+    assert client.exit() == 1
+
+
+@pytest.mark.parametrize("line, column, expected", [
+    ("\treturn (0);", 1, 0),
+    ("\treturn (0);", 5, 1),
+    ("a\tb", 5, 2),
+    ("\t\tb", 9, 2),
+    ("é😀x", 3, 3),
+    ("abc", 10, 3),
+])
+def test_character(line, column, expected):
+    assert character(line, column) == expected
+
+
+def test_offset():
+    text = "a😀b\nc\n"
+    assert offset(text, {"line": 0, "character": 3}) == 2
+    assert offset(text, {"line": 1, "character": 0}) == 4
+    assert offset(text, {"line": 1, "character": 9}) == 5
+    assert offset(text, {"line": 5, "character": 0}) == len(text)
+
+
+def test_document_changes():
+    document = Document(uri, source, 1)
+    document.change({"range": {"start": {"line": 2, "character": 1},
+                               "end": {"line": 2, "character": 7}}, "text": "return\t"})
+    document.change({"range": {"start": {"line": 0, "character": 0},
+                               "end": {"line": 0, "character": 0}}, "text": "/* x */\n"})
+    file = File(document.path, document.text)
+    assert document.text == "/* x */\n" + source.replace("return", "return\t")
+    assert document.tokens == list(Lexer(file))
+    document.change({"text": "int\ta;\n"})
+    assert document.text == "int\ta;\n"
+    assert len(document.tokens) == 5
+
+
+def test_cancelled_check_stops():
+    cancelled = threading.Event()
+    errors = CancellableErrors(cancelled)
+    errors.add("INVALID_HEADER")
+    assert not errors.is_full
+    cancelled.set()
+    assert errors.is_full
+    errors.add("INVALID_HEADER")
+    assert len(errors) == 1
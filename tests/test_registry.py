@@ -0,0 +1,119 @@
+import glob
+
+import pytest
+
+from norminette.file import File
+from norminette.lexer import Lexer
+from norminette.context import Context
+from norminette.exceptions import CParsingError
+from norminette.registry import Registry
+from norminette.tools import manifest
+
+
+source = "int\tmain()\n{\n    return (1);\n}\n"
+
+
+def run(registry: Registry, source: str):
+    file = File("/nium/test.c", source)
+    context = Context(file, list(Lexer(file)))
+    registry.run(context)
+    return [error.name for error in file.errors]
+
+
+@pytest.mark.parametrize("select, ignore, expected", [
+    [None, None, ["INVALID_HEADER", "NO_ARGS_VOID", "TOO_FEW_TAB", "SPACE_REPLACE_TAB"]],
+    [["CheckLineIndent"], None, ["TOO_FEW_TAB"]],
+    [["CheckLineIndent", "NO_ARGS_VOID"], None, ["NO_ARGS_VOID", "TOO_FEW_TAB"]],
+    [None, ["CheckHeader", "SPACE_REPLACE_TAB"], ["NO_ARGS_VOID", "TOO_FEW_TAB"]],
+    [["SPACE_REPLACE_TAB"], ["CheckSpacing"], []],
+])
+def test_registry_select_and_ignore(select, ignore, expected):
+    registry = Registry(select=select, ignore=ignore)
+
+    assert run(registry, source) == expected
+
+
+def test_registry_select_does_not_register_other_checks():
+    registry = Registry(select=["CheckLineLen"])
+    registered = {rule.__name__ for rules in registry.dependencies.values() for rule in rules}
+
+    assert registered - {rule.__name__ for rule in registry.muted} == {"CheckLineLen"}
+
+
+def test_registry_select_unknown_name():
+    with pytest.raises(ValueError):
+        Registry(select=["CheckNothing"])
+
+
+@pytest.mark.parametrize("changed_lines, expected", [
+    [set(), []],
+    [{1}, ["INVALID_HEADER", "NO_ARGS_VOID"]],
+    [{3}, ["TOO_FEW_TAB", "SPACE_REPLACE_TAB"]],
+])
+def test_registry_changed_lines(changed_lines, expected):
+    file = File("/nium/test.c", source)
+    context = Context(file, list(Lexer(file)), changed_lines=changed_lines)
+    Registry().run(context)
+
+    assert [error.name for error in file.errors] == expected
+
+
+def test_registry_skips_checks_without_triggers():
+    file = File("/nium/test.c", "int\ta;\n")
+    context = Context(file, list(Lexer(file)))
+    registry = Registry()
+    rules = {rule.__name__: rule for rule in registry.dependencies["_rule"]}
+    context.tkn_scope = len(context.tokens)
+
+    assert registry.is_triggered(context, rules["CheckSpacing"])
+    assert not registry.is_triggered(context, rules["CheckTernary"])
+    assert not registry.is_triggered(context, rules["CheckComment"])
+
+
+def test_registry_skips_retired_checks():
+    file = File("/nium/test.c", source)
+    context = Context(file, list(Lexer(file)))
+    registry = Registry()
+    registry.run(context)
+
+    assert [rule.__name__ for rule in context.retired] == ["CheckHeader"]
+    assert [error.name for error in file.errors].count("INVALID_HEADER") == 1
+
+
+def test_registry_manifest_is_up_to_date():
+    with open(manifest.MANIFEST_PATH) as stream:
+        assert stream.read() == manifest.build(), "run `python -m norminette.tools.manifest`"
+
+
+@pytest.mark.parametrize("path", glob.glob("tests/rules/samples/*.[ch]"))
+def test_registry_lexes_tokens_while_checking(path):
+    with open(path) as stream:
+        source = stream.read()
+    expected = File(path, source)
+    try:
+        Registry().run(Context(expected, list(Lexer(expected))))
+    except CParsingError:
+        pytest.skip("Unrecognized statement")
+    file = File(path, source)
+    Registry().run(Context(file, Lexer(file)))
+
+    assert list(file.errors) == list(expected.errors)
+
+
+@pytest.mark.parametrize("limit", [None, 1])
+def test_registry_select_with_errors_limit(limit):
+    file = File("/nium/test.c", "int\tmain(void)\n{\n    return (1);\n\t\t\treturn (2);\n}\n")
+    file.errors.limit = limit
+    Registry(select=["TOO_MANY_TAB"]).run(Context(file, Lexer(file)))
+
+    assert [error.name for error in file.errors] == ["TOO_MANY_TAB"]
+
+
+@pytest.mark.parametrize("limit", [None, 1])
+def test_registry_changed_lines_with_errors_limit(limit):
+    file = File("/nium/test.c", source)
+    file.errors.limit = limit
+    Registry().run(Context(file, Lexer(file), changed_lines={3}))
+
+    assert len(file.errors) == (limit or 2)
+    assert all(error.highlights[0].lineno == 3 for error in file.errors)
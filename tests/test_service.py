@@ -0,0 +1,140 @@
+import http.client
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from norminette.service import QueueFull, Server, WorkerPool, parse_address, parse_items
+
+source = "int\tmain(void)\n{\n\treturn (0) ;\n}\n"
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = WorkerPool(workers=1, queue_size=4)
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def server(pool):
+    server = Server(("127.0.0.1", 0), pool, timeout=30)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def request(server, path, data=None):
+    url = f"http://127.0.0.1:{server.server_address[1]}{path}"
+    try:
+        with urllib.request.urlopen(url, data) as response:
+            return response.status, response.read().decode()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read().decode()
+
+
+def test_check(server):
+    items = [{"filename": "a.c", "source": source}, {"filename": "b.h", "source": ""}]
+    status, body = request(server, "/check", json.dumps(items).encode())
+    assert status == 200
+    files = json.loads(body)["files"]
+    assert [file["path"].rsplit("/", 1)[1] for file in files] == ["a.c", "b.h"]
+    assert [file["status"] for file in files] == ["Error", "OK"]
+    assert [error["name"] for error in files[0]["errors"]] == ["INVALID_HEADER", "NO_SPC_AFR_PAR", "RETURN_PARENTHESIS"]
+
+    status, body = request(server, "/metrics")
+    assert status == 200
+    assert 'norminette_requests_total{code="200"} 1' in body
+    assert "norminette_files_total 2" in body
+    assert "norminette_workers 1" in body
+
+
+@pytest.mark.parametrize("body, status", [
+    (b"{", 400),
+    (b'{"files": [{"filename": "a.py", "source": ""}]}', 400),
+    (json.dumps([{"filename": "a.c", "source": ""}] * 5).encode(), 413),
+])
+def test_check_rejected(server, body, status):
+    assert request(server, "/check", body)[0] == status
+
+
+def test_check_queue_busy(server, pool):
+    pool.pending = 4
+    try:
+        status, body = request(server, "/check", json.dumps([{"filename": "a.c", "source": ""}]).encode())
+    finally:
+        pool.pending = 0
+    assert status == 429
+    assert "4 files are waiting" in body
+
+
+@pytest.mark.parametrize("length, status", [
+    (None, 411),
+    ("abc", 400),
+    ("-1", 400),
+    (str(16 * 1024 * 1024 + 1), 413),
+])
+def test_check_content_length(server, length, status):
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+    connection.putrequest("POST", "/check")
+    if length is not None:
+        connection.putheader("Content-Length", length)
+    connection.endheaders()
+    response = connection.getresponse()
+    assert response.status == status
+    assert "error" in json.loads(response.read())
+    connection.close()
+
+
+def test_timeout(pool):
+    futures = pool.submit([("a.c", source * 200)], timeout=0.001)
+    with pytest.raises(TimeoutError):
+        futures[0].result(timeout=30)
+    assert pool.submit([("a.c", source)], timeout=30)[0].result(timeout=30)
+
+
+def test_queue_full(pool):
+    with pytest.raises(QueueFull):
+        pool.submit([("a.c", source)] * 5, timeout=30)
+    assert pool.pending == 0
+
+
+def test_parse_items():
+    assert parse_items(b'[{"filename": "a.c", "source": "x"}]') == [("a.c", "x")]
+    assert parse_items(b'{"files": []}') == []
+    with pytest.raises(ValueError):
+        parse_items(b'[{"filename": "a.c"}]')
+
+
+@pytest.mark.parametrize("value, address", [
+    ("127.0.0.1:8000", ("127.0.0.1", 8000)),
+    (":0", ("127.0.0.1", 0)),
+    ("[::1]:80", ("[::1]", 80)),
+])
+def test_parse_address(value, address):
+    assert parse_address(value) == address
+
+
+def test_parse_address_invalid():
+    with pytest.raises(ValueError):
+        parse_address("localhost")
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/stat"), reason="reads the parent of workers in /proc")
+def test_workers_are_forked_and_recycled():
+    pool = WorkerPool(workers=1, queue_size=4, max_files=2)
+    try:
+        pid = pool.workers[0].pid
+        with open(f"/proc/{pid}/stat") as stream:
+            assert int(stream.read().rsplit(")", 1)[1].split()[1]) == pool.forks.process.pid
+        for _ in range(2):
+            assert pool.submit([("a.c", source)], timeout=30)[0].result(timeout=30)
+        assert pool.submit([("a.c", source)], timeout=30)[0].result(timeout=30)
+        assert pool.workers[0].pid != pid
+    finally:
+        pool.close()
@@ -0,0 +1,59 @@
+import pytest
+
+from norminette.file import File
+from norminette.shard import check_shards, fingerprint, parse_shard, select_shard
+
+
+@pytest.mark.parametrize("value, expected", [
+    ["1/1", (1, 1)],
+    ["2/3", (2, 3)],
+])
+def test_parse_shard(value, expected):
+    assert parse_shard(value) == expected
+
+
+@pytest.mark.parametrize("value", ["", "1", "0/2", "3/2", "a/b"])
+def test_parse_invalid_shard(value):
+    with pytest.raises(ValueError):
+        parse_shard(value)
+
+
+def test_select_shard():
+    files = [File(f"{index}.c", "a" * size) for index, size in enumerate([10, 1, 7, 3, 3, 4])]
+    shards = [select_shard(files, index, 3) for index in range(1, 4)]
+
+    assert [[file.path for file in shard] for shard in shards] == [
+        ["0.c"],
+        ["2.c", "4.c"],
+        ["1.c", "3.c", "5.c"],
+    ]
+
+
+def test_select_shard_by_costs():
+    files = [File(f"{index}.c", "a") for index in range(4)]
+    costs = [1.0, 4.0, 2.0, 2.0]
+    shards = [select_shard(files, index, 2, costs) for index in range(1, 3)]
+
+    assert [[file.path for file in shard] for shard in shards] == [
+        ["0.c", "1.c"],
+        ["2.c", "3.c"],
+    ]
+
+
+def shard(index, paths, total=2, files=("a.c", "b.c", "c.c")):
+    return {"index": index, "total": total, "files": fingerprint(files), "paths": list(paths)}
+
+
+@pytest.mark.parametrize("shards, problem", [
+    [[shard(1, ["a.c", "c.c"]), shard(2, ["b.c"])], None],
+    [[shard(1, ["a.c", "c.c"]), None], "a report is not from a --shard run"],
+    [[shard(1, ["a.c", "c.c"]), shard(2, ["b.c"], total=3)], "the reports are from runs on different files"],
+    [[shard(1, ["a.c", "c.c"]), shard(2, ["b.c"], files=["b.c"])], "the reports are from runs on different files"],
+    [[shard(1, ["a.c", "c.c"]), shard(1, ["b.c"])], "expected the reports of shards 1 to 2, got 1, 1"],
+    [[shard(1, ["a.c", "c.c"]), shard(2, ["b.c", "c.c"])], "'c.c' was checked by shards 1 and 2"],
+    [[shard(1, ["a.c"]), shard(2, ["b.c"])], "some files were not checked by any shard"],
+])
+def test_check_shards(shards, problem):
+    result = check_shards(shards)
+
+    assert result == problem if problem is None else result.startswith(problem)
@@ -0,0 +1,54 @@
+import subprocess
+import sys
+
+import pytest
+
+# Cumulative import time of `norminette.__main__`, in microseconds: about
+# 1.5 times the usual 80 to 190 ms, below the 260 ms that importing the
+# registry alone used to take.
+STARTUP_BUDGET = 250_000
+
+# Modules only needed by some options, that the check path must not import
+LAZY_MODULES = (
+    "asyncio",
+    "glob",
+    "http.server",
+    "importlib.metadata",
+    "json",
+    "multiprocessing",
+    "norminette.aio",
+    "norminette.git",
+    "norminette.lsp",
+    "norminette.service",
+    "platform",
+    "subprocess",
+)
+
+
+@pytest.fixture(scope="module")
+def import_times():
+    # Writes the bytecode first, so compiling it is not measured
+    subprocess.run([sys.executable, "-c", "import norminette.__main__"], check=True)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import norminette.__main__"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("module", LAZY_MODULES)
+def test_lazy_module_not_imported(import_times, module):
+    assert module not in import_times
+
+
+def test_startup_budget(import_times):
+    assert import_times["norminette.__main__"] < STARTUP_BUDGET
@@ -0,0 +1,80 @@
+import gettext
+import io
+import os
+import subprocess
+import sys
+
+import pytest
+
+from norminette.tools.zipapp import build, compile_catalog
+
+source = "int\tmain()\n{\n    return (1);\n}\n"
+
+
+@pytest.fixture(scope="module")
+def archive(tmp_path_factory):
+    path = tmp_path_factory.mktemp("zipapp") / "norminette.pyz"
+    build(str(path))
+    return path
+
+
+def run(*args, **env):
+    return subprocess.run(
+        [sys.executable, "-I", *map(str, args)],
+        capture_output=True,
+        text=True,
+        env={**os.environ, **env},
+    )
+
+
+def test_zipapp_checks_files(archive, tmp_path):
+    path = tmp_path / "main.c"
+    path.write_text(source)
+    result = run(archive, "--no-colors", path, NORMINETTE_CACHE_DIR=str(tmp_path))
+
+    assert result.returncode == 1
+    assert result.stdout.splitlines()[1:] == [
+        "Error: INVALID_HEADER       (line:   1, col:   1):\tMissing or invalid 42 header",
+        "Error: NO_ARGS_VOID         (line:   1, col:  10):\tEmpty function argument requires void",
+        "Error: TOO_FEW_TAB          (line:   3, col:   1):\tMissing tabs for indent level",
+        "Error: SPACE_REPLACE_TAB    (line:   3, col:   5):\tFound space when expecting tab",
+    ]
+
+
+def test_zipapp_translates_messages(archive, tmp_path):
+    path = tmp_path / "main.c"
+    path.write_text(source)
+    result = run(archive, "--no-colors", path, NORMINETTE_LOCALE="pt_BR", NORMINETTE_CACHE_DIR=str(tmp_path))
+
+    assert "Error: INVALID_HEADER       (line:   1, col:   1):\tCabeçalho 42 ausente ou inválido" in result.stdout
+
+
+def test_compile_catalog(tmp_path):
+    path = tmp_path / "norminette.po"
+    path.write_text(
+        'msgid ""\n'
+        'msgstr ""\n'
+        '"Content-Type: text/plain; charset=UTF-8\\n"\n'
+        "\n"
+        'msgid "Spaces at beginning of line"\n'
+        'msgstr "Espaços no começo da linha"\n'
+        "\n"
+        'msgid ""\n'
+        '"Empty "\n'
+        '"function"\n'
+        'msgstr "Função vazia"\n'
+        "\n"
+        "#, fuzzy\n"
+        'msgid "Too many tabs"\n'
+        'msgstr "Tabs demais"\n'
+        "\n"
+        'msgid "Missing tab"\n'
+        'msgstr ""\n',
+        encoding="utf-8",
+    )
+    translations = gettext.GNUTranslations(io.BytesIO(compile_catalog(path)))
+
+    assert translations.gettext("Spaces at beginning of line") == "Espaços no começo da linha"
+    assert translations.gettext("Empty function") == "Função vazia"
+    assert translations.gettext("Too many tabs") == "Too many tabs"
+    assert translations.gettext("Missing tab") == "Missing tab"